@@ -1,10 +1,13 @@
 import reflex as rx
+from app.states.base_state import BaseState
 from app.pages.index import index
 from app.pages.auth import login_page, register_page
 from app.pages.matches import matches_page
 from app.pages.my_predictions import my_predictions_page
 from app.pages.leaderboard import leaderboard_page
 from app.pages.admin import admin_page
+from app.scheduler import kickoff_scheduler
+from app.database.database import pool_monitor
 
 app = rx.App(
     theme=rx.theme(appearance="light"),
@@ -12,10 +15,14 @@ app = rx.App(
         "https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600;700;800&display=swap"
     ],
 )
-app.add_page(index, route="/")
-app.add_page(login_page, route="/login")
-app.add_page(register_page, route="/register")
-app.add_page(matches_page, route="/matches")
-app.add_page(my_predictions_page, route="/my-predictions")
-app.add_page(leaderboard_page, route="/leaderboard")
-app.add_page(admin_page, route="/admin")
\ No newline at end of file
+app.add_page(index, route="/", on_load=BaseState.check_login)
+app.add_page(login_page, route="/login", on_load=BaseState.check_login)
+app.add_page(register_page, route="/register", on_load=BaseState.check_login)
+app.add_page(matches_page, route="/matches", on_load=BaseState.check_login)
+app.add_page(
+    my_predictions_page, route="/my-predictions", on_load=BaseState.check_login
+)
+app.add_page(leaderboard_page, route="/leaderboard", on_load=BaseState.check_login)
+app.add_page(admin_page, route="/admin", on_load=BaseState.check_login)
+app.register_lifespan_task(kickoff_scheduler.start)
+app.register_lifespan_task(pool_monitor.validate_async_engines)
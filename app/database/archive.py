@@ -0,0 +1,441 @@
+"""
+Archive finished seasons to compressed Parquet files.
+
+    python -m app.database.archive export <season> [--dir DIR]
+    python -m app.database.archive list
+    python -m app.database.archive leaderboard <season> [--limit N]
+    python -m app.database.archive history <user_id>
+
+export_season() writes a season's matches, predictions and payments, plus
+its final leaderboard, to ARCHIVE_DIR/season=<season>/. Only after that
+does it remove the rows from the hot tables. On PostgreSQL, a season
+partition is detached and dropped rather than deleted row by row. After
+the export, users' total_points and user_stats cover the seasons still in
+the database. Archived seasons are read back with season_leaderboard()
+and user_history().
+"""
+
+import argparse
+import os
+import shutil
+from datetime import datetime
+from types import SimpleNamespace
+from typing import Optional
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from sqlalchemy import and_, column, delete, desc, func, select, table, text, update
+from sqlalchemy.orm import Session
+from app.database.database import SessionLocal, engine
+from app.database.models import Match, Payment, Prediction, User, UserStats, season_of
+from app.database.partitions import (
+    detach_season_partition,
+    is_partitioned,
+    partition_name,
+    season_partitions,
+)
+from app.database.cache import match_list_cache, top_player_cache
+from app.database.leaderboard import leaderboard_index
+from app.database.service import (
+    match_to_dto,
+    prediction_to_dto,
+    refresh_user_stats,
+)
+from app.models import (
+    LeaderboardRow,
+    Match as MatchDTO,
+    Prediction as PredictionDTO,
+)
+
+ARCHIVE_DIR = os.getenv("ARCHIVE_DIR", "archive")
+ARCHIVE_BATCH_SIZE = int(os.getenv("ARCHIVE_BATCH_SIZE", 50_000))
+# Users per DELETE/refresh of user_stats, to stay under bind limits.
+STATS_BATCH_SIZE = 5_000
+COMPRESSION = "zstd"
+
+MATCH_SCHEMA = pa.schema(
+    [
+        ("id", pa.int64()),
+        ("team1", pa.string()),
+        ("team2", pa.string()),
+        ("start_time", pa.timestamp("us")),
+        ("status", pa.string()),
+        ("team1_score", pa.int32()),
+        ("team2_score", pa.int32()),
+        ("season", pa.int32()),
+    ]
+)
+PREDICTION_SCHEMA = pa.schema(
+    [
+        ("id", pa.int64()),
+        ("user_id", pa.int64()),
+        ("match_id", pa.int64()),
+        ("season", pa.int32()),
+        ("team1_prediction", pa.int32()),
+        ("team2_prediction", pa.int32()),
+        ("points_earned", pa.int32()),
+        ("boost_active", pa.bool_()),
+        ("created_at", pa.timestamp("us")),
+        ("updated_at", pa.timestamp("us")),
+    ]
+)
+PAYMENT_SCHEMA = pa.schema(
+    [
+        ("id", pa.int64()),
+        ("user_id", pa.int64()),
+        ("amount", pa.float64()),
+        ("date", pa.timestamp("us")),
+        ("status", pa.string()),
+    ]
+)
+LEADERBOARD_SCHEMA = pa.schema(
+    [
+        ("rank", pa.int64()),
+        ("user_id", pa.int64()),
+        ("username", pa.string()),
+        ("points", pa.int64()),
+        ("is_admin", pa.bool_()),
+    ]
+)
+
+
+def season_dir(season: int, archive_dir: str = ARCHIVE_DIR) -> str:
+    return os.path.join(archive_dir, f"season={int(season)}")
+
+
+def archived_seasons(archive_dir: str = ARCHIVE_DIR) -> list[int]:
+    if not os.path.isdir(archive_dir):
+        return []
+    return sorted(
+        int(name.split("=", 1)[1])
+        for name in os.listdir(archive_dir)
+        if name.startswith("season=") and name.split("=", 1)[1].isdigit()
+    )
+
+
+def _columns(model, schema: pa.Schema) -> list:
+    return [model.__table__.c[name] for name in schema.names]
+
+
+def _payments_in(season: int):
+    # A range on date, rather than extract(year), can use ix_payments_date.
+    return and_(
+        Payment.date >= datetime(season, 1, 1),
+        Payment.date < datetime(season + 1, 1, 1),
+    )
+
+
+def _write_parquet(db: Session, statement, schema: pa.Schema, path: str) -> int:
+    """Stream a SELECT into a Parquet file, one row group per batch."""
+    rows = 0
+    result = db.execute(statement.execution_options(yield_per=ARCHIVE_BATCH_SIZE))
+    with pq.ParquetWriter(path, schema, compression=COMPRESSION) as writer:
+        for batch in result.partitions():
+            writer.write_table(
+                pa.Table.from_pylist([r._asdict() for r in batch], schema=schema)
+            )
+            rows += len(batch)
+    return rows
+
+
+def _check_finished(db: Session, season: int):
+    if season >= season_of(datetime.now()):
+        raise ValueError(f"Season {season} is not over yet.")
+    unfinished = db.execute(
+        select(func.count())
+        .select_from(Match)
+        .where(Match.season == season, Match.status != "finished")
+    ).scalar()
+    if unfinished:
+        raise ValueError(f"Season {season} still has {unfinished} unfinished matches.")
+
+
+def _export_files(db: Session, season: int, target: str) -> dict[str, int]:
+    points = func.sum(func.coalesce(Prediction.points_earned, 0)).label("points")
+    standings = (
+        select(User.id, User.username, points, User.is_admin)
+        .join(Prediction, Prediction.user_id == User.id)
+        .where(Prediction.season == season)
+        .group_by(User.id, User.username, User.is_admin)
+        .order_by(desc(points), User.id)
+    )
+    counts = {
+        "matches": _write_parquet(
+            db,
+            select(*_columns(Match, MATCH_SCHEMA))
+            .where(Match.season == season)
+            .order_by(Match.start_time, Match.id),
+            MATCH_SCHEMA,
+            os.path.join(target, "matches.parquet"),
+        ),
+        # Sorted by user so user_history() can skip row groups by statistics.
+        "predictions": _write_parquet(
+            db,
+            select(*_columns(Prediction, PREDICTION_SCHEMA))
+            .where(Prediction.season == season)
+            .order_by(Prediction.user_id, Prediction.match_id),
+            PREDICTION_SCHEMA,
+            os.path.join(target, "predictions.parquet"),
+        ),
+        "payments": _write_parquet(
+            db,
+            select(*_columns(Payment, PAYMENT_SCHEMA))
+            .where(_payments_in(season))
+            .order_by(Payment.user_id, Payment.date),
+            PAYMENT_SCHEMA,
+            os.path.join(target, "payments.parquet"),
+        ),
+    }
+    rows = [
+        {
+            "rank": rank,
+            "user_id": r.id,
+            "username": r.username,
+            "points": r.points,
+            "is_admin": bool(r.is_admin),
+        }
+        for rank, r in enumerate(db.execute(standings), start=1)
+    ]
+    pq.write_table(
+        pa.Table.from_pylist(rows, schema=LEADERBOARD_SCHEMA),
+        os.path.join(target, "leaderboard.parquet"),
+        compression=COMPRESSION,
+    )
+    counts["leaderboard"] = len(rows)
+    return counts
+
+
+def _archived_counts(target: str) -> dict[str, int]:
+    return {
+        name: pq.read_metadata(os.path.join(target, f"{name}.parquet")).num_rows
+        for name in ("matches", "predictions", "payments", "leaderboard")
+    }
+
+
+def _hot_counts(db: Session, season: int) -> dict[str, int]:
+    """Rows of a season still in the database, detached partition included."""
+    predictions = (
+        select(func.count()).select_from(Prediction).where(Prediction.season == season)
+    )
+    conn = db.connection()
+    name = partition_name(season)
+    detached = (
+        is_partitioned(conn)
+        and name not in season_partitions(conn)
+        and conn.execute(text("SELECT to_regclass(:name)"), {"name": name}).scalar()
+    )
+    if detached:
+        # A previous run detached it, then failed before dropping it.
+        predictions = select(func.count()).select_from(table(name))
+    return {
+        "matches": db.execute(
+            select(func.count()).select_from(Match).where(Match.season == season)
+        ).scalar(),
+        "predictions": db.execute(predictions).scalar(),
+        "payments": db.execute(
+            select(func.count()).select_from(Payment).where(_payments_in(season))
+        ).scalar(),
+    }
+
+
+def _check_archive_complete(season: int, target: str) -> bool:
+    """
+    Whether the season is still in the database, which must then hold
+    exactly the archived rows, so the delete cannot take newer ones.
+    """
+    archived = _archived_counts(target)
+    with SessionLocal() as db:
+        hot = _hot_counts(db, season)
+    if not any(hot.values()):
+        return False
+    changed = [
+        f"{name}: {hot[name]} in the database, {archived[name]} archived"
+        for name in hot
+        if hot[name] != archived[name]
+    ]
+    if changed:
+        raise ValueError(
+            f"Season {season} does not match its archive in {target}"
+            f" ({'; '.join(changed)}). Move the directory aside and export again."
+        )
+    return True
+
+
+def _delete_season(season: int):
+    """
+    Remove an exported season from the hot tables and rebase totals.
+
+    The caches are cleared in this process only. App workers keep serving
+    their cached top player and match list until those entries expire,
+    after at most 60 and 300 seconds.
+    """
+    detached = detach_season_partition(engine, season)
+    with SessionLocal() as db:
+        if detached:
+            partition = table(detached, column("user_id"), column("points_earned"))
+            season_rows = select(partition.c.user_id, partition.c.points_earned)
+        else:
+            season_rows = select(Prediction.user_id, Prediction.points_earned).where(
+                Prediction.season == season
+            )
+        season_rows = season_rows.subquery()
+        season_users = db.scalars(select(season_rows.c.user_id).distinct()).all()
+        season_points = (
+            select(func.coalesce(func.sum(season_rows.c.points_earned), 0))
+            .where(season_rows.c.user_id == User.id)
+            .scalar_subquery()
+        )
+        db.execute(
+            update(User)
+            .where(User.id.in_(select(season_rows.c.user_id)))
+            .values(total_points=func.coalesce(User.total_points, 0) - season_points)
+            .execution_options(synchronize_session=False)
+        )
+        if detached:
+            db.execute(text(f"DROP TABLE {detached}"))
+        else:
+            db.execute(
+                delete(Prediction)
+                .where(Prediction.season == season)
+                .execution_options(synchronize_session=False)
+            )
+        db.execute(
+            delete(Match)
+            .where(Match.season == season)
+            .execution_options(synchronize_session=False)
+        )
+        db.execute(
+            delete(Payment)
+            .where(_payments_in(season))
+            .execution_options(synchronize_session=False)
+        )
+        # Users whose only scored predictions were archived must lose their
+        # row, which an upsert from the remaining predictions cannot do.
+        for start in range(0, len(season_users), STATS_BATCH_SIZE):
+            batch = season_users[start : start + STATS_BATCH_SIZE]
+            db.execute(
+                delete(UserStats)
+                .where(UserStats.user_id.in_(batch))
+                .execution_options(synchronize_session=False)
+            )
+            refresh_user_stats(db, batch)
+        db.commit()
+    top_player_cache.invalidate("top_player")
+    match_list_cache.invalidate()
+    leaderboard_index.invalidate()
+
+
+def export_season(season: int, archive_dir: str = ARCHIVE_DIR) -> dict[str, int]:
+    """
+    Archive a finished season and delete it from the hot tables.
+
+    The files are written to a staging directory and renamed into place,
+    so a season directory is either complete or absent. If the directory
+    already exists, a previous run failed after writing it and only the
+    delete is retried. Either way the delete only runs if the database
+    still holds exactly the rows in the files. Returns the number of rows
+    exported per file.
+    """
+    target = season_dir(season, archive_dir)
+    with SessionLocal() as db:
+        _check_finished(db, season)
+    if not os.path.exists(target):
+        staging = f"{target}.partial"
+        shutil.rmtree(staging, ignore_errors=True)
+        os.makedirs(staging)
+        try:
+            with SessionLocal() as db:
+                counts = _export_files(db, season, staging)
+            os.replace(staging, target)
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+    else:
+        counts = _archived_counts(target)
+    if _check_archive_complete(season, target):
+        _delete_season(season)
+    return counts
+
+
+def season_leaderboard(
+    season: int, limit: Optional[int] = None, archive_dir: str = ARCHIVE_DIR
+) -> list[LeaderboardRow]:
+    """Final standings of an archived season, best first."""
+    data = pq.read_table(
+        os.path.join(season_dir(season, archive_dir), "leaderboard.parquet")
+    )
+    if limit is not None:
+        data = data.slice(0, limit)
+    return [
+        LeaderboardRow(
+            rank=r["rank"],
+            user_id=r["user_id"],
+            username=r["username"],
+            total_points=r["points"],
+            is_admin=r["is_admin"],
+        )
+        for r in data.to_pylist()
+    ]
+
+
+def archived_matches(season: int, archive_dir: str = ARCHIVE_DIR) -> list[MatchDTO]:
+    data = pq.read_table(
+        os.path.join(season_dir(season, archive_dir), "matches.parquet")
+    )
+    return [match_to_dto(SimpleNamespace(**r)) for r in data.to_pylist()]
+
+
+def user_history(
+    user_id: int,
+    seasons: Optional[list[int]] = None,
+    archive_dir: str = ARCHIVE_DIR,
+) -> list[PredictionDTO]:
+    """One user's predictions across archived seasons, oldest season first."""
+    seasons = archived_seasons(archive_dir) if seasons is None else seasons
+    if not seasons:
+        return []
+    dataset = ds.dataset(
+        [
+            os.path.join(season_dir(s, archive_dir), "predictions.parquet")
+            for s in seasons
+        ],
+        schema=PREDICTION_SCHEMA,
+        format="parquet",
+    )
+    data = dataset.to_table(filter=ds.field("user_id") == user_id)
+    return [prediction_to_dto(SimpleNamespace(**r)) for r in data.to_pylist()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Archive finished seasons.")
+    parser.add_argument("--dir", default=ARCHIVE_DIR)
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("export").add_argument("season", type=int)
+    sub.add_parser("list")
+    board = sub.add_parser("leaderboard")
+    board.add_argument("season", type=int)
+    board.add_argument("--limit", type=int, default=20)
+    sub.add_parser("history").add_argument("user_id", type=int)
+    args = parser.parse_args()
+
+    if args.command == "export":
+        counts = export_season(args.season, args.dir)
+        print(f"Archived season {args.season} to {season_dir(args.season, args.dir)}:")
+        for name, count in counts.items():
+            print(f"  {name}: {count} rows")
+    elif args.command == "list":
+        for season in archived_seasons(args.dir):
+            print(season)
+    elif args.command == "leaderboard":
+        for row in season_leaderboard(args.season, args.limit, args.dir):
+            print(f"{row.rank:>5}  {row.username:<24} {row.total_points:>6}")
+    else:
+        for p in user_history(args.user_id, archive_dir=args.dir):
+            print(
+                f"match {p.match_id:>6}  {p.team1_prediction}-{p.team2_prediction}"
+                f"  {p.points_earned:>3} pts{'  (boost)' if p.boost_active else ''}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+from datetime import datetime, timedelta
+from typing import Optional
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database.cache import match_list_cache
+from app.database.leaderboard import LeaderboardEntry, leaderboard_index
+from app.database.models import User, Prediction, UserSession, UserStats
+from app.database.routing import recent_writes, replica_read
+from app.database.service import (
+    PREDICTION_COLUMNS,
+    leaderboard_entries_query,
+    leaderboard_page_query,
+    locked_prediction_upsert,
+    match_dtos_query,
+    match_to_dto,
+    prediction_to_dto,
+    sync_leaderboard,
+    user_stats_to_dto,
+)
+from app.models import (
+    Match as MatchDTO,
+    Prediction as PredictionDTO,
+    UserStats as UserStatsDTO,
+)
+
+
+async def get_user_by_username(db: AsyncSession, username: str) -> Optional[User]:
+    result = await db.execute(select(User).where(User.username == username))
+    return result.scalars().first()
+
+
+async def create_user(
+    db: AsyncSession, username: str, password_hash: str, is_admin: bool = False
+) -> User:
+    db_user = User(
+        username=username,
+        password_hash=password_hash,
+        is_admin=is_admin,
+        payment_status="paid" if is_admin else "pending",
+    )
+    db.add(db_user)
+    await db.commit()
+    await db.refresh(db_user)
+    sync_leaderboard(db_user)
+    return db_user
+
+
+async def update_user_password_hash(
+    db: AsyncSession, user_id: int, password_hash: str
+) -> Optional[User]:
+    user = await db.get(User, user_id)
+    if user:
+        user.password_hash = password_hash
+        await db.commit()
+        await db.refresh(user)
+    return user
+
+
+@replica_read
+async def get_leaderboard_page(
+    db: AsyncSession,
+    limit: int,
+    after: Optional[tuple[int, int]] = None,
+    before: Optional[tuple[int, int]] = None,
+) -> list:
+    result = await db.execute(leaderboard_page_query(limit, after, before))
+    rows = result.all()
+    return rows[::-1] if before is not None else rows
+
+
+@replica_read
+async def get_leaderboard_neighbours(
+    db: AsyncSession, user_id: int, radius: int = 2
+) -> list[tuple[int, LeaderboardEntry]]:
+    if leaderboard_index.stale:
+        generation = leaderboard_index.generation
+        result = await db.execute(leaderboard_entries_query())
+        leaderboard_index.load(result, generation)
+    return leaderboard_index.neighbours(user_id, radius)
+
+
+async def get_cached_match_dtos(db: AsyncSession) -> tuple[MatchDTO, ...]:
+    """
+    Every match, from the schedule cache shared by all sessions.
+
+    Misses load from the primary so an admin edit is never re-cached from
+    a lagging replica.
+    """
+
+    async def load():
+        result = await db.execute(match_dtos_query())
+        return tuple(match_to_dto(r) for r in result)
+
+    return await match_list_cache.get_async("all", load)
+
+
+@replica_read
+async def get_user_prediction_dtos(
+    db: AsyncSession, user_id: int
+) -> list[PredictionDTO]:
+    result = await db.execute(
+        select(*PREDICTION_COLUMNS).where(Prediction.user_id == user_id)
+    )
+    return [prediction_to_dto(r) for r in result]
+
+
+@replica_read
+async def get_user_stats(db: AsyncSession, user_id: int) -> UserStatsDTO:
+    return user_stats_to_dto(await db.get(UserStats, user_id))
+
+
+async def get_prediction(
+    db: AsyncSession, user_id: int, match_id: int
+) -> Optional[Prediction]:
+    result = await db.execute(
+        select(Prediction).where(
+            Prediction.user_id == user_id, Prediction.match_id == match_id
+        )
+    )
+    return result.scalars().first()
+
+
+async def create_or_update_prediction(
+    db: AsyncSession,
+    user_id: int,
+    match_id: int,
+    team1_pred: int,
+    team2_pred: int,
+    boost_active: bool,
+) -> Optional[PredictionDTO]:
+    """Save a prediction, or return None if the match is locked or missing."""
+    stmt = locked_prediction_upsert(
+        db.get_bind().dialect.name,
+        user_id,
+        match_id,
+        team1_pred,
+        team2_pred,
+        boost_active,
+    )
+    row = (await db.execute(stmt)).first()
+    await db.commit()
+    if row is None:
+        return None
+    recent_writes.mark(user_id)
+    return prediction_to_dto(row)
+
+
+async def create_session(
+    db: AsyncSession, session_id: str, user_id: int, ttl: timedelta
+) -> UserSession:
+    user_session = UserSession(
+        id=session_id, user_id=user_id, expires_at=datetime.now() + ttl
+    )
+    db.add(user_session)
+    await db.commit()
+    return user_session
+
+
+async def delete_expired_sessions(db: AsyncSession) -> int:
+    result = await db.execute(
+        delete(UserSession)
+        .where(UserSession.expires_at <= datetime.now())
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    return result.rowcount
+
+
+async def get_session_user(db: AsyncSession, session_id: str) -> Optional[User]:
+    result = await db.execute(
+        select(User)
+        .join(UserSession, UserSession.user_id == User.id)
+        .where(
+            UserSession.id == session_id,
+            UserSession.expires_at > datetime.now(),
+            User.payment_status == "paid",
+        )
+    )
+    return result.scalars().first()
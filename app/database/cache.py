@@ -0,0 +1,65 @@
+import threading
+import time
+from typing import Any, Awaitable, Callable, Hashable
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    Small process-wide cache shared by every session in a worker.
+
+    Values expire after `ttl_seconds` so workers that did not see a write
+    still converge, and writers call `invalidate` to drop them immediately.
+    """
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._values: dict[Hashable, tuple[float, Any]] = {}
+        self._generation = 0
+
+    def get(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """Return the cached value for `key`, calling `loader` on a miss."""
+        value, generation, now = self._lookup(key)
+        if value is _MISSING:
+            value = loader()
+            self._store(key, value, generation, now)
+        return value
+
+    async def get_async(
+        self, key: Hashable, loader: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """get() with an async loader."""
+        value, generation, now = self._lookup(key)
+        if value is _MISSING:
+            value = await loader()
+            self._store(key, value, generation, now)
+        return value
+
+    def _lookup(self, key: Hashable) -> tuple[Any, int, float]:
+        now = time.monotonic()
+        with self._lock:
+            expires_at, value = self._values.get(key, (0.0, _MISSING))
+            if now >= expires_at:
+                value = _MISSING
+            return value, self._generation, now
+
+    def _store(self, key: Hashable, value: Any, generation: int, now: float):
+        with self._lock:
+            # Don't store a value loaded before a concurrent invalidation.
+            if generation == self._generation:
+                self._values[key] = (now + self.ttl_seconds, value)
+
+    def invalidate(self, key: Hashable = None):
+        """Drop one key, or everything when no key is given."""
+        with self._lock:
+            self._generation += 1
+            if key is None:
+                self._values.clear()
+            else:
+                self._values.pop(key, None)
+
+
+top_player_cache = TTLCache(ttl_seconds=60)
+match_list_cache = TTLCache(ttl_seconds=300)
@@ -0,0 +1,133 @@
+import bisect
+import threading
+import time
+from typing import Iterable, NamedTuple, Optional
+
+
+class LeaderboardEntry(NamedTuple):
+    user_id: int
+    username: str
+    total_points: int
+    is_admin: bool
+
+
+class LeaderboardIndex:
+    """
+    Process-wide leaderboard kept sorted by (-total_points, user_id).
+
+    The service layer loads it from the users table and then patches it
+    whenever a user's total changes in this process, so rank and neighbour
+    lookups are a bisect plus a slice instead of a COUNT or ORDER BY over
+    users. Writes made by other workers are picked up when the index goes
+    stale after `max_age_seconds` and is reloaded.
+    """
+
+    def __init__(self, max_age_seconds: float):
+        self.max_age_seconds = max_age_seconds
+        self._lock = threading.RLock()
+        self._keys: list[tuple[int, int]] = []
+        self._entries: dict[int, LeaderboardEntry] = {}
+        self._loaded_at: Optional[float] = None
+        self._generation = 0
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded_at is not None
+
+    @property
+    def stale(self) -> bool:
+        loaded_at = self._loaded_at
+        return loaded_at is None or time.monotonic() - loaded_at >= self.max_age_seconds
+
+    @property
+    def generation(self) -> int:
+        """Pass to load() to detect patches made while the rows were read."""
+        return self._generation
+
+    def load(self, rows: Iterable, generation: int):
+        """
+        Replace the index with (id, username, total_points, is_admin) rows.
+
+        If a patch landed after `generation` was read, the rows may predate
+        it, so the index is used as is but reloaded on the next read.
+        """
+        entries = {
+            r.id: LeaderboardEntry(
+                r.id, r.username, r.total_points or 0, bool(r.is_admin)
+            )
+            for r in rows
+        }
+        keys = sorted((-e.total_points, e.user_id) for e in entries.values())
+        with self._lock:
+            self._entries = entries
+            self._keys = keys
+            fresh = generation == self._generation
+            self._loaded_at = time.monotonic() if fresh else float("-inf")
+
+    def invalidate(self):
+        """Drop the index so the next read reloads it from the database."""
+        with self._lock:
+            self._generation += 1
+            self._keys = []
+            self._entries = {}
+            self._loaded_at = None
+
+    def upsert(self, entry: LeaderboardEntry):
+        with self._lock:
+            self._generation += 1
+            if self._loaded_at is None:
+                return
+            self._discard(entry.user_id)
+            self._entries[entry.user_id] = entry
+            bisect.insort(self._keys, (-entry.total_points, entry.user_id))
+
+    def remove(self, user_id: int):
+        with self._lock:
+            self._generation += 1
+            if self._loaded_at is not None:
+                self._discard(user_id)
+
+    def _discard(self, user_id: int):
+        old = self._entries.pop(user_id, None)
+        if old is None:
+            return
+        key = (-old.total_points, old.user_id)
+        i = bisect.bisect_left(self._keys, key)
+        if i < len(self._keys) and self._keys[i] == key:
+            del self._keys[i]
+
+    def _slice(self, start: int, stop: int) -> list[tuple[int, LeaderboardEntry]]:
+        start = max(start, 0)
+        return [
+            (rank, self._entries[key[1]])
+            for rank, key in enumerate(self._keys[start:stop], start=start)
+        ]
+
+    def top(self, limit: int) -> list[tuple[int, LeaderboardEntry]]:
+        """Return the first `limit` (zero-based rank, entry) pairs."""
+        with self._lock:
+            return self._slice(0, limit)
+
+    def rank(self, user_id: int) -> Optional[int]:
+        """Zero-based rank of a user, or None if the user is unknown."""
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            return bisect.bisect_left(self._keys, (-entry.total_points, user_id))
+
+    def neighbours(
+        self, user_id: int, radius: int = 2
+    ) -> list[tuple[int, LeaderboardEntry]]:
+        """Return the user together with up to `radius` players above and below."""
+        with self._lock:
+            rank = self.rank(user_id)
+            if rank is None:
+                return []
+            return self._slice(rank - radius, rank + radius + 1)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+
+leaderboard_index = LeaderboardIndex(max_age_seconds=300)
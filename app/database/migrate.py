@@ -0,0 +1,77 @@
+"""
+Schema migrations for the app database.
+
+    python -m app.database.migrate upgrade [revision]
+    python -m app.database.migrate downgrade <revision>
+    python -m app.database.migrate current | history
+    python -m app.database.migrate stamp <revision>
+    python -m app.database.migrate revision -m "message"
+
+Revisions live in app/database/migrations/versions and run against
+DATABASE_URL. There is deliberately no top-level alembic.ini, so these
+commands never mix with Reflex's own `reflex db` migrations.
+"""
+
+import argparse
+import os
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import inspect
+from app.database.database import DATABASE_URL, engine
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(__file__), "migrations")
+# Revision whose schema matches a database built by the old create_all().
+BASELINE_REVISION = "0001"
+
+
+def alembic_config() -> Config:
+    config = Config()
+    config.set_main_option("script_location", MIGRATIONS_DIR)
+    config.set_main_option("sqlalchemy.url", DATABASE_URL.replace("%", "%%"))
+    return config
+
+
+def upgrade(revision: str = "head"):
+    """
+    Upgrade the database, adopting one created before migrations existed.
+
+    A database that has the app tables but no alembic_version table was
+    built by create_all(); it is stamped at the baseline first so the later
+    revisions apply on top of it.
+    """
+    config = alembic_config()
+    tables = set(inspect(engine).get_table_names())
+    if "users" in tables and "alembic_version" not in tables:
+        command.stamp(config, BASELINE_REVISION)
+    command.upgrade(config, revision)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run database migrations.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("upgrade").add_argument("revision", nargs="?", default="head")
+    sub.add_parser("downgrade").add_argument("revision")
+    sub.add_parser("stamp").add_argument("revision")
+    sub.add_parser("current")
+    sub.add_parser("history")
+    new = sub.add_parser("revision")
+    new.add_argument("-m", "--message", required=True)
+    args = parser.parse_args()
+
+    config = alembic_config()
+    if args.command == "upgrade":
+        upgrade(args.revision)
+    elif args.command == "downgrade":
+        command.downgrade(config, args.revision)
+    elif args.command == "stamp":
+        command.stamp(config, args.revision)
+    elif args.command == "current":
+        command.current(config, verbose=True)
+    elif args.command == "history":
+        command.history(config)
+    else:
+        command.revision(config, message=args.message)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""
+Helpers for revisions that must run against a live database.
+
+Index builds use CREATE/DROP INDEX CONCURRENTLY on PostgreSQL, which does
+not block writes but cannot run inside a transaction, so they run in an
+autocommit block. A concurrent build that fails leaves an invalid index
+behind, which a rerun drops and builds again. A partitioned table cannot be
+indexed concurrently, so its index is declared on the parent alone and
+built on each partition. Backfills walk the key range in batches, committing each
+batch separately so row locks are short and replicas keep up.
+"""
+
+import logging
+import time
+from typing import Callable, Optional
+from alembic import op
+from sqlalchemy import func, inspect, select, text
+
+
+def _is_postgresql() -> bool:
+    return op.get_bind().dialect.name == "postgresql"
+
+
+def _index_valid(name: str) -> Optional[bool]:
+    """On PostgreSQL, whether an index is valid, or None if there is none."""
+    return (
+        op.get_bind()
+        .execute(
+            text(
+                "SELECT indisvalid FROM pg_index WHERE indexrelid = to_regclass(:name)"
+            ),
+            {"name": name},
+        )
+        .scalar()
+    )
+
+
+def index_exists(table: str, name: str) -> bool:
+    """Whether the index exists, valid or not."""
+    if _is_postgresql():
+        return _index_valid(name) is not None
+    inspector = inspect(op.get_bind())
+    return any(index["name"] == name for index in inspector.get_indexes(table))
+
+
+def _partitions(table: str) -> Optional[list[str]]:
+    """The partitions of a partitioned PostgreSQL table, or None for a plain one."""
+    bind = op.get_bind()
+    partitioned = bind.execute(
+        text(
+            "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table"
+            " WHERE partrelid = to_regclass(:table))"
+        ),
+        {"table": table},
+    ).scalar()
+    if not partitioned:
+        return None
+    return list(
+        bind.execute(
+            text(
+                "SELECT c.relname FROM pg_inherits i"
+                " JOIN pg_class c ON c.oid = i.inhrelid"
+                " WHERE i.inhparent = to_regclass(:table) ORDER BY c.relname"
+            ),
+            {"table": table},
+        ).scalars()
+    )
+
+
+def _create_partitioned_index(
+    name: str, table: str, partitions: list[str], columns: list, unique: bool
+):
+    """
+    Index a partitioned table one partition at a time.
+
+    The parent's index starts out invalid and becomes valid once every
+    partition's index is attached. Partitions created later get a copy.
+    Rerunning after a failure keeps the parent's index and the partitions'
+    valid ones, rebuilding only what is missing or invalid.
+    """
+    with op.get_context().autocommit_block():
+        op.execute(
+            f"CREATE {'UNIQUE ' if unique else ''}INDEX IF NOT EXISTS {name}"
+            f" ON ONLY {table} ({', '.join(columns)})"
+        )
+        for partition in partitions:
+            child = f"{name}_{partition.removeprefix(f'{table}_')}"
+            if _index_valid(child) is False:
+                op.drop_index(child, table_name=partition, postgresql_concurrently=True)
+            op.create_index(
+                child,
+                partition,
+                columns,
+                unique=unique,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+            op.execute(f"ALTER INDEX {name} ATTACH PARTITION {child}")
+
+
+def create_index_online(name: str, table: str, columns: list, unique: bool = False):
+    """
+    Build an index without blocking writes; a no-op if it already exists.
+
+    On PostgreSQL an invalid index left by an interrupted build is rebuilt.
+    """
+    if not _is_postgresql():
+        if not index_exists(table, name):
+            op.create_index(name, table, columns, unique=unique)
+        return
+    valid = _index_valid(name)
+    if valid:
+        return
+    partitions = _partitions(table)
+    if partitions is not None:
+        _create_partitioned_index(name, table, partitions, columns, unique)
+    else:
+        with op.get_context().autocommit_block():
+            if valid is False:
+                op.drop_index(name, table_name=table, postgresql_concurrently=True)
+            op.create_index(
+                name, table, columns, unique=unique, postgresql_concurrently=True
+            )
+
+
+def drop_index_online(name: str, table: str):
+    if not index_exists(table, name):
+        return
+    if _is_postgresql() and _partitions(table) is not None:
+        # Not possible concurrently; dropping the parent's index drops the
+        # partitions' with it, a catalog-only change.
+        op.drop_index(name, table_name=table)
+    elif _is_postgresql():
+        with op.get_context().autocommit_block():
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
+    else:
+        op.drop_index(name, table_name=table)
+
+
+def backfill_in_batches(
+    key_column,
+    run_batch: Callable[[int, int], Optional[int]],
+    batch_size: int = 10_000,
+    pause_seconds: float = 0.0,
+):
+    """
+    Call `run_batch(low, high)` for consecutive [low, high) ranges of a key.
+
+    Each batch commits on its own. `pause_seconds` between batches gives
+    replicas and foreground traffic room to breathe during match days.
+    """
+    bind = op.get_bind()
+    low, high = bind.execute(select(func.min(key_column), func.max(key_column))).one()
+    if low is None:
+        return
+    with op.get_context().autocommit_block():
+        for start in range(low, high + 1, batch_size):
+            changed = run_batch(start, start + batch_size)
+            logging.info(
+                f"Backfilled {key_column} [{start}, {start + batch_size}): {changed}"
+            )
+            if pause_seconds:
+                time.sleep(pause_seconds)
@@ -0,0 +1,80 @@
+"""Baseline: the schema previously built by create_all()
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("username", sa.String(), nullable=False),
+        sa.Column("password_hash", sa.String(), nullable=False),
+        sa.Column("is_admin", sa.Boolean()),
+        sa.Column("total_points", sa.Integer()),
+        sa.Column("payment_status", sa.String()),
+        sa.Column("created_at", sa.DateTime()),
+        sa.Column("updated_at", sa.DateTime()),
+    )
+    op.create_index("ix_users_id", "users", ["id"])
+    op.create_index("ix_users_username", "users", ["username"], unique=True)
+
+    op.create_table(
+        "matches",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("team1", sa.String(), nullable=False),
+        sa.Column("team2", sa.String(), nullable=False),
+        sa.Column("start_time", sa.DateTime(), nullable=False),
+        sa.Column("status", sa.String()),
+        sa.Column("team1_score", sa.Integer()),
+        sa.Column("team2_score", sa.Integer()),
+        sa.Column("created_at", sa.DateTime()),
+        sa.Column("updated_at", sa.DateTime()),
+    )
+    op.create_index("ix_matches_id", "matches", ["id"])
+    op.create_index("ix_matches_status", "matches", ["status"])
+
+    op.create_table(
+        "predictions",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column(
+            "match_id", sa.Integer(), sa.ForeignKey("matches.id"), nullable=False
+        ),
+        sa.Column("team1_prediction", sa.Integer(), nullable=False),
+        sa.Column("team2_prediction", sa.Integer(), nullable=False),
+        sa.Column("points_earned", sa.Integer()),
+        sa.Column("boost_active", sa.Boolean()),
+        sa.Column("created_at", sa.DateTime()),
+        sa.Column("updated_at", sa.DateTime()),
+    )
+    op.create_index("ix_predictions_id", "predictions", ["id"])
+    op.create_index("ix_predictions_user_id", "predictions", ["user_id"])
+    op.create_index("ix_predictions_match_id", "predictions", ["match_id"])
+
+    op.create_table(
+        "payments",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("amount", sa.Float(), nullable=False),
+        sa.Column("date", sa.DateTime()),
+        sa.Column("status", sa.String()),
+    )
+    op.create_index("ix_payments_id", "payments", ["id"])
+
+
+def downgrade():
+    op.drop_table("payments")
+    op.drop_table("predictions")
+    op.drop_table("matches")
+    op.drop_table("users")
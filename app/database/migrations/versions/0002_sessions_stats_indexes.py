@@ -0,0 +1,126 @@
+"""Sessions, user stats, the prediction key and query-shaped indexes
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+
+Every index is built online, so this revision can run against a live
+database. Tables and indexes that already exist (databases created by
+create_all() after they were added to the models) are left alone.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from app.database.migration_ops import (
+    create_index_online,
+    drop_index_online,
+    index_exists,
+)
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def _has_table(name: str) -> bool:
+    return sa.inspect(op.get_bind()).has_table(name)
+
+
+def _has_unique_key(table: str, name: str) -> bool:
+    inspector = sa.inspect(op.get_bind())
+    return index_exists(table, name) or any(
+        c["name"] == name for c in inspector.get_unique_constraints(table)
+    )
+
+
+def upgrade():
+    if not _has_table("sessions"):
+        op.create_table(
+            "sessions",
+            sa.Column("id", sa.String(64), primary_key=True),
+            sa.Column(
+                "user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False
+            ),
+            sa.Column("created_at", sa.DateTime()),
+            sa.Column("expires_at", sa.DateTime(), nullable=False),
+        )
+        op.create_index("ix_sessions_user_id", "sessions", ["user_id"])
+        op.create_index("ix_sessions_expires_at", "sessions", ["expires_at"])
+
+    if not _has_table("user_stats"):
+        op.create_table(
+            "user_stats",
+            sa.Column(
+                "user_id", sa.Integer(), sa.ForeignKey("users.id"), primary_key=True
+            ),
+            *(
+                sa.Column(name, sa.Integer(), nullable=False, server_default="0")
+                for name in (
+                    "predictions_scored",
+                    "exact_hits",
+                    "one_score_hits",
+                    "winner_hits",
+                    "misses",
+                    "boosts_used",
+                    "points",
+                )
+            ),
+            sa.Column("updated_at", sa.DateTime()),
+        )
+
+    if not _has_unique_key("predictions", "uq_predictions_user_match"):
+        # Keep the newest of any duplicate (user_id, match_id) pairs.
+        op.execute(
+            "DELETE FROM predictions WHERE EXISTS ("
+            " SELECT 1 FROM predictions newer"
+            " WHERE newer.user_id = predictions.user_id"
+            " AND newer.match_id = predictions.match_id"
+            " AND newer.id > predictions.id)"
+        )
+        create_index_online(
+            "uq_predictions_user_match",
+            "predictions",
+            ["user_id", "match_id"],
+            unique=True,
+        )
+        if op.get_bind().dialect.name == "postgresql":
+            op.execute(
+                "ALTER TABLE predictions ADD CONSTRAINT uq_predictions_user_match"
+                " UNIQUE USING INDEX uq_predictions_user_match"
+            )
+
+    create_index_online(
+        "ix_users_leaderboard", "users", [sa.text("total_points DESC"), "id"]
+    )
+    create_index_online(
+        "ix_matches_status_start_time", "matches", ["status", "start_time"]
+    )
+    create_index_online("ix_matches_start_time", "matches", ["start_time", "id"])
+    create_index_online(
+        "ix_predictions_created_at", "predictions", ["created_at", "id"]
+    )
+    create_index_online("ix_payments_user_id", "payments", ["user_id"])
+    create_index_online("ix_payments_date", "payments", ["date", "id"])
+    # Both are prefixes of the composite keys above.
+    drop_index_online("ix_matches_status", "matches")
+    drop_index_online("ix_predictions_user_id", "predictions")
+
+
+def downgrade():
+    create_index_online("ix_predictions_user_id", "predictions", ["user_id"])
+    create_index_online("ix_matches_status", "matches", ["status"])
+    drop_index_online("ix_payments_date", "payments")
+    drop_index_online("ix_payments_user_id", "payments")
+    drop_index_online("ix_predictions_created_at", "predictions")
+    drop_index_online("ix_matches_start_time", "matches")
+    drop_index_online("ix_matches_status_start_time", "matches")
+    drop_index_online("ix_users_leaderboard", "users")
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute(
+            "ALTER TABLE predictions DROP CONSTRAINT IF EXISTS uq_predictions_user_match"
+        )
+    else:
+        drop_index_online("uq_predictions_user_match", "predictions")
+    op.drop_table("user_stats")
+    op.drop_table("sessions")
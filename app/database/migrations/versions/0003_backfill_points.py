@@ -0,0 +1,162 @@
+"""Rescore finished predictions and rebuild totals and user stats in batches
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+
+Recomputes points_earned for every prediction on a finished match, then
+users.total_points and user_stats, walking each table in id batches so the
+backfill can run while the app is serving traffic.
+"""
+
+import os
+from datetime import datetime
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql, sqlite
+from app.database.migration_ops import backfill_in_batches
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = int(os.getenv("MIGRATION_BATCH_SIZE", 10_000))
+PAUSE_SECONDS = float(os.getenv("MIGRATION_PAUSE_SECONDS", 0))
+
+predictions = sa.table(
+    "predictions",
+    sa.column("id", sa.Integer),
+    sa.column("user_id", sa.Integer),
+    sa.column("match_id", sa.Integer),
+    sa.column("team1_prediction", sa.Integer),
+    sa.column("team2_prediction", sa.Integer),
+    sa.column("points_earned", sa.Integer),
+    sa.column("boost_active", sa.Boolean),
+)
+matches = sa.table(
+    "matches",
+    sa.column("id", sa.Integer),
+    sa.column("status", sa.String),
+    sa.column("team1_score", sa.Integer),
+    sa.column("team2_score", sa.Integer),
+)
+users = sa.table(
+    "users", sa.column("id", sa.Integer), sa.column("total_points", sa.Integer)
+)
+STAT_COLUMNS = (
+    "predictions_scored",
+    "exact_hits",
+    "one_score_hits",
+    "winner_hits",
+    "misses",
+    "boosts_used",
+    "points",
+)
+user_stats = sa.table(
+    "user_stats",
+    sa.column("user_id", sa.Integer),
+    *(sa.column(name, sa.Integer) for name in STAT_COLUMNS),
+    sa.column("updated_at", sa.DateTime),
+)
+
+
+def _points():
+    """The scoring rules of utils.calculate_points_for_match, as SQL."""
+    p, m = predictions.c, matches.c
+    team1_hit = p.team1_prediction == m.team1_score
+    team2_hit = p.team2_prediction == m.team2_score
+    pred_diff = p.team1_prediction - p.team2_prediction
+    actual_diff = m.team1_score - m.team2_score
+    same_winner = sa.or_(
+        sa.and_(pred_diff > 0, actual_diff > 0),
+        sa.and_(pred_diff < 0, actual_diff < 0),
+        sa.and_(pred_diff == 0, actual_diff == 0),
+    )
+    base = sa.case(
+        (sa.and_(team1_hit, team2_hit), 7),
+        (sa.or_(team1_hit, team2_hit), 5),
+        (same_winner, 2),
+        else_=0,
+    )
+    return sa.case((p.boost_active.is_(True), base * 2), else_=base)
+
+
+def _user_stats_upsert(dialect_name: str, low: int, high: int):
+    """user_stats rows for users in [low, high), as they are at this revision."""
+    points = sa.func.coalesce(predictions.c.points_earned, 0)
+
+    def count_where(condition):
+        return sa.func.sum(sa.case((condition, 1), else_=0))
+
+    source = (
+        sa.select(
+            predictions.c.user_id,
+            sa.func.count(),
+            count_where(points.in_((7, 14))),
+            count_where(points.in_((5, 10))),
+            count_where(points.in_((2, 4))),
+            count_where(points == 0),
+            count_where(predictions.c.boost_active.is_(True)),
+            sa.func.sum(points),
+            sa.literal(datetime.now()),
+        )
+        .join(matches, matches.c.id == predictions.c.match_id)
+        .where(
+            matches.c.status == "finished",
+            matches.c.team1_score.is_not(None),
+            predictions.c.user_id >= low,
+            predictions.c.user_id < high,
+        )
+        .group_by(predictions.c.user_id)
+    )
+    dialect = postgresql if dialect_name == "postgresql" else sqlite
+    columns = ["user_id", *STAT_COLUMNS, "updated_at"]
+    stmt = dialect.insert(user_stats).from_select(columns, source)
+    return stmt.on_conflict_do_update(
+        index_elements=[user_stats.c.user_id],
+        set_={name: stmt.excluded[name] for name in columns[1:]},
+    )
+
+
+def upgrade():
+    bind = op.get_bind()
+    points = _points()
+
+    def rescore(low: int, high: int) -> int:
+        return bind.execute(
+            sa.update(predictions)
+            .where(
+                predictions.c.match_id == matches.c.id,
+                matches.c.status == "finished",
+                matches.c.team1_score.is_not(None),
+                matches.c.team2_score.is_not(None),
+                predictions.c.id >= low,
+                predictions.c.id < high,
+            )
+            .values(points_earned=points)
+        ).rowcount
+
+    def retotal(low: int, high: int) -> int:
+        total = (
+            sa.select(sa.func.coalesce(sa.func.sum(predictions.c.points_earned), 0))
+            .where(predictions.c.user_id == users.c.id)
+            .scalar_subquery()
+        )
+        return bind.execute(
+            sa.update(users)
+            .where(users.c.id >= low, users.c.id < high)
+            .values(total_points=total)
+        ).rowcount
+
+    def restat(low: int, high: int) -> int:
+        return bind.execute(_user_stats_upsert(bind.dialect.name, low, high)).rowcount
+
+    backfill_in_batches(predictions.c.id, rescore, BATCH_SIZE, PAUSE_SECONDS)
+    backfill_in_batches(users.c.id, retotal, BATCH_SIZE, PAUSE_SECONDS)
+    backfill_in_batches(users.c.id, restat, BATCH_SIZE, PAUSE_SECONDS)
+
+
+def downgrade():
+    # A data backfill; the previous values are not recoverable or needed.
+    pass
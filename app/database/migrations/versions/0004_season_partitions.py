@@ -0,0 +1,273 @@
+"""Seasons on matches and predictions; partition predictions by season
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+
+Adds matches.season (the kickoff year) and its copy predictions.season,
+backfilled in batches. On PostgreSQL, predictions then becomes a table
+partitioned BY LIST (season). The existing table is not copied: it is
+attached as the DEFAULT partition, after building the matching unique
+indexes concurrently. The current and next season, and seasons that have
+matches but no predictions yet, get their own partitions here; later ones
+come from `python -m app.database.partitions ensure`. Creating a partition
+next to a default one normally scans the default under lock, so CHECK
+constraints that rule those seasons out of the old table are validated
+first, which only blocks schema changes. The blocking step is then a
+short run of catalog-only DDL. Predictions for those seasons are refused
+from the moment the CHECK is added until the migration commits.
+"""
+
+import os
+from datetime import datetime
+from alembic import op
+import sqlalchemy as sa
+from app.database.migration_ops import (
+    backfill_in_batches,
+    create_index_online,
+    drop_index_online,
+    index_exists,
+)
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+DEFAULT_PARTITION = "predictions_default"
+BATCH_SIZE = int(os.getenv("MIGRATION_BATCH_SIZE", 10_000))
+PAUSE_SECONDS = float(os.getenv("MIGRATION_PAUSE_SECONDS", 0))
+
+matches = sa.table(
+    "matches",
+    sa.column("id", sa.Integer),
+    sa.column("start_time", sa.DateTime),
+    sa.column("season", sa.Integer),
+)
+predictions = sa.table(
+    "predictions",
+    sa.column("id", sa.Integer),
+    sa.column("match_id", sa.Integer),
+    sa.column("season", sa.Integer),
+)
+
+
+def _backfill_seasons():
+    bind = op.get_bind()
+    kickoff_year = sa.cast(sa.extract("year", matches.c.start_time), sa.Integer)
+    match_season = (
+        sa.select(matches.c.season)
+        .where(matches.c.id == predictions.c.match_id)
+        .scalar_subquery()
+    )
+
+    def match_batch(low: int, high: int) -> int:
+        return bind.execute(
+            sa.update(matches)
+            .where(matches.c.id >= low, matches.c.id < high)
+            .values(season=kickoff_year)
+        ).rowcount
+
+    def prediction_batch(low: int, high: int) -> int:
+        return bind.execute(
+            sa.update(predictions)
+            .where(predictions.c.id >= low, predictions.c.id < high)
+            .values(season=match_season)
+        ).rowcount
+
+    backfill_in_batches(matches.c.id, match_batch, BATCH_SIZE, PAUSE_SECONDS)
+    backfill_in_batches(predictions.c.id, prediction_batch, BATCH_SIZE, PAUSE_SECONDS)
+
+
+def _has_unique_constraint(table: str, name: str) -> bool:
+    inspector = sa.inspect(op.get_bind())
+    return any(c["name"] == name for c in inspector.get_unique_constraints(table))
+
+
+def upgrade():
+    op.add_column("matches", sa.Column("season", sa.Integer(), nullable=True))
+    op.add_column("predictions", sa.Column("season", sa.Integer(), nullable=True))
+    _backfill_seasons()
+    if op.get_bind().dialect.name == "postgresql":
+        _partition_predictions()
+    else:
+        with op.batch_alter_table("matches") as batch:
+            batch.alter_column("season", existing_type=sa.Integer(), nullable=False)
+        with op.batch_alter_table("predictions") as batch:
+            batch.alter_column("season", existing_type=sa.Integer(), nullable=False)
+            if _has_unique_constraint("predictions", "uq_predictions_user_match"):
+                batch.drop_constraint("uq_predictions_user_match", type_="unique")
+            elif index_exists("predictions", "uq_predictions_user_match"):
+                batch.drop_index("uq_predictions_user_match")
+            batch.create_unique_constraint(
+                "uq_predictions_user_match", ["user_id", "match_id", "season"]
+            )
+    create_index_online("ix_matches_season", "matches", ["season"])
+
+
+def _partition_predictions():
+    op.execute("ALTER TABLE matches ALTER COLUMN season SET NOT NULL")
+
+    # Indexes the partitioned parent's keys will adopt on ATTACH, built
+    # without blocking writes. The season index keeps the default
+    # partition's "does this season have rows here" check cheap.
+    create_index_online(
+        "predictions_default_key", "predictions", ["id", "season"], unique=True
+    )
+    create_index_online(
+        "predictions_default_user_match",
+        "predictions",
+        ["user_id", "match_id", "season"],
+        unique=True,
+    )
+    create_index_online("predictions_default_season", "predictions", ["season"])
+
+    bind = op.get_bind()
+    current = datetime.now().year
+    scheduled = bind.execute(sa.select(matches.c.season).distinct()).scalars().all()
+    predicted = bind.execute(sa.select(predictions.c.season).distinct()).scalars()
+    seasons = sorted({current, current + 1, *scheduled} - set(predicted))
+    # Validated CHECKs let SET NOT NULL, and creating each season's
+    # partition next to the default one, skip their full-table scans.
+    # VALIDATE scans without blocking reads or writes.
+    checks = {"predictions_season_not_null": "season IS NOT NULL"}
+    if seasons:
+        listed = ", ".join(str(int(season)) for season in seasons)
+        checks["predictions_default_seasons"] = f"season NOT IN ({listed})"
+    with op.get_context().autocommit_block():
+        for name, condition in checks.items():
+            op.execute(
+                f"ALTER TABLE predictions ADD CONSTRAINT {name}"
+                f" CHECK ({condition}) NOT VALID"
+            )
+            op.execute(f"ALTER TABLE predictions VALIDATE CONSTRAINT {name}")
+
+    # Catalog-only changes from here on; they commit together.
+    for statement in (
+        "ALTER TABLE predictions ALTER COLUMN season SET NOT NULL",
+        "ALTER TABLE predictions DROP CONSTRAINT predictions_season_not_null",
+        "ALTER TABLE predictions DROP CONSTRAINT predictions_pkey",
+        (
+            "ALTER TABLE predictions ADD CONSTRAINT predictions_default_pkey"
+            " PRIMARY KEY USING INDEX predictions_default_key"
+        ),
+        "ALTER TABLE predictions DROP CONSTRAINT uq_predictions_user_match",
+        (
+            "ALTER TABLE predictions ADD CONSTRAINT predictions_default_user_match"
+            " UNIQUE USING INDEX predictions_default_user_match"
+        ),
+        "ALTER INDEX ix_predictions_id RENAME TO predictions_default_id",
+        "ALTER INDEX ix_predictions_match_id RENAME TO predictions_default_match_id",
+        (
+            "ALTER INDEX ix_predictions_created_at"
+            " RENAME TO predictions_default_created_at"
+        ),
+        f"ALTER TABLE predictions RENAME TO {DEFAULT_PARTITION}",
+        """
+        CREATE TABLE predictions (
+            id INTEGER NOT NULL DEFAULT nextval('predictions_id_seq'),
+            user_id INTEGER NOT NULL REFERENCES users (id),
+            match_id INTEGER NOT NULL REFERENCES matches (id),
+            team1_prediction INTEGER NOT NULL,
+            team2_prediction INTEGER NOT NULL,
+            points_earned INTEGER,
+            boost_active BOOLEAN,
+            created_at TIMESTAMP WITHOUT TIME ZONE,
+            updated_at TIMESTAMP WITHOUT TIME ZONE,
+            season INTEGER NOT NULL,
+            CONSTRAINT predictions_pkey PRIMARY KEY (id, season),
+            CONSTRAINT uq_predictions_user_match
+                UNIQUE (user_id, match_id, season)
+        ) PARTITION BY LIST (season)
+        """,
+        "CREATE INDEX ix_predictions_id ON predictions (id)",
+        "CREATE INDEX ix_predictions_match_id ON predictions (match_id)",
+        "CREATE INDEX ix_predictions_created_at ON predictions (created_at, id)",
+        # The sequence must outlive the default partition once it is archived.
+        "ALTER SEQUENCE predictions_id_seq OWNED BY predictions.id",
+        f"ALTER TABLE predictions ATTACH PARTITION {DEFAULT_PARTITION} DEFAULT",
+    ):
+        op.execute(statement)
+
+    for season in seasons:
+        op.execute(
+            f"CREATE TABLE predictions_{int(season)} PARTITION OF predictions"
+            f" FOR VALUES IN ({int(season)})"
+        )
+    if seasons:
+        op.execute(
+            f"ALTER TABLE {DEFAULT_PARTITION}"
+            " DROP CONSTRAINT predictions_default_seasons"
+        )
+
+
+def _unpartition_predictions():
+    """
+    Copy every partition back into one plain predictions table.
+
+    Unlike the upgrade, this rewrites every prediction, and the renamed
+    table stays locked against reads and writes until it commits. Seasons that were already
+    detached and archived are not brought back.
+    """
+    for statement in (
+        "ALTER SEQUENCE predictions_id_seq OWNED BY NONE",
+        "ALTER TABLE predictions RENAME TO predictions_partitioned",
+        """
+        CREATE TABLE predictions (
+            id INTEGER NOT NULL DEFAULT nextval('predictions_id_seq'),
+            user_id INTEGER NOT NULL,
+            match_id INTEGER NOT NULL,
+            team1_prediction INTEGER NOT NULL,
+            team2_prediction INTEGER NOT NULL,
+            points_earned INTEGER,
+            boost_active BOOLEAN,
+            created_at TIMESTAMP WITHOUT TIME ZONE,
+            updated_at TIMESTAMP WITHOUT TIME ZONE
+        )
+        """,
+        """
+        INSERT INTO predictions (
+            id, user_id, match_id, team1_prediction, team2_prediction,
+            points_earned, boost_active, created_at, updated_at
+        )
+        SELECT id, user_id, match_id, team1_prediction, team2_prediction,
+            points_earned, boost_active, created_at, updated_at
+        FROM predictions_partitioned
+        """,
+        # Drops every attached partition with it.
+        "DROP TABLE predictions_partitioned",
+        # Keys and indexes are built after the copy, which is faster.
+        "ALTER TABLE predictions ADD CONSTRAINT predictions_pkey PRIMARY KEY (id)",
+        (
+            "ALTER TABLE predictions ADD CONSTRAINT uq_predictions_user_match"
+            " UNIQUE (user_id, match_id)"
+        ),
+        (
+            "ALTER TABLE predictions ADD CONSTRAINT predictions_user_id_fkey"
+            " FOREIGN KEY (user_id) REFERENCES users (id)"
+        ),
+        (
+            "ALTER TABLE predictions ADD CONSTRAINT predictions_match_id_fkey"
+            " FOREIGN KEY (match_id) REFERENCES matches (id)"
+        ),
+        "CREATE INDEX ix_predictions_id ON predictions (id)",
+        "CREATE INDEX ix_predictions_match_id ON predictions (match_id)",
+        "CREATE INDEX ix_predictions_created_at ON predictions (created_at, id)",
+        "ALTER SEQUENCE predictions_id_seq OWNED BY predictions.id",
+    ):
+        op.execute(statement)
+
+
+def downgrade():
+    drop_index_online("ix_matches_season", "matches")
+    if op.get_bind().dialect.name == "postgresql":
+        _unpartition_predictions()
+    else:
+        with op.batch_alter_table("predictions") as batch:
+            batch.drop_constraint("uq_predictions_user_match", type_="unique")
+            batch.create_unique_constraint(
+                "uq_predictions_user_match", ["user_id", "match_id"]
+            )
+            batch.drop_column("season")
+    with op.batch_alter_table("matches") as batch:
+        batch.drop_column("season")
@@ -0,0 +1,37 @@
+"""Indexes for the admin tables' sort orders
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18
+
+Each admin table sorts by a column and then by id, and reads one page
+with LIMIT/OFFSET. Without a (column, id) index that is a sort of the
+whole table per page. The indexes are built online, one partition at a
+time for predictions on PostgreSQL.
+"""
+
+from app.database.migration_ops import create_index_online, drop_index_online
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+INDEXES = (
+    ("ix_users_is_admin", "users", ["is_admin", "id"]),
+    ("ix_users_payment_status", "users", ["payment_status", "id"]),
+    ("ix_payments_amount", "payments", ["amount", "id"]),
+    ("ix_payments_status", "payments", ["status", "id"]),
+    ("ix_predictions_points_earned", "predictions", ["points_earned", "id"]),
+    ("ix_predictions_boost_active", "predictions", ["boost_active", "id"]),
+)
+
+
+def upgrade():
+    for name, table, columns in INDEXES:
+        create_index_online(name, table, columns)
+
+
+def downgrade():
+    for name, table, _ in reversed(INDEXES):
+        drop_index_online(name, table)
@@ -1,9 +1,28 @@
-from sqlalchemy import Boolean, Column, ForeignKey, Integer, String, Float, DateTime
+from sqlalchemy import (
+    Boolean,
+    Column,
+    ForeignKey,
+    Integer,
+    String,
+    Float,
+    DateTime,
+    Index,
+    UniqueConstraint,
+)
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.database.database import Base
 
 
+def season_of(start_time: datetime) -> int:
+    """The season a match belongs to: the calendar year of its kickoff."""
+    return start_time.year
+
+
+def _default_season(context) -> int:
+    return season_of(context.get_current_parameters()["start_time"])
+
+
 class User(Base):
     __tablename__ = "users"
     id = Column(Integer, primary_key=True, index=True)
@@ -20,6 +39,18 @@ class User(Base):
     payments = relationship(
         "Payment", back_populates="user", cascade="all, delete-orphan"
     )
+    sessions = relationship(
+        "UserSession", back_populates="user", cascade="all, delete-orphan"
+    )
+    stats = relationship(
+        "UserStats", back_populates="user", uselist=False, cascade="all, delete-orphan"
+    )
+    # The (column, id) indexes serve the admin table's sort orders.
+    __table_args__ = (
+        Index("ix_users_leaderboard", total_points.desc(), id),
+        Index("ix_users_is_admin", is_admin, id),
+        Index("ix_users_payment_status", payment_status, id),
+    )
 
 
 class Match(Base):
@@ -28,36 +59,87 @@ class Match(Base):
     team1 = Column(String, nullable=False)
     team2 = Column(String, nullable=False)
     start_time = Column(DateTime, nullable=False)
-    status = Column(String, default="upcoming", index=True)
+    status = Column(String, default="upcoming")
     team1_score = Column(Integer, nullable=True)
     team2_score = Column(Integer, nullable=True)
+    # Fixed at creation, even if the kickoff is later moved across a year.
+    season = Column(Integer, nullable=False, default=_default_season, index=True)
     created_at = Column(DateTime, default=datetime.now)
     updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
     predictions = relationship(
         "Prediction", back_populates="match", cascade="all, delete-orphan"
     )
 
+    # (status, start_time) serves status-filtered schedules, the prediction
+    # lock and the kickoff scheduler; (start_time, id) the admin time sort.
+    __table_args__ = (
+        Index("ix_matches_status_start_time", status, start_time),
+        Index("ix_matches_start_time", start_time, id),
+    )
+
 
 class Prediction(Base):
     __tablename__ = "predictions"
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    # user_id lookups use the leading column of uq_predictions_user_match.
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     match_id = Column(Integer, ForeignKey("matches.id"), nullable=False, index=True)
     team1_prediction = Column(Integer, nullable=False)
     team2_prediction = Column(Integer, nullable=False)
     points_earned = Column(Integer, default=0)
     boost_active = Column(Boolean, default=False)
+    # Copy of matches.season. On PostgreSQL this is the partition key (see
+    # app/database/partitions.py), so it is part of every unique key there.
+    season = Column(Integer, nullable=False)
     created_at = Column(DateTime, default=datetime.now)
     updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
     user = relationship("User", back_populates="predictions")
     match = relationship("Match", back_populates="predictions")
+    __table_args__ = (
+        UniqueConstraint(
+            "user_id", "match_id", "season", name="uq_predictions_user_match"
+        ),
+        Index("ix_predictions_created_at", created_at, id),
+        Index("ix_predictions_points_earned", points_earned, id),
+        Index("ix_predictions_boost_active", boost_active, id),
+    )
 
 
 class Payment(Base):
     __tablename__ = "payments"
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     amount = Column(Float, nullable=False)
     date = Column(DateTime, default=datetime.now)
     status = Column(String, default="completed")
-    user = relationship("User", back_populates="payments")
\ No newline at end of file
+    user = relationship("User", back_populates="payments")
+    __table_args__ = (
+        Index("ix_payments_date", date, id),
+        Index("ix_payments_amount", amount, id),
+        Index("ix_payments_status", status, id),
+    )
+
+
+class UserSession(Base):
+    __tablename__ = "sessions"
+    id = Column(String(64), primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    created_at = Column(DateTime, default=datetime.now)
+    expires_at = Column(DateTime, nullable=False, index=True)
+    user = relationship("User", back_populates="sessions")
+
+
+class UserStats(Base):
+    """Per-user scoring aggregates, rewritten whenever a match is scored."""
+
+    __tablename__ = "user_stats"
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    predictions_scored = Column(Integer, nullable=False, default=0)
+    exact_hits = Column(Integer, nullable=False, default=0)
+    one_score_hits = Column(Integer, nullable=False, default=0)
+    winner_hits = Column(Integer, nullable=False, default=0)
+    misses = Column(Integer, nullable=False, default=0)
+    boosts_used = Column(Integer, nullable=False, default=0)
+    points = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
+    user = relationship("User", back_populates="stats")
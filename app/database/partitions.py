@@ -0,0 +1,243 @@
+"""
+Season partitions of the predictions table on PostgreSQL.
+
+    python -m app.database.partitions ensure [--ahead N]
+    python -m app.database.partitions list
+
+Migration 0004 turns predictions into a table partitioned BY LIST (season).
+Everything predicted before the conversion stays in predictions_default;
+later seasons get their own predictions_<season> partitions. Match-scoped
+queries that filter on season then touch one small partition, and a
+finished season can be detached and archived without rewriting or
+vacuuming the hot one.
+
+Partitions are created ahead of time, never by a request: creating one
+scans the default partition and briefly locks the parent table, so it
+belongs in a deploy or a scheduled maintenance run. init_db() and the
+`ensure` command create them for the current season, the next
+PARTITION_SEASONS_AHEAD seasons and any season that already has matches.
+Predictions for a season without a partition still work; they land in the
+default partition and stay there.
+
+On SQLite, or before the migration has run, these helpers are no-ops.
+"""
+
+import argparse
+import logging
+import os
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import Connection, Engine, text
+from sqlalchemy.exc import IntegrityError
+from app.database.database import engine as default_engine
+from app.database.models import season_of
+
+PARENT_TABLE = "predictions"
+DEFAULT_PARTITION = "predictions_default"
+PARTITION_SEASONS_AHEAD = int(os.getenv("PARTITION_SEASONS_AHEAD", 1))
+# Give up rather than queue behind long transactions, since every query on
+# predictions would then queue behind the DDL.
+PARTITION_LOCK_TIMEOUT = os.getenv("PARTITION_LOCK_TIMEOUT", "5s")
+
+
+def partition_name(season: int) -> str:
+    return f"{PARENT_TABLE}_{int(season)}"
+
+
+def is_partitioned(conn: Connection) -> bool:
+    if conn.dialect.name != "postgresql":
+        return False
+    return bool(
+        conn.execute(
+            text(
+                "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table"
+                " WHERE partrelid = to_regclass(:table))"
+            ),
+            {"table": PARENT_TABLE},
+        ).scalar()
+    )
+
+
+def season_partitions(conn: Connection) -> list[str]:
+    """Names of the attached partitions, the default one included."""
+    if not is_partitioned(conn):
+        return []
+    return list(
+        conn.execute(
+            text(
+                "SELECT c.relname FROM pg_inherits i"
+                " JOIN pg_class c ON c.oid = i.inhrelid"
+                " WHERE i.inhparent = to_regclass(:table) ORDER BY c.relname"
+            ),
+            {"table": PARENT_TABLE},
+        ).scalars()
+    )
+
+
+def ensure_season_partition(conn: Connection, season: int) -> bool:
+    """
+    Create the partition for `season` unless it already exists.
+
+    Returns True if the season has its own partition. A season that
+    already has rows in the default partition stays there, since
+    PostgreSQL refuses a new partition that would strand them. To prove
+    that, the CREATE scans the default partition while it holds an ACCESS
+    EXCLUSIVE lock on the parent, unless a validated CHECK already rules
+    the season out; create_season_partition() sets that up first.
+    """
+    if not is_partitioned(conn):
+        return False
+    name = partition_name(season)
+    if conn.execute(text("SELECT to_regclass(:name)"), {"name": name}).scalar():
+        return True
+    in_default = conn.execute(
+        text(f"SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION} WHERE season = :s)"),
+        {"s": int(season)},
+    ).scalar()
+    if in_default:
+        return False
+    conn.execute(
+        text(
+            f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {PARENT_TABLE}"
+            f" FOR VALUES IN ({int(season)})"
+        )
+    )
+    return True
+
+
+def _set_lock_timeout(conn: Connection):
+    """Make DDL in the current transaction give up after PARTITION_LOCK_TIMEOUT."""
+    conn.execute(
+        text("SELECT set_config('lock_timeout', :t, true)"),
+        {"t": PARTITION_LOCK_TIMEOUT},
+    )
+
+
+def _run_ddl(engine: Engine, *statements: str):
+    with engine.begin() as conn:
+        _set_lock_timeout(conn)
+        for statement in statements:
+            conn.execute(text(statement))
+
+
+def create_season_partition(engine: Engine, season: int) -> bool:
+    """
+    Create the partition for `season` on a live database.
+
+    A CHECK (season <> ...) on the default partition is added NOT VALID
+    and validated first. VALIDATE scans the default partition under a
+    lock that lets reads and writes through, and the validated constraint
+    lets the CREATE skip its own scan, so the parent is only locked for
+    catalog changes. Until the CHECK is dropped again, predictions for
+    the season are refused, which is one more reason to create partitions
+    before the season's matches are scheduled. Returns the same as
+    ensure_season_partition().
+    """
+    with engine.connect() as conn:
+        if not is_partitioned(conn):
+            return False
+        if conn.execute(
+            text("SELECT to_regclass(:name)"), {"name": partition_name(season)}
+        ).scalar():
+            return True
+        in_default = conn.execute(
+            text(
+                f"SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION} WHERE season = :s)"
+            ),
+            {"s": int(season)},
+        ).scalar()
+        if in_default:
+            return False
+    check = f"{DEFAULT_PARTITION}_not_{int(season)}"
+    alter = f"ALTER TABLE {DEFAULT_PARTITION}"
+    _run_ddl(
+        engine,
+        f"{alter} DROP CONSTRAINT IF EXISTS {check}",
+        f"{alter} ADD CONSTRAINT {check} CHECK (season <> {int(season)}) NOT VALID",
+    )
+    try:
+        _run_ddl(engine, f"{alter} VALIDATE CONSTRAINT {check}")
+        with engine.begin() as conn:
+            _set_lock_timeout(conn)
+            return ensure_season_partition(conn, season)
+    except IntegrityError:
+        # Rows of this season reached the default partition meanwhile.
+        return False
+    finally:
+        _run_ddl(engine, f"{alter} DROP CONSTRAINT IF EXISTS {check}")
+
+
+def detach_season_partition(engine: Engine, season: int) -> Optional[str]:
+    """
+    Detach a season's partition from the predictions table.
+
+    DETACH ... CONCURRENTLY is refused while a default partition exists,
+    so this is a plain DETACH, which takes a brief ACCESS EXCLUSIVE lock
+    on the parent. It runs under PARTITION_LOCK_TIMEOUT so a busy table
+    makes it fail fast instead of queueing every other query behind it.
+    Returns the name of the now standalone table, also when an earlier
+    call already detached it, or None if the season never had a partition.
+    """
+    name = partition_name(season)
+    with engine.begin() as conn:
+        if not is_partitioned(conn):
+            return None
+        if name not in season_partitions(conn):
+            detached = conn.execute(text("SELECT to_regclass(:name)"), {"name": name})
+            return name if detached.scalar() else None
+        _set_lock_timeout(conn)
+        conn.execute(text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {name}"))
+    return name
+
+
+def ensure_upcoming_partitions(
+    engine: Engine, seasons_ahead: int = PARTITION_SEASONS_AHEAD
+) -> list[int]:
+    """
+    Create partitions for the coming seasons, one season at a time.
+
+    Covers the current season, the next `seasons_ahead` ones and any later
+    season that already has matches scheduled. Returns the seasons that
+    have their own partition.
+    """
+    current = season_of(datetime.now())
+    with engine.connect() as conn:
+        if not is_partitioned(conn):
+            return []
+        scheduled = conn.execute(
+            text("SELECT DISTINCT season FROM matches WHERE season > :s"),
+            {"s": current + seasons_ahead},
+        ).scalars()
+        seasons = sorted({*range(current, current + seasons_ahead + 1), *scheduled})
+    ready = []
+    for season in seasons:
+        if create_season_partition(engine, season):
+            ready.append(season)
+        else:
+            logging.warning(
+                "season %s has rows in %s; it keeps no partition of its own",
+                season,
+                DEFAULT_PARTITION,
+            )
+    return ready
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage predictions partitions.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    ensure = sub.add_parser("ensure")
+    ensure.add_argument("--ahead", type=int, default=PARTITION_SEASONS_AHEAD)
+    sub.add_parser("list")
+    args = parser.parse_args()
+
+    if args.command == "ensure":
+        for season in ensure_upcoming_partitions(default_engine, args.ahead):
+            print(partition_name(season))
+    else:
+        with default_engine.connect() as conn:
+            for name in season_partitions(conn):
+                print(name)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+import asyncio
+import logging
+import os
+import threading
+import time
+from typing import NamedTuple, Optional
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    return os.getenv(name, str(default)).lower() in ("1", "true", "yes", "on")
+
+
+class PoolSettings(NamedTuple):
+    pool_size: int
+    max_overflow: int
+    pool_timeout: float
+    pool_recycle: int
+    pre_ping: bool
+    validate_interval: float
+    metrics_interval: float
+
+    @classmethod
+    def from_env(cls) -> "PoolSettings":
+        return cls(
+            pool_size=int(os.getenv("DB_POOL_SIZE", 10)),
+            max_overflow=int(os.getenv("DB_MAX_OVERFLOW", 20)),
+            pool_timeout=float(os.getenv("DB_POOL_TIMEOUT", 30)),
+            pool_recycle=int(os.getenv("DB_POOL_RECYCLE", -1)),
+            pre_ping=_env_bool("DB_POOL_PRE_PING", True),
+            validate_interval=float(os.getenv("DB_POOL_VALIDATE_INTERVAL", 0)),
+            metrics_interval=float(os.getenv("DB_POOL_METRICS_INTERVAL", 0)),
+        )
+
+    def engine_kwargs(self, url: str, pool_class: type, pre_ping: bool) -> dict:
+        """create_engine() pool arguments for `url`."""
+        parsed = make_url(url)
+        if parsed.get_backend_name() == "sqlite" and parsed.database in (
+            None,
+            "",
+            ":memory:",
+        ):
+            # In-memory SQLite lives on a single connection; keep its pool.
+            return {"pool_pre_ping": pre_ping}
+        return {
+            "poolclass": pool_class,
+            "pool_size": self.pool_size,
+            "max_overflow": self.max_overflow,
+            "pool_timeout": self.pool_timeout,
+            "pool_recycle": self.pool_recycle,
+            "pool_pre_ping": pre_ping,
+        }
+
+
+class PoolMetrics:
+    """Checkout, wait-time, overflow and connection-age counters for a pool."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self._pool = None
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.connects = 0
+            self.checkouts = 0
+            self.invalidations = 0
+            self.wait_seconds_total = 0.0
+            self.wait_seconds_max = 0.0
+            self.overflow_checkouts = 0
+            self.overflow_peak = 0
+            self.connection_age_max = 0.0
+
+    def record_wait(self, seconds: float):
+        with self._lock:
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+
+    def attach(self, pool):
+        """Listen to connect/checkout/invalidate events on `pool`."""
+        self._pool = pool
+
+        @event.listens_for(pool, "connect")
+        def on_connect(dbapi_connection, record):
+            record.info["connected_at"] = time.monotonic()
+            with self._lock:
+                self.connects += 1
+
+        @event.listens_for(pool, "checkout")
+        def on_checkout(dbapi_connection, record, proxy):
+            age = time.monotonic() - record.info.get("connected_at", time.monotonic())
+            overflow = pool.overflow() if hasattr(pool, "overflow") else 0
+            with self._lock:
+                self.checkouts += 1
+                self.connection_age_max = max(self.connection_age_max, age)
+                if overflow > 0:
+                    self.overflow_checkouts += 1
+                    self.overflow_peak = max(self.overflow_peak, overflow)
+
+        @event.listens_for(pool, "invalidate")
+        def on_invalidate(dbapi_connection, record, exception):
+            with self._lock:
+                self.invalidations += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            counts = {
+                "connects": self.connects,
+                "checkouts": self.checkouts,
+                "invalidations": self.invalidations,
+                "wait_seconds_total": self.wait_seconds_total,
+                "wait_seconds_max": self.wait_seconds_max,
+                "overflow_checkouts": self.overflow_checkouts,
+                "overflow_peak": self.overflow_peak,
+                "connection_age_max": self.connection_age_max,
+            }
+        if hasattr(self._pool, "checkedout"):
+            counts.update(
+                size=self._pool.size(),
+                checked_in=self._pool.checkedin(),
+                checked_out=self._pool.checkedout(),
+                overflow=self._pool.overflow(),
+            )
+        return counts
+
+
+def timed_pool_class(base: type, metrics: PoolMetrics) -> type:
+    """Subclass a QueuePool to report how long each checkout waited."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return base._do_get(self)
+        finally:
+            metrics.record_wait(time.perf_counter() - start)
+
+    return type(f"Timed{base.__name__}", (base,), {"_do_get": _do_get})
+
+
+def _log_replaced(engine: Engine, replaced: int):
+    if replaced:
+        logging.warning(
+            "Pool validation replaced %d dead connections on %s", replaced, engine.url
+        )
+
+
+class PoolMonitor:
+    """
+    Daemon thread that validates idle connections and logs pool metrics.
+
+    With validation on, pool_pre_ping can be switched off: idle connections
+    get a "SELECT 1" every `validate_interval` seconds, and a dead one makes
+    SQLAlchemy invalidate the pool, so stale connections are replaced off
+    the request path instead of costing a round-trip on every checkout.
+
+    The thread validates the sync engines. Async connections belong to the
+    app's event loop, so validate_async_engines() runs there instead, as a
+    lifespan task.
+    """
+
+    def __init__(
+        self,
+        engines: list[Engine],
+        metrics: list[PoolMetrics],
+        async_engines: list[AsyncEngine] = (),
+        validate_interval: float = 0,
+        metrics_interval: float = 0,
+    ):
+        self.engines = engines
+        self.async_engines = async_engines
+        self.metrics = metrics
+        self.validate_interval = validate_interval
+        self.metrics_interval = metrics_interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        intervals = [i for i in (self.validate_interval, self.metrics_interval) if i]
+        if self._thread is None and intervals:
+            self._thread = threading.Thread(
+                target=self._run, args=(min(intervals),), name="db-pool", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def validate(self):
+        # QueuePool hands idle connections out FIFO, so sequential
+        # checkouts visit each of them once. After a dead one the rest are
+        # still checked out in turn, which reconnects any the pool
+        # invalidated along with it.
+        for engine in self.engines:
+            replaced = 0
+            for _ in range(engine.pool.checkedin()):
+                try:
+                    with engine.connect() as conn:
+                        conn.execute(text("SELECT 1"))
+                except Exception:
+                    replaced += 1
+            _log_replaced(engine, replaced)
+
+    async def validate_async(self):
+        for engine in self.async_engines:
+            replaced = 0
+            for _ in range(engine.sync_engine.pool.checkedin()):
+                try:
+                    async with engine.connect() as conn:
+                        await conn.execute(text("SELECT 1"))
+                except Exception:
+                    replaced += 1
+            _log_replaced(engine.sync_engine, replaced)
+
+    async def validate_async_engines(self):
+        """Lifespan task validating the async engines every interval."""
+        if not (self.validate_interval and self.async_engines):
+            return
+        while not self._stop.is_set():
+            await asyncio.sleep(self.validate_interval)
+            await self.validate_async()
+
+    def log_metrics(self):
+        for metrics in self.metrics:
+            logging.info("db pool %s: %s", metrics.name, metrics.snapshot())
+
+    def _run(self, tick: float):
+        last_validated = last_logged = time.monotonic()
+        while not self._stop.wait(tick):
+            now = time.monotonic()
+            if (
+                self.validate_interval
+                and now - last_validated >= self.validate_interval
+            ):
+                self.validate()
+                last_validated = now
+            if self.metrics_interval and now - last_logged >= self.metrics_interval:
+                self.log_metrics()
+                last_logged = now
@@ -0,0 +1,103 @@
+import functools
+import inspect
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Hashable, Optional
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+REPLICA_PIN_SECONDS = float(os.getenv("REPLICA_PIN_SECONDS", 10))
+
+
+class RoutingSession(Session):
+    """
+    Session that sends replica-safe reads to a read replica.
+
+    Everything runs on the primary bind unless a `replica_read` function
+    is executing; flushes always go to the primary.
+    """
+
+    def __init__(self, *args, replica: Optional[Engine] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.replica = replica
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if (
+            self.replica is not None
+            and self.info.get("use_replica")
+            and not self._flushing
+        ):
+            return self.replica
+        return super().get_bind(mapper, clause=clause, **kwargs)
+
+
+class RecentWrites:
+    """Users who wrote within the last `ttl_seconds`, pinned to the primary."""
+
+    def __init__(self, ttl_seconds: float, max_size: int = 100_000):
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._deadlines: dict[Hashable, float] = {}
+
+    def mark(self, user_id: Hashable):
+        now = time.monotonic()
+        with self._lock:
+            self._deadlines[user_id] = now + self.ttl_seconds
+            if len(self._deadlines) > self.max_size:
+                self._deadlines = {k: v for k, v in self._deadlines.items() if v > now}
+
+    def is_pinned(self, user_id: Hashable) -> bool:
+        with self._lock:
+            deadline = self._deadlines.get(user_id)
+            if deadline is None:
+                return False
+            if deadline <= time.monotonic():
+                del self._deadlines[user_id]
+                return False
+            return True
+
+
+recent_writes = RecentWrites(REPLICA_PIN_SECONDS)
+
+
+@contextmanager
+def _on_replica(db, enabled: bool):
+    previous = db.info.get("use_replica", False)
+    db.info["use_replica"] = enabled
+    try:
+        yield
+    finally:
+        db.info["use_replica"] = previous
+
+
+def replica_read(fn):
+    """
+    Run a read-only service function on the replica.
+
+    Functions taking a `user_id` stay on the primary for that user right
+    after they wrote, so they read their own writes despite replica lag.
+    """
+    signature = inspect.signature(fn)
+
+    def use_replica(args, kwargs) -> bool:
+        user_id = signature.bind_partial(*args, **kwargs).arguments.get("user_id")
+        return user_id is None or not recent_writes.is_pinned(user_id)
+
+    if inspect.iscoroutinefunction(fn):
+
+        @functools.wraps(fn)
+        async def async_wrapper(db, *args, **kwargs):
+            with _on_replica(db, use_replica((db, *args), kwargs)):
+                return await fn(db, *args, **kwargs)
+
+        return async_wrapper
+
+    @functools.wraps(fn)
+    def wrapper(db, *args, **kwargs):
+        with _on_replica(db, use_replica((db, *args), kwargs)):
+            return fn(db, *args, **kwargs)
+
+    return wrapper
@@ -1,14 +1,20 @@
+import argparse
 import random
 from datetime import datetime, timedelta
+import numpy as np
+from sqlalchemy import bindparam, insert, text, update
 from sqlalchemy.orm import Session
-from app.database.models import User, Match, Prediction
+from app.database.models import User, Match, Prediction, season_of
+from app.database.partitions import ensure_season_partition
 from app.database.service import (
+    bulk_upsert_predictions,
     create_user,
     create_match,
-    create_or_update_prediction,
+    refresh_user_stats,
     update_match,
 )
-from app.utils import hash_password
+from app.passwords import hash_password
+from app.utils import calculate_points_batch
 
 
 def seed_data(db: Session):
@@ -74,14 +80,24 @@ def seed_data(db: Session):
         matches.append(upcoming)
     for match in matches:
         if match.status == "finished":
+            # These matches are past their prediction lock, so write the
+            # history directly rather than through create_or_update_prediction.
+            predictions = []
             for user in users:
                 if random.random() > 0.2:
-                    p1 = random.randint(0, 3)
-                    p2 = random.randint(0, 3)
                     boost = (
                         random.choice([True, False]) if random.random() > 0.7 else False
                     )
-                    create_or_update_prediction(db, user.id, match.id, p1, p2, boost)
+                    predictions.append(
+                        {
+                            "user_id": user.id,
+                            "match_id": match.id,
+                            "team1_prediction": random.randint(0, 3),
+                            "team2_prediction": random.randint(0, 3),
+                            "boost_active": boost,
+                        }
+                    )
+            bulk_upsert_predictions(db, predictions)
             update_match(
                 db,
                 match.id,
@@ -92,4 +108,170 @@ def seed_data(db: Session):
                 match.team1_score,
                 match.team2_score,
             )
-    print("Database seeding complete.")
\ No newline at end of file
+    print("Database seeding complete.")
+
+
+def seed_synthetic(
+    db: Session,
+    users: int,
+    matches: int,
+    predictions: int,
+    seed: int = 42,
+    chunk_size: int = 50_000,
+    finished_ratio: float = 0.6,
+):
+    """
+    Seed an empty database with a large, reproducible synthetic dataset.
+
+    Rows are generated with a seeded NumPy RNG and written in chunks of
+    `chunk_size` through executemany inserts, so memory stays bounded by
+    the chunk size plus one points counter per user. Predictions on the
+    first `finished_ratio` of matches are scored as they are generated.
+    """
+    if db.query(User).count() > 0:
+        print("Database already seeded.")
+        return
+    if predictions > users * matches:
+        raise ValueError("Cannot generate more predictions than user/match pairs.")
+    rng = np.random.default_rng(seed)
+    now = datetime.now()
+    password_hash = hash_password("password")
+    print(f"Seeding {users} users, {matches} matches, {predictions} predictions...")
+
+    paid = rng.random(users) > 0.2
+    for start in range(0, users, chunk_size):
+        stop = min(start + chunk_size, users)
+        db.execute(
+            insert(User),
+            [
+                {
+                    "id": i + 1,
+                    "username": f"user{i + 1}",
+                    "password_hash": password_hash,
+                    "is_admin": i == 0,
+                    "total_points": 0,
+                    "payment_status": "paid" if paid[i] else "pending",
+                }
+                for i in range(start, stop)
+            ],
+        )
+    del paid
+
+    finished = int(matches * finished_ratio)
+    home = rng.integers(0, 40, size=matches)
+    away = (home + rng.integers(1, 40, size=matches)) % 40
+    scores = rng.poisson(1.4, size=(matches, 2))
+    match_rows = []
+    seasons = []
+    for i in range(matches):
+        is_finished = i < finished
+        start_time = now + timedelta(hours=i - finished)
+        seasons.append(season_of(start_time))
+        match_rows.append(
+            {
+                "id": i + 1,
+                "team1": f"Team {home[i] + 1}",
+                "team2": f"Team {away[i] + 1}",
+                "start_time": start_time,
+                "season": seasons[-1],
+                "status": "finished" if is_finished else "upcoming",
+                "team1_score": int(scores[i, 0]) if is_finished else None,
+                "team2_score": int(scores[i, 1]) if is_finished else None,
+            }
+        )
+        if len(match_rows) == chunk_size:
+            db.execute(insert(Match), match_rows)
+            match_rows = []
+    if match_rows:
+        db.execute(insert(Match), match_rows)
+    del match_rows
+    for season in sorted(set(seasons)):
+        ensure_season_partition(db.connection(), season)
+
+    totals = np.zeros(users + 1, dtype=np.int64)
+    per_match, remainder = divmod(predictions, matches)
+    pending = []
+    next_id = 1
+    for i in range(matches):
+        count = per_match + (1 if i < remainder else 0)
+        if count == 0:
+            continue
+        # A contiguous run from a random offset keeps (user, match) unique.
+        user_ids = (rng.integers(users) + np.arange(count)) % users + 1
+        team1 = rng.poisson(1.4, size=count)
+        team2 = rng.poisson(1.4, size=count)
+        boost = rng.random(count) < 0.1
+        if i < finished:
+            points = calculate_points_batch(
+                int(scores[i, 0]), int(scores[i, 1]), team1, team2, boost
+            )
+            np.add.at(totals, user_ids, points)
+        else:
+            points = np.zeros(count, dtype=np.int64)
+        for j in range(count):
+            pending.append(
+                {
+                    "id": next_id,
+                    "user_id": int(user_ids[j]),
+                    "match_id": i + 1,
+                    "season": seasons[i],
+                    "team1_prediction": int(team1[j]),
+                    "team2_prediction": int(team2[j]),
+                    "boost_active": bool(boost[j]),
+                    "points_earned": int(points[j]),
+                }
+            )
+            next_id += 1
+            if len(pending) == chunk_size:
+                db.execute(insert(Prediction), pending)
+                db.commit()
+                pending = []
+    if pending:
+        db.execute(insert(Prediction), pending)
+
+    users_table = User.__table__
+    scored = np.flatnonzero(totals)
+    for start in range(0, len(scored), chunk_size):
+        db.execute(
+            update(users_table)
+            .where(users_table.c.id == bindparam("target_user_id"))
+            .values(total_points=bindparam("points")),
+            [
+                {"target_user_id": int(uid), "points": int(totals[uid])}
+                for uid in scored[start : start + chunk_size]
+            ],
+        )
+    refresh_user_stats(db)
+    if db.get_bind().dialect.name == "postgresql":
+        for table in ("users", "matches", "predictions"):
+            db.execute(
+                text(
+                    f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+                    f"(SELECT MAX(id) FROM {table}))"
+                )
+            )
+    db.commit()
+    print("Synthetic seeding complete.")
+
+
+if __name__ == "__main__":
+    from app.database.database import SessionLocal
+    from app.database.migrate import upgrade
+
+    parser = argparse.ArgumentParser(description="Seed a synthetic dataset.")
+    parser.add_argument("--users", type=int, default=1_000_000)
+    parser.add_argument("--matches", type=int, default=10_000)
+    parser.add_argument("--predictions", type=int, default=50_000_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--chunk-size", type=int, default=50_000)
+    args = parser.parse_args()
+    upgrade()
+    with SessionLocal() as db:
+        seed_synthetic(
+            db,
+            args.users,
+            args.matches,
+            args.predictions,
+            seed=args.seed,
+            chunk_size=args.chunk_size,
+        )
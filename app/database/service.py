@@ -1,11 +1,41 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
-from typing import Optional
-from datetime import datetime
-from app.database.models import User, Match, Prediction, Payment
-from app.utils import hash_password, calculate_points_for_match
-from app.models import Match as MatchDTO, Prediction as PredictionDTO
-import logging
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy import (
+    and_,
+    bindparam,
+    case,
+    desc,
+    func,
+    literal,
+    or_,
+    select,
+    update,
+)
+from typing import Callable, Iterable, NamedTuple, Optional
+from itertools import islice
+from datetime import datetime, timedelta
+from app.database.models import (
+    User,
+    Match,
+    Prediction,
+    Payment,
+    UserSession,
+    UserStats,
+    season_of,
+)
+from app.database.cache import match_list_cache, top_player_cache
+from app.database.leaderboard import LeaderboardEntry, leaderboard_index
+from app.database.routing import recent_writes, replica_read
+from app.utils import calculate_points_batch
+from app.live import LEADERBOARD, MATCHES, live_bus
+from app.models import (
+    User as UserDTO,
+    Match as MatchDTO,
+    Prediction as PredictionDTO,
+    Payment as PaymentDTO,
+    UserStats as UserStatsDTO,
+)
+import numpy as np
 
 
 def get_user_by_username(db: Session, username: str) -> Optional[User]:
@@ -28,6 +58,7 @@ def create_user(
     db.add(db_user)
     db.commit()
     db.refresh(db_user)
+    sync_leaderboard(db_user)
     return db_user
 
 
@@ -35,25 +66,147 @@ def get_all_users(db: Session) -> list[User]:
     return db.query(User).all()
 
 
+def user_to_dto(user) -> UserDTO:
+    """Build a User DTO, without the password hash, from an entity or row."""
+    return UserDTO(
+        id=user.id,
+        username=user.username,
+        password_hash="",
+        is_admin=user.is_admin,
+        total_points=user.total_points,
+        payment_status=user.payment_status,
+        created_at=str(user.created_at),
+    )
+
+
+@replica_read
 def get_leaderboard(db: Session) -> list[User]:
     return db.query(User).order_by(desc(User.total_points)).all()
 
 
+@replica_read
+def get_leaderboard_page(
+    db: Session,
+    limit: int,
+    after: Optional[tuple[int, int]] = None,
+    before: Optional[tuple[int, int]] = None,
+) -> list:
+    """
+    Keyset-paginated leaderboard ordered by total_points desc, id asc.
+
+    `after`/`before` are the (total_points, id) of the last/first row the
+    caller already has. Rows come back as (id, username, total_points,
+    is_admin) tuples in leaderboard order.
+    """
+    rows = db.execute(leaderboard_page_query(limit, after, before)).all()
+    return rows[::-1] if before is not None else rows
+
+
+def leaderboard_page_query(
+    limit: int,
+    after: Optional[tuple[int, int]] = None,
+    before: Optional[tuple[int, int]] = None,
+):
+    """SELECT behind get_leaderboard_page; `before` pages come back reversed."""
+    query = select(User.id, User.username, User.total_points, User.is_admin)
+    if before is not None:
+        points, user_id = before
+        return (
+            query.where(
+                or_(
+                    User.total_points > points,
+                    and_(User.total_points == points, User.id < user_id),
+                )
+            )
+            .order_by(User.total_points, desc(User.id))
+            .limit(limit)
+        )
+    if after is not None:
+        points, user_id = after
+        query = query.where(
+            or_(
+                User.total_points < points,
+                and_(User.total_points == points, User.id > user_id),
+            )
+        )
+    return query.order_by(desc(User.total_points), User.id).limit(limit)
+
+
+def get_top_player(db: Session) -> Optional[LeaderboardEntry]:
+    """Return the current leader, served from a process-wide TTL cache."""
+
+    def load():
+        row = (
+            db.query(User.id, User.username, User.total_points, User.is_admin)
+            .order_by(desc(User.total_points), User.id)
+            .first()
+        )
+        if row is None:
+            return None
+        return LeaderboardEntry(
+            row.id, row.username, row.total_points or 0, bool(row.is_admin)
+        )
+
+    return top_player_cache.get("top_player", load)
+
+
+def leaderboard_entries_query():
+    """Every user's leaderboard columns, for loading the leaderboard index."""
+    return select(User.id, User.username, User.total_points, User.is_admin)
+
+
+@replica_read
+def get_leaderboard_neighbours(
+    db: Session, user_id: int, radius: int = 2
+) -> list[tuple[int, LeaderboardEntry]]:
+    """A user and up to `radius` players on either side, with zero-based ranks."""
+    if leaderboard_index.stale:
+        generation = leaderboard_index.generation
+        leaderboard_index.load(db.execute(leaderboard_entries_query()), generation)
+    return leaderboard_index.neighbours(user_id, radius)
+
+
+def sync_leaderboard(user: User):
+    leaderboard_index.upsert(
+        LeaderboardEntry(
+            user.id, user.username, user.total_points or 0, bool(user.is_admin)
+        )
+    )
+
+
 def update_user_payment(db: Session, user_id: int, status: str) -> Optional[User]:
+    """Set a user's payment status; a change also ends their sessions."""
     user = get_user_by_id(db, user_id)
     if user:
+        if user.payment_status != status:
+            db.query(UserSession).filter(UserSession.user_id == user_id).delete(
+                synchronize_session=False
+            )
         user.payment_status = status
         db.commit()
         db.refresh(user)
     return user
 
 
+def update_user_password_hash(
+    db: Session, user_id: int, password_hash: str
+) -> Optional[User]:
+    user = get_user_by_id(db, user_id)
+    if user:
+        user.password_hash = password_hash
+        db.commit()
+        db.refresh(user)
+    return user
+
+
 def toggle_user_admin(db: Session, user_id: int) -> Optional[User]:
     user = get_user_by_id(db, user_id)
     if user:
         user.is_admin = not user.is_admin
         db.commit()
         db.refresh(user)
+        sync_leaderboard(user)
+        top_player_cache.invalidate("top_player")
     return user
 
 
@@ -62,10 +215,13 @@ def delete_user(db: Session, user_id: int) -> bool:
     if user:
         db.delete(user)
         db.commit()
+        leaderboard_index.remove(user_id)
+        top_player_cache.invalidate("top_player")
         return True
     return False
 
 
+@replica_read
 def get_matches(db: Session, status: Optional[str] = None) -> list[Match]:
     query = db.query(Match)
     if status:
@@ -73,6 +229,35 @@ def get_matches(db: Session, status: Optional[str] = None) -> list[Match]:
     return query.order_by(Match.start_time).all()
 
 
+def match_dtos_query(status: Optional[str] = None, order_by=Match.start_time):
+    """Match DTO columns, skipping the ORM identity map."""
+    query = select(
+        Match.id,
+        Match.team1,
+        Match.team2,
+        Match.start_time,
+        Match.status,
+        Match.team1_score,
+        Match.team2_score,
+    )
+    if status:
+        query = query.where(Match.status == status)
+    return query.order_by(order_by)
+
+
+def match_to_dto(match) -> MatchDTO:
+    """Build a Match DTO from an entity or row."""
+    return MatchDTO(
+        id=match.id,
+        team1=match.team1,
+        team2=match.team2,
+        start_time=str(match.start_time),
+        status=match.status,
+        team1_score=match.team1_score,
+        team2_score=match.team2_score,
+    )
+
+
 def get_match_by_id(db: Session, match_id: int) -> Optional[Match]:
     return db.query(Match).filter(Match.id == match_id).first()
 
@@ -80,10 +265,17 @@ def get_match_by_id(db: Session, match_id: int) -> Optional[Match]:
 def create_match(
     db: Session, team1: str, team2: str, start_time: datetime, status: str = "upcoming"
 ) -> Match:
-    db_match = Match(team1=team1, team2=team2, start_time=start_time, status=status)
+    db_match = Match(
+        team1=team1,
+        team2=team2,
+        start_time=start_time,
+        status=status,
+        season=season_of(start_time),
+    )
     db.add(db_match)
     db.commit()
     db.refresh(db_match)
+    match_list_cache.invalidate()
     return db_match
 
 
@@ -110,6 +302,9 @@ def update_match(
         recalculate_points_for_match_predictions(db, match)
     db.commit()
     db.refresh(match)
+    top_player_cache.invalidate("top_player")
+    match_list_cache.invalidate()
+    live_bus.publish(MATCHES, [match_to_dto(match).model_dump()])
     return match
 
 
@@ -118,14 +313,76 @@ def delete_match(db: Session, match_id: int) -> bool:
     if match:
         db.delete(match)
         db.commit()
+        match_list_cache.invalidate()
         return True
     return False
 
 
+def get_upcoming_kickoffs(db: Session) -> list[tuple[int, datetime]]:
+    """(id, start_time) of every match still marked upcoming."""
+    return db.execute(
+        select(Match.id, Match.start_time).where(Match.status == "upcoming")
+    ).all()
+
+
+def start_due_matches(db: Session, match_ids: list[int]) -> int:
+    """
+    Flip the given matches from upcoming to live in one UPDATE.
+
+    Matches whose kickoff has moved into the future or that an admin
+    already advanced are left alone. Returns the number of rows changed.
+    """
+    started = db.scalars(
+        update(Match)
+        .where(
+            Match.id.in_(match_ids),
+            Match.status == "upcoming",
+            Match.start_time <= datetime.now(),
+        )
+        .values(status="live")
+        .returning(Match.id)
+    ).all()
+    db.commit()
+    match_list_cache.invalidate()
+    if started:
+        live_bus.publish(MATCHES, [{"id": id, "status": "live"} for id in started])
+    return len(started)
+
+
+PREDICTION_LOCK = timedelta(minutes=5)
+
+
+@replica_read
 def get_user_predictions(db: Session, user_id: int) -> list[Prediction]:
     return db.query(Prediction).filter(Prediction.user_id == user_id).all()
 
 
+PREDICTION_COLUMNS = (
+    Prediction.id,
+    Prediction.user_id,
+    Prediction.match_id,
+    Prediction.team1_prediction,
+    Prediction.team2_prediction,
+    Prediction.points_earned,
+    Prediction.boost_active,
+    Prediction.created_at,
+)
+
+
+def prediction_to_dto(prediction) -> PredictionDTO:
+    """Build a Prediction DTO from an entity or row."""
+    return PredictionDTO(
+        id=prediction.id,
+        user_id=prediction.user_id,
+        match_id=prediction.match_id,
+        team1_prediction=prediction.team1_prediction,
+        team2_prediction=prediction.team2_prediction,
+        points_earned=prediction.points_earned,
+        boost_active=prediction.boost_active,
+        created_at=str(prediction.created_at),
+    )
+
+
 def get_prediction(db: Session, user_id: int, match_id: int) -> Optional[Prediction]:
     return (
         db.query(Prediction)
@@ -141,59 +398,367 @@ def create_or_update_prediction(
     team1_pred: int,
     team2_pred: int,
     boost_active: bool,
-) -> Prediction:
-    prediction = get_prediction(db, user_id, match_id)
-    if prediction:
-        prediction.team1_prediction = team1_pred
-        prediction.team2_prediction = team2_pred
-        prediction.boost_active = boost_active
-    else:
-        prediction = Prediction(
-            user_id=user_id,
-            match_id=match_id,
-            team1_prediction=team1_pred,
-            team2_prediction=team2_pred,
-            boost_active=boost_active,
-        )
-        db.add(prediction)
+) -> Optional[PredictionDTO]:
+    """Save a prediction, or return None if the match is locked or missing."""
+    stmt = locked_prediction_upsert(
+        db.get_bind().dialect.name,
+        user_id,
+        match_id,
+        team1_pred,
+        team2_pred,
+        boost_active,
+    )
+    row = db.execute(stmt).first()
+    db.commit()
+    if row is None:
+        return None
+    recent_writes.mark(user_id)
+    return prediction_to_dto(row)
+
+
+def locked_prediction_upsert(
+    dialect_name: str,
+    user_id: int,
+    match_id: int,
+    team1_pred: int,
+    team2_pred: int,
+    boost_active: bool,
+):
+    """
+    INSERT ... SELECT ... ON CONFLICT DO UPDATE for one prediction.
+
+    The SELECT reads the match row and yields nothing once the match has
+    left "upcoming" or is within PREDICTION_LOCK of kickoff, so the lock is
+    checked and the prediction written in one statement. RETURNING is
+    empty when the prediction was refused.
+    """
+    now = datetime.now()
+    dialect = postgresql if dialect_name == "postgresql" else sqlite
+    table = Prediction.__table__
+    source = select(
+        literal(user_id),
+        Match.id,
+        Match.season,
+        literal(team1_pred),
+        literal(team2_pred),
+        literal(bool(boost_active)),
+        literal(0),
+        literal(now),
+        literal(now),
+    ).where(
+        Match.id == match_id,
+        Match.status == "upcoming",
+        Match.start_time > now + PREDICTION_LOCK,
+    )
+    stmt = dialect.insert(table).from_select(
+        [
+            table.c.user_id,
+            table.c.match_id,
+            table.c.season,
+            table.c.team1_prediction,
+            table.c.team2_prediction,
+            table.c.boost_active,
+            table.c.points_earned,
+            table.c.created_at,
+            table.c.updated_at,
+        ],
+        source,
+    )
+    return stmt.on_conflict_do_update(
+        index_elements=[table.c.user_id, table.c.match_id, table.c.season],
+        set_={
+            "team1_prediction": stmt.excluded.team1_prediction,
+            "team2_prediction": stmt.excluded.team2_prediction,
+            "boost_active": stmt.excluded.boost_active,
+            "updated_at": stmt.excluded.updated_at,
+        },
+    ).returning(*[table.c[c.key] for c in PREDICTION_COLUMNS])
+
+
+def bulk_upsert_predictions(
+    db: Session, predictions: Iterable[dict], batch_size: int = 1000
+) -> int:
+    """
+    Insert or update many predictions with batched INSERT ... ON CONFLICT.
+
+    Each item needs user_id, match_id, team1_prediction, team2_prediction
+    and optionally boost_active. Rows are keyed on the (user_id, match_id,
+    season) unique constraint, so concurrent writers cannot create
+    duplicates; points_earned is left untouched. Returns the number of rows
+    sent. A match_id that does not exist raises ValueError and rolls back
+    every batch sent so far, since they only commit together at the end.
+    """
+    dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+    table = Prediction.__table__
+    total = 0
+    iterator = iter(predictions)
+    while batch := list(islice(iterator, batch_size)):
+        now = datetime.now()
+        seasons = dict(
+            db.execute(
+                select(Match.id, Match.season).where(
+                    Match.id.in_({p["match_id"] for p in batch})
+                )
+            ).all()
+        )
+        unknown = {p["match_id"] for p in batch} - seasons.keys()
+        if unknown:
+            db.rollback()
+            raise ValueError(f"Unknown match ids: {sorted(unknown)}")
+        rows = {
+            (p["user_id"], p["match_id"]): {
+                "user_id": p["user_id"],
+                "match_id": p["match_id"],
+                "season": seasons[p["match_id"]],
+                "team1_prediction": p["team1_prediction"],
+                "team2_prediction": p["team2_prediction"],
+                "boost_active": bool(p.get("boost_active", False)),
+                "points_earned": 0,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for p in batch
+        }
+        stmt = dialect.insert(table).values(list(rows.values()))
+        db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[table.c.user_id, table.c.match_id, table.c.season],
+                set_={
+                    "team1_prediction": stmt.excluded.team1_prediction,
+                    "team2_prediction": stmt.excluded.team2_prediction,
+                    "boost_active": stmt.excluded.boost_active,
+                    "updated_at": stmt.excluded.updated_at,
+                },
+            )
+        )
+        total += len(rows)
     db.commit()
-    db.refresh(prediction)
-    return prediction
+    return total
+
+
+def points_case_expression(team1_score: int, team2_score: int):
+    """SQL CASE expression scoring a Prediction row against a final score."""
+    team1_hit = Prediction.team1_prediction == team1_score
+    team2_hit = Prediction.team2_prediction == team2_score
+    pred_diff = Prediction.team1_prediction - Prediction.team2_prediction
+    if team1_score > team2_score:
+        same_winner = pred_diff > 0
+    elif team1_score < team2_score:
+        same_winner = pred_diff < 0
+    else:
+        same_winner = pred_diff == 0
+    points = case(
+        (and_(team1_hit, team2_hit), 7),
+        (or_(team1_hit, team2_hit), 5),
+        (same_winner, 2),
+        else_=0,
+    )
+    return case((Prediction.boost_active.is_(True), points * 2), else_=points)
+
+
+def match_predictions(match: Match):
+    """Filter for one match's predictions; the season prunes partitions."""
+    return and_(Prediction.match_id == match.id, Prediction.season == match.season)
 
 
-def recalculate_points_for_match_predictions(db: Session, match: Match):
-    """Update points for all predictions associated with a match."""
+def recalculate_points_for_match_predictions(
+    db: Session, match: Match, mode: str = "sql"
+):
+    """
+    Update points for all predictions associated with a match.
+
+    mode="sql" scores inside the database with two set-based UPDATEs,
+    mode="batch" loads the scoring columns and scores them with NumPy.
+    """
     if match.status != "finished" or match.team1_score is None:
         return
-    match_dto = MatchDTO(
-        id=match.id,
-        team1=match.team1,
-        team2=match.team2,
-        start_time=str(match.start_time),
-        status=match.status,
-        team1_score=match.team1_score,
-        team2_score=match.team2_score,
-    )
-    predictions = db.query(Prediction).filter(Prediction.match_id == match.id).all()
-    for pred in predictions:
-        pred_dto = PredictionDTO(
-            id=pred.id,
-            user_id=pred.user_id,
-            match_id=pred.match_id,
-            team1_prediction=pred.team1_prediction,
-            team2_prediction=pred.team2_prediction,
-            points_earned=pred.points_earned,
-            boost_active=pred.boost_active,
-            created_at=str(pred.created_at),
-        )
-        points = calculate_points_for_match(match_dto, pred_dto)
-        if pred.points_earned != points:
-            old_points = pred.points_earned
-            pred.points_earned = points
-            user = get_user_by_id(db, pred.user_id)
-            if user:
-                user.total_points = user.total_points - old_points + points
+    # The session does not autoflush, and the SQL below reads the match's
+    # new status and score back from the database.
+    db.flush()
+    if mode == "sql":
+        _recalculate_points_sql(db, match)
+    else:
+        _recalculate_points_batch(db, match)
+    refresh_user_stats(db, select(Prediction.user_id).where(match_predictions(match)))
     db.commit()
+    top_player_cache.invalidate("top_player")
+    publish = live_bus.has_subscribers(LEADERBOARD)
+    if leaderboard_index.loaded or publish:
+        affected = (
+            db.query(User.id, User.username, User.total_points, User.is_admin)
+            .filter(
+                User.id.in_(select(Prediction.user_id).where(match_predictions(match)))
+            )
+            .all()
+        )
+        for row in affected:
+            leaderboard_index.upsert(
+                LeaderboardEntry(
+                    row.id, row.username, row.total_points or 0, bool(row.is_admin)
+                )
+            )
+        if publish:
+            live_bus.publish(
+                LEADERBOARD, [(row.id, row.total_points or 0) for row in affected]
+            )
+
+
+def _recalculate_points_sql(db: Session, match: Match):
+    new_points = points_case_expression(match.team1_score, match.team2_score)
+    old_points = func.coalesce(Prediction.points_earned, 0)
+    in_match = match_predictions(match)
+    changed = and_(in_match, old_points != new_points)
+    delta = (
+        select(func.coalesce(func.sum(new_points - old_points), 0))
+        .where(in_match, Prediction.user_id == User.id)
+        .scalar_subquery()
+    )
+    db.execute(
+        update(User)
+        .where(User.id.in_(select(Prediction.user_id).where(changed)))
+        .values(total_points=func.coalesce(User.total_points, 0) + delta)
+        .execution_options(synchronize_session=False)
+    )
+    db.execute(
+        update(Prediction)
+        .where(changed)
+        .values(points_earned=new_points)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _recalculate_points_batch(db: Session, match: Match):
+    rows = (
+        db.query(
+            Prediction.id,
+            Prediction.user_id,
+            Prediction.team1_prediction,
+            Prediction.team2_prediction,
+            Prediction.boost_active,
+            Prediction.points_earned,
+        )
+        .filter(match_predictions(match))
+        .all()
+    )
+    if not rows:
+        return
+    ids, user_ids, team1_preds, team2_preds, boosts, old_points = zip(*rows)
+    ids = np.array(ids, dtype=np.int64)
+    user_ids = np.array(user_ids, dtype=np.int64)
+    boosts = np.array([bool(b) for b in boosts])
+    old_points = np.array([p or 0 for p in old_points], dtype=np.int64)
+    points = calculate_points_batch(
+        match.team1_score, match.team2_score, team1_preds, team2_preds, boosts
+    )
+    changed = points != old_points
+    if not changed.any():
+        return
+    predictions = Prediction.__table__
+    db.execute(
+        update(predictions)
+        .where(
+            predictions.c.id == bindparam("prediction_id"),
+            predictions.c.season == match.season,
+        )
+        .values(points_earned=bindparam("new_points")),
+        [
+            {"prediction_id": int(pid), "new_points": int(pts)}
+            for pid, pts in zip(ids[changed], points[changed])
+        ],
+    )
+    changed_users, inverse = np.unique(user_ids[changed], return_inverse=True)
+    deltas = np.bincount(inverse, weights=points[changed] - old_points[changed]).astype(
+        np.int64
+    )
+    user_deltas = [
+        {"target_user_id": int(uid), "delta": int(delta)}
+        for uid, delta in zip(changed_users, deltas)
+        if delta
+    ]
+    if user_deltas:
+        users = User.__table__
+        db.execute(
+            update(users)
+            .where(users.c.id == bindparam("target_user_id"))
+            .values(total_points=users.c.total_points + bindparam("delta")),
+            user_deltas,
+        )
+
+
+def refresh_user_stats(db: Session, user_ids=None):
+    """
+    Rebuild UserStats rows from finished predictions, without committing.
+
+    `user_ids` is a list or subquery of users to refresh; None rebuilds
+    everyone. Categories are read back from points_earned, where a boost
+    doubles the base value: 7/14 exact, 5/10 one score, 2/4 winner, 0 miss.
+    """
+    points = func.coalesce(Prediction.points_earned, 0)
+
+    def count_where(condition):
+        return func.sum(case((condition, 1), else_=0))
+
+    source = (
+        select(
+            Prediction.user_id,
+            func.count(),
+            count_where(points.in_((7, 14))),
+            count_where(points.in_((5, 10))),
+            count_where(points.in_((2, 4))),
+            count_where(points == 0),
+            count_where(Prediction.boost_active.is_(True)),
+            func.sum(points),
+            literal(datetime.now()),
+        )
+        .join(
+            Match,
+            and_(Match.id == Prediction.match_id, Match.season == Prediction.season),
+        )
+        .where(Match.status == "finished", Match.team1_score.is_not(None))
+        .group_by(Prediction.user_id)
+    )
+    if user_ids is not None:
+        source = source.where(Prediction.user_id.in_(user_ids))
+    dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+    table = UserStats.__table__
+    columns = [
+        table.c.user_id,
+        table.c.predictions_scored,
+        table.c.exact_hits,
+        table.c.one_score_hits,
+        table.c.winner_hits,
+        table.c.misses,
+        table.c.boosts_used,
+        table.c.points,
+        table.c.updated_at,
+    ]
+    stmt = dialect.insert(table).from_select(columns, source)
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[table.c.user_id],
+            set_={c.name: stmt.excluded[c.name] for c in columns[1:]},
+        )
+    )
+
+
+@replica_read
+def get_user_stats(db: Session, user_id: int) -> UserStatsDTO:
+    """Stats header for one user: a single primary-key lookup."""
+    return user_stats_to_dto(db.get(UserStats, user_id))
+
+
+def user_stats_to_dto(stats: Optional[UserStats]) -> UserStatsDTO:
+    if stats is None:
+        return UserStatsDTO()
+    return UserStatsDTO(
+        predictions_scored=stats.predictions_scored,
+        exact_hits=stats.exact_hits,
+        one_score_hits=stats.one_score_hits,
+        winner_hits=stats.winner_hits,
+        misses=stats.misses,
+        boosts_used=stats.boosts_used,
+        points=stats.points,
+    )
 
 
 def create_payment(
@@ -206,5 +771,225 @@ def create_payment(
     return payment
 
 
+@replica_read
 def get_all_payments(db: Session) -> list[Payment]:
-    return db.query(Payment).order_by(desc(Payment.date)).all()
\ No newline at end of file
+    return db.query(Payment).order_by(desc(Payment.date)).all()
+
+
+def payment_to_dto(payment) -> PaymentDTO:
+    """Build a Payment DTO from an entity or row."""
+    return PaymentDTO(
+        id=payment.id,
+        user_id=payment.user_id,
+        amount=payment.amount,
+        date=str(payment.date),
+        status=payment.status,
+    )
+
+
+def get_usernames(db: Session, user_ids) -> dict[int, str]:
+    """Map the given user ids to usernames."""
+    ids = set(user_ids)
+    if not ids:
+        return {}
+    rows = db.execute(select(User.id, User.username).where(User.id.in_(ids)))
+    return {r.id: r.username for r in rows}
+
+
+def get_match_labels(db: Session, match_ids) -> dict[int, str]:
+    """Map the given match ids to "Team A vs Team B" labels."""
+    ids = set(match_ids)
+    if not ids:
+        return {}
+    rows = db.execute(
+        select(Match.id, Match.team1, Match.team2).where(Match.id.in_(ids))
+    )
+    return {r.id: f"{r.team1} vs {r.team2}" for r in rows}
+
+
+class AdminTable(NamedTuple):
+    columns: tuple
+    to_dto: Callable
+    sort_columns: dict
+    search_columns: tuple
+    default_sort: str
+    default_descending: bool = False
+    joins: tuple = ()
+
+
+ADMIN_TABLES = {
+    "users": AdminTable(
+        columns=(
+            User.id,
+            User.username,
+            User.is_admin,
+            User.total_points,
+            User.payment_status,
+            User.created_at,
+        ),
+        to_dto=user_to_dto,
+        sort_columns={
+            "id": User.id,
+            "username": User.username,
+            "role": User.is_admin,
+            "points": User.total_points,
+            "payment_status": User.payment_status,
+        },
+        search_columns=(User.username, User.payment_status),
+        default_sort="id",
+    ),
+    "matches": AdminTable(
+        columns=(
+            Match.id,
+            Match.team1,
+            Match.team2,
+            Match.start_time,
+            Match.status,
+            Match.team1_score,
+            Match.team2_score,
+        ),
+        to_dto=match_to_dto,
+        sort_columns={
+            "id": Match.id,
+            "teams": Match.team1,
+            "time": Match.start_time,
+            "status": Match.status,
+        },
+        search_columns=(Match.team1, Match.team2, Match.status),
+        default_sort="id",
+        default_descending=True,
+    ),
+    "payments": AdminTable(
+        columns=(
+            Payment.id,
+            Payment.user_id,
+            Payment.amount,
+            Payment.date,
+            Payment.status,
+        ),
+        to_dto=payment_to_dto,
+        sort_columns={
+            "id": Payment.id,
+            "user": User.username,
+            "amount": Payment.amount,
+            "date": Payment.date,
+            "status": Payment.status,
+        },
+        search_columns=(User.username, Payment.status),
+        default_sort="date",
+        default_descending=True,
+        joins=((User, Payment.user_id == User.id),),
+    ),
+    "predictions": AdminTable(
+        columns=PREDICTION_COLUMNS,
+        to_dto=prediction_to_dto,
+        sort_columns={
+            "match": Prediction.match_id,
+            "user": User.username,
+            "boost": Prediction.boost_active,
+            "points": Prediction.points_earned,
+            "created_at": Prediction.created_at,
+        },
+        search_columns=(User.username, Match.team1, Match.team2),
+        default_sort="created_at",
+        default_descending=True,
+        joins=(
+            (User, Prediction.user_id == User.id),
+            (Match, Prediction.match_id == Match.id),
+        ),
+    ),
+}
+
+
+def get_admin_table_page(
+    db: Session,
+    table: str,
+    offset: int = 0,
+    limit: int = 25,
+    sort_by: Optional[str] = None,
+    descending: Optional[bool] = None,
+    search: str = "",
+) -> tuple[list, bool]:
+    """
+    One page of an admin table as DTOs, plus whether another page follows.
+
+    `sort_by` is one of the table's sort keys; the primary key is always
+    appended as a tie-breaker so OFFSET paging is stable. `search` is a
+    case-insensitive substring match over the table's text columns.
+    """
+    query = admin_table_query(table, offset, limit + 1, sort_by, descending, search)
+    rows = db.execute(query).all()
+    return [ADMIN_TABLES[table].to_dto(r) for r in rows[:limit]], len(rows) > limit
+
+
+def admin_table_query(
+    table: str,
+    offset: int = 0,
+    limit: int = 25,
+    sort_by: Optional[str] = None,
+    descending: Optional[bool] = None,
+    search: str = "",
+):
+    spec = ADMIN_TABLES[table]
+    if sort_by not in spec.sort_columns:
+        sort_by = spec.default_sort
+        descending = spec.default_descending
+    elif descending is None:
+        descending = spec.default_descending
+    query = select(*spec.columns)
+    for target, onclause in spec.joins:
+        query = query.join(target, onclause)
+    search = search.strip()
+    if search:
+        pattern = f"%{search}%"
+        query = query.where(or_(*(c.ilike(pattern) for c in spec.search_columns)))
+    sort_column = spec.sort_columns[sort_by]
+    primary_key = spec.columns[0]
+    if descending:
+        query = query.order_by(sort_column.desc(), primary_key.desc())
+    else:
+        query = query.order_by(sort_column, primary_key)
+    return query.offset(max(offset, 0)).limit(limit)
+
+
+def create_session(
+    db: Session, session_id: str, user_id: int, ttl: timedelta
+) -> UserSession:
+    user_session = UserSession(
+        id=session_id, user_id=user_id, expires_at=datetime.now() + ttl
+    )
+    db.add(user_session)
+    db.commit()
+    return user_session
+
+
+def get_session_user(db: Session, session_id: str) -> Optional[User]:
+    """The paid-up user owning an unexpired session, in one primary-key join."""
+    return (
+        db.query(User)
+        .join(UserSession, UserSession.user_id == User.id)
+        .filter(
+            UserSession.id == session_id,
+            UserSession.expires_at > datetime.now(),
+            User.payment_status == "paid",
+        )
+        .first()
+    )
+
+
+def delete_session(db: Session, session_id: str):
+    db.query(UserSession).filter(UserSession.id == session_id).delete(
+        synchronize_session=False
+    )
+    db.commit()
+
+
+def delete_expired_sessions(db: Session) -> int:
+    """Drop every expired session with one range delete on expires_at."""
+    deleted = (
+        db.query(UserSession)
+        .filter(UserSession.expires_at <= datetime.now())
+        .delete(synchronize_session=False)
+    )
+    db.commit()
+    return deleted
@@ -1,25 +1,30 @@
-from app.database.database import engine, Base, SessionLocal
+from app.database.database import SessionLocal, engine
+from app.database.migrate import upgrade
+from app.database.partitions import ensure_upcoming_partitions
 from app.database.seed import seed_data
 import logging
 
 
 def init_db():
-    """Initialize the database: create tables and seed data."""
-    print("Creating database tables...")
+    """
+    Initialize the database: migrate the schema to head and seed data.
+
+    A failed migration is raised, not logged: starting the app on a
+    half-migrated schema only moves the failure to the first request.
+    """
+    print("Migrating database schema...")
+    upgrade()
+    ensure_upcoming_partitions(engine)
+    print("Schema is up to date.")
+    db = SessionLocal()
     try:
-        Base.metadata.create_all(bind=engine)
-        print("Tables created successfully.")
-        db = SessionLocal()
-        try:
-            seed_data(db)
-        except Exception as e:
-            logging.exception(f"Error seeding data: {e}")
-            db.rollback()
-        finally:
-            db.close()
+        seed_data(db)
     except Exception as e:
-        logging.exception(f"Error initializing database: {e}")
+        logging.exception(f"Error seeding data: {e}")
+        db.rollback()
+    finally:
+        db.close()
 
 
 if __name__ == "__main__":
-    init_db()
\ No newline at end of file
+    init_db()
@@ -0,0 +1,71 @@
+import asyncio
+import threading
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+MATCHES = "matches"
+LEADERBOARD = "leaderboard"
+
+
+class _Subscription:
+    def __init__(self, loop: asyncio.AbstractEventLoop, max_queue: int):
+        self.loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+
+    def put(self, item: tuple[str, Any]):
+        # Runs on the subscriber's loop; a lagging viewer loses its oldest
+        # delta instead of growing the queue.
+        if self.queue.full():
+            self.queue.get_nowait()
+        self.queue.put_nowait(item)
+
+
+class LocalBus:
+    """
+    In-process publish/subscribe for live deltas.
+
+    Subscribers are background event handlers reading an asyncio queue of
+    (topic, message) pairs. publish() may be called from any thread and
+    never blocks on a subscriber, so one write fans out to every viewer in
+    the worker without any of them querying the database.
+    """
+
+    def __init__(self, max_queue: int = 100):
+        self.max_queue = max_queue
+        self._lock = threading.Lock()
+        self._subscribers: dict[str, set[_Subscription]] = {}
+
+    def has_subscribers(self, topic: str) -> bool:
+        return bool(self._subscribers.get(topic))
+
+    def publish(self, topic: str, message: Any):
+        with self._lock:
+            subscribers = list(self._subscribers.get(topic, ()))
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(
+                    subscription.put, (topic, message)
+                )
+            except RuntimeError:
+                # The subscriber's event loop is closed.
+                self._remove(subscription)
+
+    @contextmanager
+    def subscribe(self, *topics: str) -> Iterator[asyncio.Queue]:
+        """Yield a queue receiving messages on `topics` until the block exits."""
+        subscription = _Subscription(asyncio.get_running_loop(), self.max_queue)
+        with self._lock:
+            for topic in topics:
+                self._subscribers.setdefault(topic, set()).add(subscription)
+        try:
+            yield subscription.queue
+        finally:
+            self._remove(subscription)
+
+    def _remove(self, subscription: _Subscription):
+        with self._lock:
+            for subscribers in self._subscribers.values():
+                subscribers.discard(subscription)
+
+
+live_bus = LocalBus()
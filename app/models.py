@@ -48,4 +48,26 @@ class Payment(BaseModel):
     user_id: int
     amount: float
     date: str = str(datetime.now())
-    status: str = "completed"
\ No newline at end of file
+    status: str = "completed"
+
+
+class LeaderboardRow(BaseModel):
+    """Public leaderboard entry without credentials."""
+
+    rank: int
+    user_id: int
+    username: str
+    total_points: int = 0
+    is_admin: bool = False
+
+
+class UserStats(BaseModel):
+    """Scoring breakdown for a user's finished predictions."""
+
+    predictions_scored: int = 0
+    exact_hits: int = 0
+    one_score_hits: int = 0
+    winner_hits: int = 0
+    misses: int = 0
+    boosts_used: int = 0
+    points: int = 0
@@ -17,6 +17,69 @@ def tab_button(name: str, label: str, icon: str) -> rx.Component:
     )
 
 
+def sortable_header(tab: str, column: str, label: str) -> rx.Component:
+    return rx.el.th(
+        rx.el.button(
+            label,
+            rx.cond(
+                AdminState.table_sort[tab] == column,
+                rx.cond(
+                    AdminState.table_descending[tab],
+                    rx.icon("chevron-down", class_name="w-3 h-3 ml-1"),
+                    rx.icon("chevron-up", class_name="w-3 h-3 ml-1"),
+                ),
+                rx.fragment(),
+            ),
+            on_click=lambda: AdminState.sort_table(tab, column),
+            class_name="flex items-center uppercase tracking-wider hover:text-gray-700",
+        ),
+        class_name="px-6 py-3 text-left text-xs font-medium text-gray-500",
+    )
+
+
+def table_search(placeholder: str) -> rx.Component:
+    return rx.el.form(
+        rx.el.input(
+            name="search",
+            placeholder=placeholder,
+            default_value=AdminState.table_search[AdminState.active_tab],
+            class_name="block w-64 border border-gray-300 rounded-md shadow-sm py-2 px-3 text-sm focus:outline-none focus:ring-indigo-500 focus:border-indigo-500",
+        ),
+        rx.el.button(
+            rx.icon("search", class_name="w-4 h-4"),
+            type="submit",
+            class_name="ml-2 p-2 rounded-md border border-gray-300 text-gray-500 hover:bg-gray-50",
+        ),
+        on_submit=AdminState.search_table,
+        class_name="flex items-center mb-4",
+    )
+
+
+def table_pagination(tab: str) -> rx.Component:
+    return rx.el.div(
+        rx.el.span(
+            f"Showing from #{AdminState.table_offset[tab] + 1}",
+            class_name="text-sm text-gray-500",
+        ),
+        rx.el.div(
+            rx.el.button(
+                "Previous",
+                on_click=AdminState.previous_page,
+                disabled=AdminState.table_offset[tab] == 0,
+                class_name="px-3 py-1 mr-2 border border-gray-300 rounded-md text-sm text-gray-700 hover:bg-gray-50 disabled:opacity-50",
+            ),
+            rx.el.button(
+                "Next",
+                on_click=AdminState.next_page,
+                disabled=~AdminState.table_has_more[tab],
+                class_name="px-3 py-1 border border-gray-300 rounded-md text-sm text-gray-700 hover:bg-gray-50 disabled:opacity-50",
+            ),
+            class_name="flex",
+        ),
+        class_name="flex justify-between items-center mt-4",
+    )
+
+
 def user_row(user: User) -> rx.Component:
     return rx.el.tr(
         rx.el.td(
@@ -135,7 +198,7 @@ def payment_row(payment: Payment) -> rx.Component:
             payment.id, class_name="px-6 py-4 whitespace-nowrap text-sm text-gray-500"
         ),
         rx.el.td(
-            AdminState.get_username_map[payment.user_id],
+            AdminState.username_map[payment.user_id],
             class_name="px-6 py-4 whitespace-nowrap text-sm font-medium text-gray-900",
         ),
         rx.el.td(
@@ -159,11 +222,11 @@ def payment_row(payment: Payment) -> rx.Component:
 def prediction_row(pred: Prediction) -> rx.Component:
     return rx.el.tr(
         rx.el.td(
-            AdminState.get_match_map[pred.match_id],
+            AdminState.match_map[pred.match_id],
             class_name="px-6 py-4 whitespace-nowrap text-sm font-medium text-gray-900",
         ),
         rx.el.td(
-            AdminState.get_username_map[pred.user_id],
+            AdminState.username_map[pred.user_id],
             class_name="px-6 py-4 whitespace-nowrap text-sm text-gray-500",
         ),
         rx.el.td(
@@ -349,16 +412,13 @@ def payment_modal() -> rx.Component:
                     rx.el.form(
                         rx.el.div(
                             rx.el.label(
-                                "User",
+                                "Username",
                                 class_name="block text-sm font-medium text-gray-700",
                             ),
-                            rx.el.select(
-                                rx.foreach(
-                                    AdminState.users,
-                                    lambda u: rx.el.option(u.username, value=u.id),
-                                ),
-                                name="user_id",
-                                class_name="mt-1 block w-full bg-white border border-gray-300 rounded-md shadow-sm py-2 px-3 focus:outline-none focus:ring-indigo-500 focus:border-indigo-500 sm:text-sm",
+                            rx.el.input(
+                                name="username",
+                                required=True,
+                                class_name="mt-1 block w-full border border-gray-300 rounded-md shadow-sm py-2 px-3 focus:outline-none focus:ring-indigo-500 focus:border-indigo-500 sm:text-sm",
                             ),
                             class_name="mb-4",
                         ),
@@ -443,29 +503,25 @@ def admin_page() -> rx.Component:
                                     "User Management",
                                     class_name="text-xl font-semibold mb-4",
                                 ),
+                                table_search("Search username or payment status"),
                                 rx.el.div(
                                     rx.el.table(
                                         rx.el.thead(
                                             rx.el.tr(
-                                                rx.el.th(
-                                                    "ID",
-                                                    class_name="px-6 py-3 text-left text-xs font-medium text-gray-500 uppercase tracking-wider",
-                                                ),
-                                                rx.el.th(
-                                                    "Username",
-                                                    class_name="px-6 py-3 text-left text-xs font-medium text-gray-500 uppercase tracking-wider",
+                                                sortable_header("users", "id", "ID"),
+                                                sortable_header(
+                                                    "users", "username", "Username"
                                                 ),
-                                                rx.el.th(
-                                                    "Role",
-                                                    class_name="px-6 py-3 text-left text-xs font-medium text-gray-500 uppercase tracking-wider",
+                                                sortable_header(
+                                                    "users", "role", "Role"
                                                 ),
-                                                rx.el.th(
-                                                    "Points",
-                                                    class_name="px-6 py-3 text-left text-xs font-medium text-gray-500 uppercase tracking-wider",
+                                                sortable_header(
+                                                    "users", "points", "Points"
                                                 ),
-                                                rx.el.th(
+                                                sortable_header(
+                                                    "users",
+                                                    "payment_status",
                                                     "Payment Status",
-                                                    class_name="px-6 py-3 text-left text-xs font-medium text-gray-500 uppercase tracking-wider",
                                                 ),
                                                 rx.el.th(
                                                     "Actions",
@@ -482,6 +538,7 @@ def admin_page() -> rx.Component:
                                     ),
                                     class_name="overflow-hidden shadow ring-1 ring-black ring-opacity-5 sm:rounded-lg",
                                 ),
+                                table_pagination("users"),
                             )
                         ),
                         rx.fragment(),
@@ -501,25 +558,18 @@ def admin_page() -> rx.Component:
                                 ),
                                 class_name="flex justify-between items-center mb-4",
                             ),
+                            table_search("Search teams or status"),
                             rx.el.div(
                                 rx.el.table(
                                     rx.el.thead(
                                         rx.el.tr(
-                                            rx.el.th(
-                                                "ID",
-                                                class_name="px-6 py-3 text-left text-xs font-medium text-gray-500 uppercase tracking-wider",
-                                            ),
-                                            rx.el.th(
-                                                "Teams",
-                                                class_name="px-6 py-3 text-left text-xs font-medium text-gray-500 uppercase tracking-wider",
-                                            ),
-                                            rx.el.th(
-                                                "Time",
-                                                class_name="px-6 py-3 text-left text-xs font-medium text-gray-500 uppercase tracking-wider",
+                                            sortable_header("matches", "id", "ID"),
+                                            sortable_header(
+                                                "matches", "teams", "Teams"
                                             ),
-                                            rx.el.th(
-                                                "Status",
-                                                class_name="px-6 py-3 text-left text-xs font-medium text-gray-500 uppercase tracking-wider",
+                                            sortable_header("matches", "time", "Time"),
+                                            sortable_header(
+                                                "matches", "status", "Status"
                                             ),
                                             rx.el.th(
                                                 "Score",
@@ -540,6 +590,7 @@ def admin_page() -> rx.Component:
                                 ),
                                 class_name="overflow-x-auto shadow ring-1 ring-black ring-opacity-5 sm:rounded-lg",
                             ),
+                            table_pagination("matches"),
                         ),
                         rx.fragment(),
                     ),
@@ -558,29 +609,19 @@ def admin_page() -> rx.Component:
                                 ),
                                 class_name="flex justify-between items-center mb-4",
                             ),
+                            table_search("Search user or status"),
                             rx.el.div(
                                 rx.el.table(
                                     rx.el.thead(
                                         rx.el.tr(
-                                            rx.el.th(
-                                                "ID",
-                                                class_name="px-6 py-3 text-left text-xs font-medium text-gray-500 uppercase tracking-wider",
-                                            ),
-                                            rx.el.th(
-                                                "User",
-                                                class_name="px-6 py-3 text-left text-xs font-medium text-gray-500 uppercase tracking-wider",
-                                            ),
-                                            rx.el.th(
-                                                "Amount",
-                                                class_name="px-6 py-3 text-left text-xs font-medium text-gray-500 uppercase tracking-wider",
-                                            ),
-                                            rx.el.th(
-                                                "Date",
-                                                class_name="px-6 py-3 text-left text-xs font-medium text-gray-500 uppercase tracking-wider",
+                                            sortable_header("payments", "id", "ID"),
+                                            sortable_header("payments", "user", "User"),
+                                            sortable_header(
+                                                "payments", "amount", "Amount"
                                             ),
-                                            rx.el.th(
-                                                "Status",
-                                                class_name="px-6 py-3 text-left text-xs font-medium text-gray-500 uppercase tracking-wider",
+                                            sortable_header("payments", "date", "Date"),
+                                            sortable_header(
+                                                "payments", "status", "Status"
                                             ),
                                         ),
                                         class_name="bg-gray-50",
@@ -593,6 +634,7 @@ def admin_page() -> rx.Component:
                                 ),
                                 class_name="overflow-x-auto shadow ring-1 ring-black ring-opacity-5 sm:rounded-lg",
                             ),
+                            table_pagination("payments"),
                         ),
                         rx.fragment(),
                     ),
@@ -603,29 +645,26 @@ def admin_page() -> rx.Component:
                                 "All Predictions",
                                 class_name="text-xl font-semibold mb-4",
                             ),
+                            table_search("Search user or team"),
                             rx.el.div(
                                 rx.el.table(
                                     rx.el.thead(
                                         rx.el.tr(
-                                            rx.el.th(
-                                                "Match",
-                                                class_name="px-6 py-3 text-left text-xs font-medium text-gray-500 uppercase tracking-wider",
+                                            sortable_header(
+                                                "predictions", "match", "Match"
                                             ),
-                                            rx.el.th(
-                                                "User",
-                                                class_name="px-6 py-3 text-left text-xs font-medium text-gray-500 uppercase tracking-wider",
+                                            sortable_header(
+                                                "predictions", "user", "User"
                                             ),
                                             rx.el.th(
                                                 "Prediction",
                                                 class_name="px-6 py-3 text-left text-xs font-medium text-gray-500 uppercase tracking-wider",
                                             ),
-                                            rx.el.th(
-                                                "Boost",
-                                                class_name="px-6 py-3 text-left text-xs font-medium text-gray-500 uppercase tracking-wider",
+                                            sortable_header(
+                                                "predictions", "boost", "Boost"
                                             ),
-                                            rx.el.th(
-                                                "Points",
-                                                class_name="px-6 py-3 text-left text-xs font-medium text-gray-500 uppercase tracking-wider",
+                                            sortable_header(
+                                                "predictions", "points", "Points"
                                             ),
                                         ),
                                         class_name="bg-gray-50",
@@ -640,6 +679,7 @@ def admin_page() -> rx.Component:
                                 ),
                                 class_name="overflow-x-auto shadow ring-1 ring-black ring-opacity-5 sm:rounded-lg",
                             ),
+                            table_pagination("predictions"),
                         ),
                         rx.fragment(),
                     ),
@@ -653,4 +693,4 @@ def admin_page() -> rx.Component:
         payment_modal(),
         on_mount=AdminState.on_mount,
         class_name="font-['Inter']",
-    )
\ No newline at end of file
+    )
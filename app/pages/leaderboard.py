@@ -1,12 +1,21 @@
 import reflex as rx
 from app.components.navbar import navbar
 from app.states.leaderboard_state import LeaderboardState
-from app.models import User
+from app.models import LeaderboardRow
 
+SCROLL_POSITION_SCRIPT = """
+(() => {
+    const el = document.getElementById("leaderboard-window");
+    if (!el) return "";
+    if (el.scrollTop + el.clientHeight >= el.scrollHeight - 80) return "bottom";
+    if (el.scrollTop <= 80) return "top";
+    return "";
+})()
+"""
 
-def leaderboard_row(item: tuple[int, User]) -> rx.Component:
-    index = item[0]
-    user = item[1]
+
+def leaderboard_row(row: LeaderboardRow) -> rx.Component:
+    index = row.rank
     return rx.el.tr(
         rx.el.td(
             rx.el.div(
@@ -38,11 +47,11 @@ def leaderboard_row(item: tuple[int, User]) -> rx.Component:
                     ),
                     rx.el.div(
                         rx.el.div(
-                            user.username,
+                            row.username,
                             class_name="text-sm font-medium text-gray-900",
                         ),
                         rx.el.div(
-                            rx.cond(user.is_admin, "Pro Member", "Member"),
+                            rx.cond(row.is_admin, "Pro Member", "Member"),
                             class_name="text-xs text-gray-500",
                         ),
                     ),
@@ -54,7 +63,7 @@ def leaderboard_row(item: tuple[int, User]) -> rx.Component:
         rx.el.td(
             rx.el.div(
                 rx.el.span(
-                    user.total_points,
+                    row.total_points,
                     class_name="text-sm font-bold text-indigo-600 bg-indigo-50 px-3 py-1 rounded-full",
                 ),
                 class_name="flex justify-center",
@@ -64,6 +73,26 @@ def leaderboard_row(item: tuple[int, User]) -> rx.Component:
     )
 
 
+def my_rank_card() -> rx.Component:
+    return rx.cond(
+        LeaderboardState.my_rank >= 0,
+        rx.el.div(
+            rx.el.h2(
+                f"Your rank: #{LeaderboardState.my_rank + 1}",
+                class_name="px-6 py-3 text-sm font-semibold text-gray-700 bg-gray-50",
+            ),
+            rx.el.table(
+                rx.el.tbody(
+                    rx.foreach(LeaderboardState.my_neighbours, leaderboard_row),
+                    class_name="bg-white divide-y divide-gray-200",
+                ),
+                class_name="min-w-full divide-y divide-gray-200",
+            ),
+            class_name="max-w-4xl mx-auto mb-8 overflow-hidden shadow ring-1 ring-black ring-opacity-5 sm:rounded-lg",
+        ),
+    )
+
+
 def leaderboard_page() -> rx.Component:
     return rx.el.div(
         navbar(),
@@ -80,6 +109,7 @@ def leaderboard_page() -> rx.Component:
                     ),
                     class_name="text-center mb-10",
                 ),
+                my_rank_card(),
                 rx.el.div(
                     rx.el.div(
                         rx.el.table(
@@ -101,14 +131,17 @@ def leaderboard_page() -> rx.Component:
                                 class_name="bg-gray-50",
                             ),
                             rx.el.tbody(
-                                rx.foreach(
-                                    LeaderboardState.ranked_users, leaderboard_row
-                                ),
+                                rx.foreach(LeaderboardState.rows, leaderboard_row),
                                 class_name="bg-white divide-y divide-gray-200",
                             ),
                             class_name="min-w-full divide-y divide-gray-200",
                         ),
-                        class_name="overflow-x-auto shadow ring-1 ring-black ring-opacity-5 sm:rounded-lg",
+                        id="leaderboard-window",
+                        on_scroll=rx.call_script(
+                            SCROLL_POSITION_SCRIPT,
+                            callback=LeaderboardState.handle_scroll,
+                        ).throttle(300),
+                        class_name="max-h-[70vh] overflow-auto shadow ring-1 ring-black ring-opacity-5 sm:rounded-lg",
                     ),
                     class_name="max-w-4xl mx-auto",
                 ),
@@ -116,6 +149,10 @@ def leaderboard_page() -> rx.Component:
             ),
             class_name="py-10 bg-gray-50 min-h-screen",
         ),
-        on_mount=LeaderboardState.load_leaderboard,
+        on_mount=[
+            LeaderboardState.load_leaderboard,
+            LeaderboardState.follow_live_points,
+        ],
+        on_unmount=LeaderboardState.stop_live_points,
         class_name="font-['Inter']",
-    )
\ No newline at end of file
+    )
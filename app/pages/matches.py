@@ -369,6 +369,7 @@ def matches_page() -> rx.Component:
             ),
             class_name="py-10 bg-gray-50 min-h-screen",
         ),
-        on_mount=PredictionState.load_data,
+        on_mount=[PredictionState.load_data, PredictionState.follow_live_scores],
+        on_unmount=PredictionState.stop_live_scores,
         class_name="font-['Inter']",
     )
\ No newline at end of file
@@ -185,7 +185,7 @@ def my_predictions_page() -> rx.Component:
                 rx.el.div(
                     prediction_stat_card(
                         "Total Points",
-                        PredictionState.current_user.total_points.to_string(),
+                        PredictionState.my_stats.points.to_string(),
                         "trophy",
                         "indigo",
                     ),
@@ -195,8 +195,16 @@ def my_predictions_page() -> rx.Component:
                         "target",
                         "blue",
                     ),
-                    prediction_stat_card("Accuracy", "56%", "percent", "green"),
-                    class_name="grid grid-cols-1 md:grid-cols-3 gap-6 mb-10",
+                    prediction_stat_card(
+                        "Accuracy", PredictionState.accuracy, "percent", "green"
+                    ),
+                    prediction_stat_card(
+                        "Exact Scores",
+                        PredictionState.my_stats.exact_hits.to_string(),
+                        "crosshair",
+                        "amber",
+                    ),
+                    class_name="grid grid-cols-1 md:grid-cols-4 gap-6 mb-10",
                 ),
                 rx.el.div(
                     rx.el.div(
@@ -258,6 +266,7 @@ def my_predictions_page() -> rx.Component:
             ),
             class_name="py-10 bg-gray-50 min-h-screen",
         ),
-        on_mount=PredictionState.load_data,
+        on_mount=[PredictionState.load_data, PredictionState.follow_live_scores],
+        on_unmount=PredictionState.stop_live_scores,
         class_name="font-['Inter']",
     )
\ No newline at end of file
@@ -0,0 +1,100 @@
+import asyncio
+import base64
+import hashlib
+import hmac
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple
+
+
+class ScryptParams(NamedTuple):
+    n: int
+    r: int
+    p: int
+
+    @property
+    def maxmem(self) -> int:
+        # scrypt needs 128 * n * r * p bytes; leave headroom for OpenSSL.
+        return 256 * self.n * self.r * self.p
+
+
+SCRYPT_PARAMS = ScryptParams(
+    n=int(os.getenv("SCRYPT_N", 2**14)),
+    r=int(os.getenv("SCRYPT_R", 8)),
+    p=int(os.getenv("SCRYPT_P", 1)),
+)
+HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", os.cpu_count() or 1))
+SALT_BYTES = 16
+KEY_BYTES = 32
+
+# hashlib.scrypt releases the GIL, so a thread pool hashes in parallel
+# while keeping the event loop free.
+_executor = ThreadPoolExecutor(
+    max_workers=HASH_WORKERS, thread_name_prefix="password-hash"
+)
+
+
+def _b64(data: bytes) -> str:
+    return base64.b64encode(data).decode()
+
+
+def _scrypt(password: str, salt: bytes, params: ScryptParams) -> bytes:
+    return hashlib.scrypt(
+        password.encode(),
+        salt=salt,
+        n=params.n,
+        r=params.r,
+        p=params.p,
+        maxmem=params.maxmem,
+        dklen=KEY_BYTES,
+    )
+
+
+def hash_password(password: str, params: ScryptParams = SCRYPT_PARAMS) -> str:
+    """Hash a password as "scrypt$n$r$p$salt$key" with a random salt."""
+    salt = os.urandom(SALT_BYTES)
+    key = _scrypt(password, salt, params)
+    return f"scrypt${params.n}${params.r}${params.p}${_b64(salt)}${_b64(key)}"
+
+
+def legacy_sha256_hash(password: str) -> str:
+    """The unsalted SHA-256 digest used before scrypt hashes."""
+    return hashlib.sha256(password.encode()).hexdigest()
+
+
+def verify_password(password: str, stored_hash: str) -> tuple[bool, bool]:
+    """
+    Check a password against a stored hash.
+
+    Returns (matches, needs_rehash). needs_rehash is True for a correct
+    password stored as a legacy SHA-256 digest or with outdated scrypt costs.
+    """
+    if not stored_hash.startswith("scrypt$"):
+        matches = hmac.compare_digest(legacy_sha256_hash(password), stored_hash)
+        return matches, matches
+    try:
+        _, n, r, p, salt, key = stored_hash.split("$")
+        params = ScryptParams(int(n), int(r), int(p))
+        expected = base64.b64decode(key)
+        actual = _scrypt(password, base64.b64decode(salt), params)
+    except ValueError:
+        return False, False
+    matches = hmac.compare_digest(actual, expected)
+    return matches, matches and params != SCRYPT_PARAMS
+
+
+# Checked when a username does not exist, so that a login attempt costs
+# the same scrypt work whether or not the account is real.
+DUMMY_HASH = hash_password(_b64(os.urandom(SALT_BYTES)))
+
+
+async def hash_password_async(password: str) -> str:
+    """hash_password on the hashing pool, off the event loop thread."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, hash_password, password)
+
+
+async def verify_password_async(password: str, stored_hash: str) -> tuple[bool, bool]:
+    """verify_password on the hashing pool, off the event loop thread."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, verify_password, password, stored_hash)
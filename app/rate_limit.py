@@ -0,0 +1,117 @@
+import logging
+import os
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import Hashable
+
+AUTH_COUNTERS_LOG_SECONDS = float(os.getenv("AUTH_COUNTERS_LOG_SECONDS", 300))
+UNKNOWN_USERNAME_TTL_SECONDS = float(os.getenv("UNKNOWN_USERNAME_TTL_SECONDS", 60))
+
+
+class TokenBucketLimiter:
+    """
+    Per-key token buckets refilled at `rate` tokens per second.
+
+    Each key may burst up to `capacity` requests. Buckets live in an LRU of
+    at most `max_keys` entries, so a flood of distinct keys cannot grow
+    memory without bound.
+    """
+
+    def __init__(self, rate: float, capacity: int, max_keys: int = 100_000):
+        self.rate = rate
+        self.capacity = capacity
+        self.max_keys = max_keys
+        self._lock = threading.Lock()
+        self._buckets: OrderedDict[Hashable, tuple[float, float]] = OrderedDict()
+
+    def allow(self, key: Hashable) -> bool:
+        """Take one token for `key`, returning False when the bucket is empty."""
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated_at = self._buckets.pop(key, (self.capacity, now))
+            tokens = min(self.capacity, tokens + (now - updated_at) * self.rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+            return allowed
+
+
+class NegativeCache:
+    """Bounded LRU of keys known not to exist, each remembered for `ttl_seconds`."""
+
+    def __init__(self, max_size: int = 50_000, ttl_seconds: float = 60):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[Hashable, float] = OrderedDict()
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            expires_at = self._entries.get(key)
+            if expires_at is None:
+                return False
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return False
+            self._entries.move_to_end(key)
+            return True
+
+    def add(self, key: Hashable):
+        with self._lock:
+            self._entries[key] = time.monotonic() + self.ttl_seconds
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def discard(self, key: Hashable):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class AuthCounters:
+    """
+    Thread-safe counters for login and registration outcomes.
+
+    The running totals are logged at most once every `log_seconds`, on the
+    first event after the interval has passed; 0 turns the log line off.
+    """
+
+    def __init__(self, log_seconds: float = 0):
+        self.log_seconds = log_seconds
+        self._lock = threading.Lock()
+        self._counts: Counter = Counter()
+        self._logged_at = time.monotonic()
+
+    def incr(self, name: str):
+        now = time.monotonic()
+        with self._lock:
+            self._counts[name] += 1
+            due = self.log_seconds and now - self._logged_at >= self.log_seconds
+            if due:
+                self._logged_at = now
+        if due:
+            logging.info("auth counters: %s", self.snapshot())
+
+    def snapshot(self) -> dict[str, int]:
+        with self._lock:
+            return dict(self._counts)
+
+
+# Keyed by (username, client), so failed attempts from one client cannot
+# lock the account out for everyone else.
+username_limiter = TokenBucketLimiter(rate=5 / 60, capacity=5)
+# Keyed by username alone, with more room than one client gets, so an
+# attack spread over many addresses is still throttled per account.
+account_limiter = TokenBucketLimiter(rate=20 / 60, capacity=30)
+client_limiter = TokenBucketLimiter(rate=30 / 60, capacity=20)
+# Registration only clears its own worker's entry; elsewhere a new
+# username may be refused until the short TTL runs out.
+unknown_usernames = NegativeCache(ttl_seconds=UNKNOWN_USERNAME_TTL_SECONDS)
+auth_counters = AuthCounters(AUTH_COUNTERS_LOG_SECONDS)
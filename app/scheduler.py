@@ -0,0 +1,120 @@
+import heapq
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Optional
+from app.database.database import SessionLocal
+from app.database import service
+
+# The thread never sleeps longer than this, which bounds the timing error
+# if the wall clock jumps. Matches added by other workers are picked up on
+# the next resync.
+MAX_SLEEP_SECONDS = float(os.getenv("KICKOFF_MAX_SLEEP_SECONDS", 30))
+RESYNC_SECONDS = float(os.getenv("KICKOFF_RESYNC_SECONDS", 300))
+RETRY_SECONDS = 5
+
+
+class KickoffScheduler:
+    """
+    Flips matches from upcoming to live at kickoff.
+
+    Upcoming kickoffs sit in a min-heap of (start_time, match_id), so the
+    thread sleeps until the next one instead of polling the matches table.
+    Kickoffs that fall due together go out in a single UPDATE. Changed or
+    deleted matches leave stale heap entries behind, which are skipped when
+    popped; `_kickoffs` holds the current start time of every match.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._heap: list[tuple[datetime, int]] = []
+        self._kickoffs: dict[int, datetime] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name="kickoff-scheduler", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+
+    def schedule(self, match_id: int, start_time: datetime):
+        """Track an upcoming match, waking the thread if it kicks off sooner."""
+        with self._cond:
+            if self._kickoffs.get(match_id) == start_time:
+                return
+            self._kickoffs[match_id] = start_time
+            heapq.heappush(self._heap, (start_time, match_id))
+            if self._heap[0] == (start_time, match_id):
+                self._cond.notify()
+
+    def unschedule(self, match_id: int):
+        with self._cond:
+            self._kickoffs.pop(match_id, None)
+
+    def resync(self):
+        """Rebuild the heap from the matches still marked upcoming."""
+        with SessionLocal() as db:
+            kickoffs = dict(service.get_upcoming_kickoffs(db))
+        with self._cond:
+            self._kickoffs = kickoffs
+            self._heap = [(start, match_id) for match_id, start in kickoffs.items()]
+            heapq.heapify(self._heap)
+            self._cond.notify()
+
+    def _pop_due(self, now: datetime) -> list[tuple[datetime, int]]:
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            start_time, match_id = heapq.heappop(self._heap)
+            if self._kickoffs.get(match_id) == start_time:
+                del self._kickoffs[match_id]
+                due.append((start_time, match_id))
+        return due
+
+    def _wait_seconds(self, now: datetime) -> float:
+        if not self._heap:
+            return MAX_SLEEP_SECONDS
+        delay = (self._heap[0][0] - now).total_seconds()
+        return max(0.0, min(delay, MAX_SLEEP_SECONDS))
+
+    def _start(self, due: list[tuple[datetime, int]]):
+        try:
+            with SessionLocal() as db:
+                started = service.start_due_matches(db, [m for _, m in due])
+            logging.info(f"Kicked off {started} of {len(due)} due matches")
+        except Exception as e:
+            logging.exception(f"Error starting matches: {e}")
+            for start_time, match_id in due:
+                self.schedule(match_id, start_time)
+            with self._cond:
+                self._cond.wait(RETRY_SECONDS)
+
+    def _run(self):
+        next_resync = 0.0
+        while True:
+            if time.monotonic() >= next_resync:
+                try:
+                    self.resync()
+                except Exception as e:
+                    logging.exception(f"Error loading kickoffs: {e}")
+                next_resync = time.monotonic() + RESYNC_SECONDS
+            with self._cond:
+                if self._stopped:
+                    return
+                wait = self._wait_seconds(datetime.now())
+                if wait > 0:
+                    self._cond.wait(wait)
+                due = self._pop_due(datetime.now())
+            if due:
+                self._start(due)
+
+
+kickoff_scheduler = KickoffScheduler()
@@ -0,0 +1,148 @@
+import hashlib
+import hmac
+import logging
+import os
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from datetime import timedelta
+from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.models import User
+from app.database import async_service, service
+
+SESSION_TTL = timedelta(days=int(os.getenv("SESSION_TTL_DAYS", 14)))
+SESSION_CACHE_TTL_SECONDS = 60
+PURGE_EVERY = 500
+
+_secret = os.getenv("SESSION_SECRET")
+if not _secret:
+    logging.warning(
+        "SESSION_SECRET is not set; sessions will not survive a restart "
+        "or be shared between workers."
+    )
+    _secret = secrets.token_hex(32)
+SESSION_SECRET = _secret.encode()
+
+
+def _sign(session_id: str) -> str:
+    return hmac.new(SESSION_SECRET, session_id.encode(), hashlib.sha256).hexdigest()
+
+
+class SessionStore:
+    """
+    Signed session tokens backed by the sessions table.
+
+    A token is "<session id>.<HMAC>". Forged tokens are rejected before
+    any lookup, and resolved sessions are kept in a small LRU so a
+    reconnect restores the user without touching the database.
+    """
+
+    def __init__(self, max_cached: int = 10_000):
+        self.max_cached = max_cached
+        self._lock = threading.Lock()
+        self._cache: OrderedDict[str, tuple[float, User]] = OrderedDict()
+        self._created = 0
+
+    def create(self, db: Session, user_id: int) -> str:
+        """Open a session for a user and return its signed token."""
+        session_id = secrets.token_hex(32)
+        service.create_session(db, session_id, user_id, SESSION_TTL)
+        if self._purge_due():
+            service.delete_expired_sessions(db)
+        return f"{session_id}.{_sign(session_id)}"
+
+    async def create_async(self, db: AsyncSession, user_id: int) -> str:
+        """create() on an async session."""
+        session_id = secrets.token_hex(32)
+        await async_service.create_session(db, session_id, user_id, SESSION_TTL)
+        if self._purge_due():
+            await async_service.delete_expired_sessions(db)
+        return f"{session_id}.{_sign(session_id)}"
+
+    def _purge_due(self) -> bool:
+        """Count a new session; every PURGE_EVERY-th one purges expired ones."""
+        with self._lock:
+            self._created += 1
+            return self._created % PURGE_EVERY == 0
+
+    def resolve(self, db: Session, token: str) -> Optional[User]:
+        """Return the user for a valid, unexpired token, or None."""
+        session_id = self._verify(token)
+        if session_id is None:
+            return None
+        cached = self._cached(session_id)
+        if cached is not None:
+            return cached
+        return self._remember(session_id, service.get_session_user(db, session_id))
+
+    async def resolve_async(self, db: AsyncSession, token: str) -> Optional[User]:
+        """resolve() on an async session."""
+        session_id = self._verify(token)
+        if session_id is None:
+            return None
+        cached = self._cached(session_id)
+        if cached is not None:
+            return cached
+        user_sqla = await async_service.get_session_user(db, session_id)
+        return self._remember(session_id, user_sqla)
+
+    def _cached(self, session_id: str) -> Optional[User]:
+        with self._lock:
+            cached = self._cache.get(session_id)
+            if cached and cached[0] > time.monotonic():
+                self._cache.move_to_end(session_id)
+                return cached[1]
+        return None
+
+    def _remember(self, session_id: str, user_sqla) -> Optional[User]:
+        if user_sqla is None:
+            self._forget(session_id)
+            return None
+        user = User(
+            id=user_sqla.id,
+            username=user_sqla.username,
+            password_hash="",
+            is_admin=user_sqla.is_admin,
+            total_points=user_sqla.total_points,
+            payment_status=user_sqla.payment_status,
+            created_at=str(user_sqla.created_at),
+        )
+        with self._lock:
+            self._cache[session_id] = (
+                time.monotonic() + SESSION_CACHE_TTL_SECONDS,
+                user,
+            )
+            if len(self._cache) > self.max_cached:
+                self._cache.popitem(last=False)
+        return user
+
+    def revoke(self, db: Session, token: str):
+        session_id = self._verify(token)
+        if session_id is not None:
+            self._forget(session_id)
+            service.delete_session(db, session_id)
+
+    def forget_user(self, user_id: int):
+        """Drop cached sessions of a user whose account changed."""
+        with self._lock:
+            for session_id in [
+                sid for sid, (_, user) in self._cache.items() if user.id == user_id
+            ]:
+                del self._cache[session_id]
+
+    def _forget(self, session_id: str):
+        with self._lock:
+            self._cache.pop(session_id, None)
+
+    @staticmethod
+    def _verify(token: str) -> Optional[str]:
+        session_id, _, signature = token.partition(".")
+        if not session_id or not hmac.compare_digest(signature, _sign(session_id)):
+            return None
+        return session_id
+
+
+session_store = SessionStore()
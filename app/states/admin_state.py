@@ -5,7 +5,14 @@ from app.states.base_state import BaseState
 from app.models import User, Match, Payment, Prediction
 from app.database.database import SessionLocal
 from app.database import service
-from app.database.models import Prediction as PredictionModel
+from app.scheduler import kickoff_scheduler
+from app.sessions import session_store
+
+ADMIN_TABS = ["users", "matches", "payments", "predictions"]
+
+
+def _replace_row(rows: list, row) -> list:
+    return [row if r.id == row.id else r for r in rows]
 
 
 class AdminState(BaseState):
@@ -25,102 +32,137 @@ class AdminState(BaseState):
     match_score1: int = 0
     match_score2: int = 0
     is_payment_modal_open: bool = False
-    payment_user_id: int = 0
     payment_amount: float = 0.0
     payment_status: str = "completed"
+    loaded_tabs: list[str] = []
+    page_size: int = 25
+    table_offset: dict[str, int] = {tab: 0 for tab in ADMIN_TABS}
+    table_sort: dict[str, str] = {tab: "" for tab in ADMIN_TABS}
+    table_descending: dict[str, bool] = {tab: False for tab in ADMIN_TABS}
+    table_search: dict[str, str] = {tab: "" for tab in ADMIN_TABS}
+    table_has_more: dict[str, bool] = {tab: False for tab in ADMIN_TABS}
+    username_map: dict[int, str] = {}
+    match_map: dict[int, str] = {}
 
     @rx.event
     def on_mount(self):
         """Check admin access and load data."""
         if not self.current_user or not self.current_user.is_admin:
             return rx.redirect("/")
-        self.load_data()
+        self.loaded_tabs = []
+        self.username_map = {}
+        self.match_map = {}
+        self._ensure_loaded(self.active_tab)
 
     @rx.event
     def load_data(self):
-        """Refresh all admin data."""
+        """Refresh the current page of the visible tab."""
+        self._ensure_loaded(self.active_tab, refresh=True)
+
+    def _ensure_loaded(self, tab: str, refresh: bool = False):
+        if tab in self.loaded_tabs and not refresh:
+            return
+        sort_by = self.table_sort[tab] or None
         with SessionLocal() as db:
-            users_sqla = service.get_all_users(db)
-            self.users = [
-                User(
-                    id=u.id,
-                    username=u.username,
-                    password_hash=u.password_hash,
-                    is_admin=u.is_admin,
-                    total_points=u.total_points,
-                    payment_status=u.payment_status,
-                    created_at=str(u.created_at),
-                )
-                for u in users_sqla
-            ]
-            matches_sqla = service.get_matches(db)
-            matches_sqla.sort(key=lambda x: x.id, reverse=True)
-            self.matches = [
-                Match(
-                    id=m.id,
-                    team1=m.team1,
-                    team2=m.team2,
-                    start_time=str(m.start_time),
-                    status=m.status,
-                    team1_score=m.team1_score,
-                    team2_score=m.team2_score,
-                )
-                for m in matches_sqla
-            ]
-            payments_sqla = service.get_all_payments(db)
-            self.payments = [
-                Payment(
-                    id=p.id,
-                    user_id=p.user_id,
-                    amount=p.amount,
-                    date=str(p.date),
-                    status=p.status,
-                )
-                for p in payments_sqla
-            ]
-            predictions_sqla = (
-                db.query(PredictionModel)
-                .order_by(PredictionModel.created_at.desc())
-                .limit(100)
-                .all()
+            rows, has_more = service.get_admin_table_page(
+                db,
+                tab,
+                offset=self.table_offset[tab],
+                limit=self.page_size,
+                sort_by=sort_by,
+                descending=self.table_descending[tab] if sort_by else None,
+                search=self.table_search[tab],
             )
-            self.predictions = [
-                Prediction(
-                    id=p.id,
-                    user_id=p.user_id,
-                    match_id=p.match_id,
-                    team1_prediction=p.team1_prediction,
-                    team2_prediction=p.team2_prediction,
-                    points_earned=p.points_earned,
-                    boost_active=p.boost_active,
-                    created_at=str(p.created_at),
-                )
-                for p in predictions_sqla
-            ]
+            if tab in ("payments", "predictions"):
+                self.username_map = {
+                    **self.username_map,
+                    **service.get_usernames(db, [r.user_id for r in rows]),
+                }
+            if tab == "predictions":
+                self.match_map = {
+                    **self.match_map,
+                    **service.get_match_labels(db, [r.match_id for r in rows]),
+                }
+        setattr(self, tab, rows)
+        self.table_has_more = {**self.table_has_more, tab: has_more}
+        self.loaded_tabs = [t for t in self.loaded_tabs if t != tab] + [tab]
+
+    def _mark_stale(self, *tabs: str):
+        self.loaded_tabs = [t for t in self.loaded_tabs if t not in tabs]
 
     @rx.event
     def set_tab(self, tab: str):
         self.active_tab = tab
+        self._ensure_loaded(tab)
+
+    @rx.event
+    def sort_table(self, tab: str, column: str):
+        """Sort a table by a column, toggling direction on repeated clicks."""
+        if self.table_sort[tab] == column:
+            descending = not self.table_descending[tab]
+        else:
+            descending = False
+        self.table_sort = {**self.table_sort, tab: column}
+        self.table_descending = {**self.table_descending, tab: descending}
+        self.table_offset = {**self.table_offset, tab: 0}
+        self._ensure_loaded(tab, refresh=True)
+
+    @rx.event
+    def search_table(self, form_data: dict):
+        """Filter the visible table by a text search."""
+        tab = self.active_tab
+        self.table_search = {**self.table_search, tab: form_data.get("search", "")}
+        self.table_offset = {**self.table_offset, tab: 0}
+        self._ensure_loaded(tab, refresh=True)
+
+    @rx.event
+    def next_page(self):
+        tab = self.active_tab
+        if not self.table_has_more[tab]:
+            return
+        self.table_offset = {
+            **self.table_offset,
+            tab: self.table_offset[tab] + self.page_size,
+        }
+        self._ensure_loaded(tab, refresh=True)
+
+    @rx.event
+    def previous_page(self):
+        tab = self.active_tab
+        if self.table_offset[tab] == 0:
+            return
+        self.table_offset = {
+            **self.table_offset,
+            tab: max(self.table_offset[tab] - self.page_size, 0),
+        }
+        self._ensure_loaded(tab, refresh=True)
 
     @rx.event
     def toggle_admin(self, user_id: int):
         with SessionLocal() as db:
-            service.toggle_user_admin(db, user_id)
-        self.load_data()
+            user = service.toggle_user_admin(db, user_id)
+            session_store.forget_user(user_id)
+            if user:
+                self.users = _replace_row(self.users, service.user_to_dto(user))
         yield rx.toast.success("User role updated")
 
     @rx.event
     def delete_user(self, user_id: int):
         with SessionLocal() as db:
             service.delete_user(db, user_id)
-        self.load_data()
+        session_store.forget_user(user_id)
+        self.users = [u for u in self.users if u.id != user_id]
+        self.payments = [p for p in self.payments if p.user_id != user_id]
+        self.predictions = [p for p in self.predictions if p.user_id != user_id]
         yield rx.toast.success("User deleted")
 
     @rx.event
     def update_payment_status(self, user_id: int, status: str):
         with SessionLocal() as db:
-            service.update_user_payment(db, user_id, status)
-        self.load_data()
+            user = service.update_user_payment(db, user_id, status)
+            session_store.forget_user(user_id)
+            if user:
+                self.users = _replace_row(self.users, service.user_to_dto(user))
         yield rx.toast.success(f"Payment status updated to {status}")
 
     @rx.event
@@ -176,10 +218,11 @@ class AdminState(BaseState):
                     return
             with SessionLocal() as db:
                 if self.editing_match_id == 0:
-                    service.create_match(db, team1, team2, start_time, status)
+                    match = service.create_match(db, team1, team2, start_time, status)
+                    self.matches = [service.match_to_dto(match)] + self.matches
                     yield rx.toast.success("Match created")
                 else:
-                    service.update_match(
+                    match = service.update_match(
                         db,
                         self.editing_match_id,
                         team1,
@@ -189,9 +232,19 @@ class AdminState(BaseState):
                         score1 if status != "upcoming" else None,
                         score2 if status != "upcoming" else None,
                     )
+                    if match:
+                        self.matches = _replace_row(
+                            self.matches, service.match_to_dto(match)
+                        )
+                    if status == "finished":
+                        self._mark_stale("users", "predictions")
                     yield rx.toast.success("Match updated")
+            if match:
+                if match.status == "upcoming":
+                    kickoff_scheduler.schedule(match.id, match.start_time)
+                else:
+                    kickoff_scheduler.unschedule(match.id)
             self.is_match_modal_open = False
-            self.load_data()
         except Exception as e:
             logging.exception(f"Error saving match: {e}")
             yield rx.toast.error("Failed to save match")
@@ -200,7 +253,9 @@ class AdminState(BaseState):
     def delete_match(self, match_id: int):
         with SessionLocal() as db:
             service.delete_match(db, match_id)
-        self.load_data()
+        kickoff_scheduler.unschedule(match_id)
+        self.matches = [m for m in self.matches if m.id != match_id]
+        self.predictions = [p for p in self.predictions if p.match_id != match_id]
         yield rx.toast.success("Match deleted")
 
     @rx.event
@@ -208,8 +263,6 @@ class AdminState(BaseState):
         self.is_payment_modal_open = True
         self.payment_amount = 0.0
         self.payment_status = "completed"
-        if self.users:
-            self.payment_user_id = self.users[0].id
 
     @rx.event
     def close_payment_modal(self):
@@ -218,22 +271,19 @@ class AdminState(BaseState):
     @rx.event
     def save_payment(self, form_data: dict):
         try:
-            user_id = int(form_data.get("user_id"))
+            username = form_data.get("username", "").strip()
             amount = float(form_data.get("amount"))
             status = form_data.get("status")
             with SessionLocal() as db:
-                service.create_payment(db, user_id, amount, status)
+                user = service.get_user_by_username(db, username)
+                if not user:
+                    yield rx.toast.error(f"Unknown user: {username}")
+                    return
+                payment = service.create_payment(db, user.id, amount, status)
+                self.payments = [service.payment_to_dto(payment)] + self.payments
+                self.username_map = {**self.username_map, user.id: user.username}
             self.is_payment_modal_open = False
-            self.load_data()
             yield rx.toast.success("Payment recorded")
         except Exception as e:
             logging.exception(f"Error saving payment: {e}")
             yield rx.toast.error("Invalid payment data")
-
-    @rx.var
-    def get_username_map(self) -> dict[int, str]:
-        return {u.id: u.username for u in self.users}
-
-    @rx.var
-    def get_match_map(self) -> dict[int, str]:
-        return {m.id: f"{m.team1} vs {m.team2}" for m in self.matches}
\ No newline at end of file
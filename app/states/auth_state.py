@@ -1,9 +1,17 @@
 import reflex as rx
 from app.states.base_state import BaseState
 from app.models import User
-from app.utils import hash_password
-from app.database.database import SessionLocal
-from app.database import service
+from app.passwords import DUMMY_HASH, hash_password_async, verify_password_async
+from app.database.database import AsyncSessionLocal
+from app.database import async_service
+from app.sessions import session_store
+from app.rate_limit import (
+    account_limiter,
+    auth_counters,
+    client_limiter,
+    unknown_usernames,
+    username_limiter,
+)
 
 
 class AuthState(BaseState):
@@ -15,33 +23,66 @@ class AuthState(BaseState):
     def on_mount(self):
         self.error_message = ""
 
+    def _client_key(self) -> str:
+        return f"client:{self.router.session.client_ip or self.router.session.client_token}"
+
     @rx.event
-    def handle_login(self, form_data: dict):
+    async def handle_login(self, form_data: dict):
         """Handle login form submission."""
         username = form_data.get("username")
         password = form_data.get("password")
-        with SessionLocal() as db:
-            user_sqla = service.get_user_by_username(db, username)
-            if user_sqla and user_sqla.password_hash == hash_password(password):
-                if user_sqla.payment_status != "paid":
-                    self.error_message = f"Account status: {user_sqla.payment_status}. Please contact admin for payment."
-                    return
-                self.current_user = User(
-                    id=user_sqla.id,
-                    username=user_sqla.username,
-                    password_hash=user_sqla.password_hash,
-                    is_admin=user_sqla.is_admin,
-                    total_points=user_sqla.total_points,
-                    payment_status=user_sqla.payment_status,
-                    created_at=str(user_sqla.created_at),
+        client = self._client_key()
+        if not (
+            client_limiter.allow(client)
+            and username_limiter.allow((username, client))
+            and account_limiter.allow(username)
+        ):
+            auth_counters.incr("login_rate_limited")
+            self.error_message = "Too many login attempts. Please try again later."
+            return
+        if username in unknown_usernames:
+            auth_counters.incr("login_unknown_username_cached")
+            self.error_message = "Invalid username or password."
+            return
+        # Only the lookup holds a pooled connection; the scrypt check runs
+        # after it is returned.
+        async with AsyncSessionLocal() as db:
+            user_sqla = await async_service.get_user_by_username(db, username)
+        if not user_sqla:
+            unknown_usernames.add(username)
+        matches, needs_rehash = await verify_password_async(
+            password, user_sqla.password_hash if user_sqla else DUMMY_HASH
+        )
+        if not (user_sqla and matches):
+            auth_counters.incr("login_failed")
+            self.error_message = "Invalid username or password."
+            return
+        if needs_rehash:
+            user_sqla.password_hash = await hash_password_async(password)
+            async with AsyncSessionLocal() as db:
+                await async_service.update_user_password_hash(
+                    db, user_sqla.id, user_sqla.password_hash
                 )
-                self.error_message = ""
-                return rx.redirect("/")
-            else:
-                self.error_message = "Invalid username or password."
+        if user_sqla.payment_status != "paid":
+            self.error_message = f"Account status: {user_sqla.payment_status}. Please contact admin for payment."
+            return
+        async with AsyncSessionLocal() as db:
+            self.session_token = await session_store.create_async(db, user_sqla.id)
+        self.current_user = User(
+            id=user_sqla.id,
+            username=user_sqla.username,
+            password_hash="",
+            is_admin=user_sqla.is_admin,
+            total_points=user_sqla.total_points,
+            payment_status=user_sqla.payment_status,
+            created_at=str(user_sqla.created_at),
+        )
+        auth_counters.incr("login_succeeded")
+        self.error_message = ""
+        return rx.redirect("/")
 
     @rx.event
-    def handle_register(self, form_data: dict):
+    async def handle_register(self, form_data: dict):
         """Handle registration form submission."""
         username = form_data.get("username")
         password = form_data.get("password")
@@ -55,12 +96,20 @@ class AuthState(BaseState):
         if not username:
             self.error_message = "Username is required."
             return
-        with SessionLocal() as db:
-            existing_user = service.get_user_by_username(db, username)
+        if not client_limiter.allow(self._client_key()):
+            auth_counters.incr("register_rate_limited")
+            self.error_message = "Too many attempts. Please try again later."
+            return
+        async with AsyncSessionLocal() as db:
+            existing_user = await async_service.get_user_by_username(db, username)
             if existing_user:
                 self.error_message = "Username already taken."
                 return
-            service.create_user(
-                db, username=username, password_hash=hash_password(password)
+            await async_service.create_user(
+                db,
+                username=username,
+                password_hash=await hash_password_async(password),
             )
-        return rx.redirect("/login")
\ No newline at end of file
+        unknown_usernames.discard(username)
+        auth_counters.incr("registered")
+        return rx.redirect("/login")
@@ -1,8 +1,15 @@
+import asyncio
+import time
 import reflex as rx
 from app.models import User
-from app.database.database import SessionLocal
+from app.database.database import AsyncSessionLocal, SessionLocal
 from app.database import service
-from typing import Optional
+from app.live import live_bus
+from app.sessions import SESSION_TTL, session_store
+from typing import Callable, Optional
+
+LIVE_IDLE_SECONDS = 30
+LIVE_MAX_SECONDS = 6 * 3600
 
 
 class BaseState(rx.State):
@@ -11,6 +18,12 @@ class BaseState(rx.State):
     current_user: Optional[User] = None
     top_player: Optional[User] = None
     is_mobile_menu_open: bool = False
+    session_token: str = rx.Cookie(
+        "",
+        name="session_token",
+        max_age=int(SESSION_TTL.total_seconds()),
+        same_site="strict",
+    )
 
     @rx.var
     def is_authenticated(self) -> bool:
@@ -22,33 +35,66 @@ class BaseState(rx.State):
 
     @rx.event
     def load_top_player(self):
-        """Load the top player from the database."""
+        """Load the top player from the shared top-player cache."""
         with SessionLocal() as db:
-            leaderboard = service.get_leaderboard(db)
-            if leaderboard:
-                top_sqla = leaderboard[0]
-                self.top_player = User(
-                    id=top_sqla.id,
-                    username=top_sqla.username,
-                    password_hash=top_sqla.password_hash,
-                    is_admin=top_sqla.is_admin,
-                    total_points=top_sqla.total_points,
-                    payment_status=top_sqla.payment_status,
-                    created_at=str(top_sqla.created_at),
-                )
-            else:
-                self.top_player = None
+            top = service.get_top_player(db)
+        if top:
+            self.top_player = User(
+                id=top.user_id,
+                username=top.username,
+                password_hash="",
+                is_admin=top.is_admin,
+                total_points=top.total_points,
+            )
+        else:
+            self.top_player = None
+
+    async def _follow_live(self, topic: str, apply: Callable):
+        """
+        Apply deltas published on `topic` until a newer follower starts.
+
+        Runs inside a background event handler. Subclasses own a
+        `_live_generation` counter; bumping it (on unmount, or by a new
+        follower after a remount) ends this loop at the next message or
+        idle check.
+        """
+        async with self:
+            self._live_generation += 1
+            generation = self._live_generation
+        deadline = time.monotonic() + LIVE_MAX_SECONDS
+        with live_bus.subscribe(topic) as queue:
+            while time.monotonic() < deadline:
+                try:
+                    _, message = await asyncio.wait_for(queue.get(), LIVE_IDLE_SECONDS)
+                except asyncio.TimeoutError:
+                    message = None
+                async with self:
+                    if self._live_generation != generation:
+                        return
+                    if message is not None:
+                        apply(message)
 
     @rx.event
     def logout(self):
         """Logout the current user."""
+        if self.session_token:
+            with SessionLocal() as db:
+                session_store.revoke(db, self.session_token)
+        self.session_token = ""
         self.current_user = None
         return rx.redirect("/")
 
     @rx.event
     async def check_login(self):
-        """Check if user is logged in (placeholder for persistent session logic)."""
-        pass
+        """Restore the current user from the session cookie, if any."""
+        if self.current_user is not None or not self.session_token:
+            return
+        async with AsyncSessionLocal() as db:
+            user = await session_store.resolve_async(db, self.session_token)
+        if user is None:
+            self.session_token = ""
+        else:
+            self.current_user = user
 
     @rx.event
     def toggle_mobile_menu(self):
@@ -56,4 +102,4 @@ class BaseState(rx.State):
 
     @rx.event
     def close_mobile_menu(self):
-        self.is_mobile_menu_open = False
\ No newline at end of file
+        self.is_mobile_menu_open = False
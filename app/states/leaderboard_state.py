@@ -1,32 +1,142 @@
 import reflex as rx
 from app.states.base_state import BaseState
-from app.models import User
-from app.database.database import SessionLocal
-from app.database import service
+from app.models import LeaderboardRow
+from app.database.database import AsyncSessionLocal
+from app.database import async_service
+from app.database.leaderboard import LeaderboardEntry, leaderboard_index
+from app.live import LEADERBOARD
+
+
+def _to_rows(page: list, start_rank: int) -> list[LeaderboardRow]:
+    return [
+        LeaderboardRow(
+            rank=rank,
+            user_id=r.id,
+            username=r.username,
+            total_points=r.total_points or 0,
+            is_admin=r.is_admin,
+        )
+        for rank, r in enumerate(page, start=start_rank)
+    ]
+
+
+def _entry_rows(entries: list[tuple[int, LeaderboardEntry]]) -> list[LeaderboardRow]:
+    return [
+        LeaderboardRow(
+            rank=rank,
+            user_id=e.user_id,
+            username=e.username,
+            total_points=e.total_points,
+            is_admin=e.is_admin,
+        )
+        for rank, e in entries
+    ]
 
 
 class LeaderboardState(BaseState):
-    """State for the leaderboard page."""
+    """State for the leaderboard page, holding a bounded window of rows."""
 
-    ranked_users: list[tuple[int, User]] = []
+    rows: list[LeaderboardRow] = []
+    page_size: int = 50
+    window_size: int = 200
+    has_previous: bool = False
+    has_more: bool = True
+    my_rank: int = -1
+    my_neighbours: list[LeaderboardRow] = []
+    _live_generation: int = 0
 
     @rx.event
-    def load_leaderboard(self):
-        """Load and sort users by total points."""
-        with SessionLocal() as db:
-            leaderboard_sqla = service.get_leaderboard(db)
-            self.ranked_users = [
-                (
-                    i,
-                    User(
-                        id=u.id,
-                        username=u.username,
-                        password_hash=u.password_hash,
-                        is_admin=u.is_admin,
-                        total_points=u.total_points,
-                        payment_status=u.payment_status,
-                        created_at=str(u.created_at),
-                    ),
+    async def load_leaderboard(self):
+        """Load the first page of the leaderboard."""
+        neighbours = []
+        async with AsyncSessionLocal() as db:
+            page = await async_service.get_leaderboard_page(db, self.page_size)
+            if self.current_user:
+                neighbours = await async_service.get_leaderboard_neighbours(
+                    db, self.current_user.id
                 )
-                for i, u in enumerate(leaderboard_sqla)
-            ]
\ No newline at end of file
+        self._show_neighbours(neighbours)
+        self.rows = _to_rows(page, 0)
+        self.has_previous = False
+        self.has_more = len(page) == self.page_size
+
+    @rx.event
+    async def load_next_page(self):
+        """Append the page after the window, dropping rows from the top."""
+        if not self.has_more or not self.rows:
+            return
+        last = self.rows[-1]
+        async with AsyncSessionLocal() as db:
+            page = await async_service.get_leaderboard_page(
+                db, self.page_size, after=(last.total_points, last.user_id)
+            )
+        self.has_more = len(page) == self.page_size
+        rows = self.rows + _to_rows(page, last.rank + 1)
+        if len(rows) > self.window_size:
+            rows = rows[len(rows) - self.window_size :]
+            self.has_previous = True
+        self.rows = rows
+
+    @rx.event
+    async def load_previous_page(self):
+        """Prepend the page before the window, dropping rows from the bottom."""
+        if not self.has_previous or not self.rows:
+            return
+        first = self.rows[0]
+        async with AsyncSessionLocal() as db:
+            page = await async_service.get_leaderboard_page(
+                db, self.page_size, before=(first.total_points, first.user_id)
+            )
+        self.has_previous = len(page) == self.page_size and first.rank > len(page)
+        rows = _to_rows(page, first.rank - len(page)) + self.rows
+        if len(rows) > self.window_size:
+            rows = rows[: self.window_size]
+            self.has_more = True
+        self.rows = rows
+
+    @rx.event
+    def handle_scroll(self, position: str):
+        """Fetch more rows when the table is scrolled to one of its edges."""
+        if position == "bottom":
+            return LeaderboardState.load_next_page
+        if position == "top":
+            return LeaderboardState.load_previous_page
+
+    @rx.event(background=True)
+    async def follow_live_points(self):
+        """Patch visible totals as finished matches are scored."""
+        await self._follow_live(LEADERBOARD, self._apply_point_deltas)
+
+    @rx.event
+    def stop_live_points(self):
+        self._live_generation += 1
+
+    def _show_neighbours(self, neighbours: list[tuple[int, LeaderboardEntry]]):
+        """Show the signed-in user's rank and the players around them."""
+        user_id = self.current_user.id if self.current_user else None
+        self.my_neighbours = _entry_rows(neighbours)
+        self.my_rank = next((r for r, e in neighbours if e.user_id == user_id), -1)
+
+    def _apply_point_deltas(self, deltas: list[tuple[int, int]]):
+        # The scorer patched this worker's leaderboard index before
+        # publishing, so the user's own rank is exact.
+        if self.current_user:
+            self._show_neighbours(leaderboard_index.neighbours(self.current_user.id))
+        # Re-rank within the window only; rows moving in from outside it
+        # show up on the next page load.
+        totals = dict(deltas)
+        if not self.rows or not any(r.user_id in totals for r in self.rows):
+            return
+        patched = sorted(
+            (
+                r.model_copy(update={"total_points": totals[r.user_id]})
+                if r.user_id in totals
+                else r
+                for r in self.rows
+            ),
+            key=lambda r: (-r.total_points, r.user_id),
+        )
+        self.rows = [
+            r.model_copy(update={"rank": rank})
+            for rank, r in enumerate(patched, start=self.rows[0].rank)
+        ]
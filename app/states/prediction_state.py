@@ -1,18 +1,22 @@
 import reflex as rx
 import logging
 from typing import Optional
-from datetime import datetime, timedelta
+from datetime import datetime
 from app.states.base_state import BaseState
-from app.models import Match, Prediction
-from app.database.database import SessionLocal
-from app.database import service
+from app.models import Match, Prediction, UserStats
+from app.database.database import AsyncSessionLocal
+from app.database import async_service
+from app.database.service import PREDICTION_LOCK
+from app.live import MATCHES
 
 
 class PredictionState(BaseState):
     """State for managing matches and predictions."""
 
     matches: list[Match] = []
+    _live_generation: int = 0
     my_predictions: dict[int, Prediction] = {}
+    my_stats: UserStats = UserStats()
     active_tab: str = "upcoming"
 
     @rx.var
@@ -41,6 +45,14 @@ class PredictionState(BaseState):
             list(self.my_predictions.values()), key=lambda x: x.created_at, reverse=True
         )
 
+    @rx.var
+    def accuracy(self) -> str:
+        """Share of scored predictions that earned any points."""
+        scored = self.my_stats.predictions_scored
+        if not scored:
+            return "-"
+        return f"{round(100 * (scored - self.my_stats.misses) / scored)}%"
+
     @rx.event
     def get_match_by_id(self, match_id: int) -> Optional[Match]:
         for m in self.matches:
@@ -53,39 +65,39 @@ class PredictionState(BaseState):
         self.active_tab = tab
 
     @rx.event
-    def load_data(self):
+    async def load_data(self):
         """Load matches and user predictions."""
-        with SessionLocal() as db:
-            matches_sqla = service.get_matches(db)
-            self.matches = [
-                Match(
-                    id=m.id,
-                    team1=m.team1,
-                    team2=m.team2,
-                    start_time=str(m.start_time),
-                    status=m.status,
-                    team1_score=m.team1_score,
-                    team2_score=m.team2_score,
-                )
-                for m in matches_sqla
-            ]
+        async with AsyncSessionLocal() as db:
+            self.matches = list(await async_service.get_cached_match_dtos(db))
             self.my_predictions = {}
             if self.current_user:
-                preds_sqla = service.get_user_predictions(db, self.current_user.id)
-                for p in preds_sqla:
-                    self.my_predictions[p.match_id] = Prediction(
-                        id=p.id,
-                        user_id=p.user_id,
-                        match_id=p.match_id,
-                        team1_prediction=p.team1_prediction,
-                        team2_prediction=p.team2_prediction,
-                        points_earned=p.points_earned,
-                        boost_active=p.boost_active,
-                        created_at=str(p.created_at),
-                    )
+                predictions = await async_service.get_user_prediction_dtos(
+                    db, self.current_user.id
+                )
+                self.my_predictions = {p.match_id: p for p in predictions}
+                self.my_stats = await async_service.get_user_stats(
+                    db, self.current_user.id
+                )
+
+    @rx.event(background=True)
+    async def follow_live_scores(self):
+        """Keep scores and statuses current while a match page is open."""
+        await self._follow_live(MATCHES, self._apply_match_deltas)
 
     @rx.event
-    def submit_prediction(self, form_data: dict):
+    def stop_live_scores(self):
+        self._live_generation += 1
+
+    def _apply_match_deltas(self, deltas: list[dict]):
+        changes = {d["id"]: d for d in deltas}
+        if any(m.id in changes for m in self.matches):
+            self.matches = [
+                m.model_copy(update=changes[m.id]) if m.id in changes else m
+                for m in self.matches
+            ]
+
+    @rx.event
+    async def submit_prediction(self, form_data: dict):
         """Submit a prediction for a match."""
         if not self.current_user:
             yield rx.toast.error("You must be logged in to predict.")
@@ -112,12 +124,12 @@ class PredictionState(BaseState):
             yield rx.toast.error("Match not found locally. Please refresh.")
             return
         start_time = datetime.fromisoformat(match.start_time)
-        if datetime.now() > start_time - timedelta(minutes=5):
+        if datetime.now() > start_time - PREDICTION_LOCK:
             yield rx.toast.error("Predictions are locked for this match.")
             return
-        with SessionLocal() as db:
+        async with AsyncSessionLocal() as db:
             try:
-                pred_sqla = service.create_or_update_prediction(
+                prediction = await async_service.create_or_update_prediction(
                     db,
                     user_id=self.current_user.id,
                     match_id=match_id,
@@ -125,18 +137,12 @@ class PredictionState(BaseState):
                     team2_pred=team2_pred,
                     boost_active=boost_active,
                 )
-                self.my_predictions[match_id] = Prediction(
-                    id=pred_sqla.id,
-                    user_id=pred_sqla.user_id,
-                    match_id=pred_sqla.match_id,
-                    team1_prediction=pred_sqla.team1_prediction,
-                    team2_prediction=pred_sqla.team2_prediction,
-                    points_earned=pred_sqla.points_earned,
-                    boost_active=pred_sqla.boost_active,
-                    created_at=str(pred_sqla.created_at),
-                )
+                if prediction is None:
+                    yield rx.toast.error("Predictions are locked for this match.")
+                    return
+                self.my_predictions[match_id] = prediction
                 self.my_predictions = self.my_predictions.copy()
                 yield rx.toast.success("Prediction submitted!")
             except Exception as e:
                 logging.exception(f"Error saving prediction: {e}")
-                yield rx.toast.error("Failed to save prediction.")
\ No newline at end of file
+                yield rx.toast.error("Failed to save prediction.")
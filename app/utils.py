@@ -1,11 +1,7 @@
-import hashlib
+import numpy as np
 from app.models import Match, Prediction
 
 
-def hash_password(password: str) -> str:
-    return hashlib.sha256(password.encode()).hexdigest()
-
-
 def calculate_points_for_match(match: Match, prediction: Prediction) -> int:
     """
     Calculate points based on rules:
@@ -45,4 +41,31 @@ def calculate_points_for_match(match: Match, prediction: Prediction) -> int:
             points = 2
     if prediction.boost_active:
         points *= 2
-    return points
\ No newline at end of file
+    return points
+
+
+def calculate_points_batch(
+    team1_score: int,
+    team2_score: int,
+    team1_predictions: np.ndarray,
+    team2_predictions: np.ndarray,
+    boost_active: np.ndarray,
+) -> np.ndarray:
+    """
+    Vectorized calculate_points_for_match for every prediction on one finished match.
+
+    Takes the final score plus columnar arrays of predicted scores and boost
+    flags, and returns an int array of points following the same 7/5/2/0 rules.
+    """
+    team1_predictions = np.asarray(team1_predictions, dtype=np.int64)
+    team2_predictions = np.asarray(team2_predictions, dtype=np.int64)
+    boost_active = np.asarray(boost_active, dtype=bool)
+    team1_hit = team1_predictions == team1_score
+    team2_hit = team2_predictions == team2_score
+    same_winner = np.sign(team1_predictions - team2_predictions) == np.sign(
+        team1_score - team2_score
+    )
+    points = np.select(
+        [team1_hit & team2_hit, team1_hit | team2_hit, same_winner], [7, 5, 2], 0
+    )
+    return np.where(boost_active, points * 2, points)
@@ -0,0 +1,52 @@
+"""
+Measure password verifications per second at several scrypt cost settings.
+
+    python -m benchmarks.bench_password_hashing [--seconds S]
+
+For each cost setting it reports single-thread logins/sec (one core) and
+the throughput of the shared hashing pool with all of its workers busy.
+"""
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+from app.passwords import HASH_WORKERS, ScryptParams, hash_password, verify_password
+
+COST_SETTINGS = [
+    ScryptParams(n=2**12, r=8, p=1),
+    ScryptParams(n=2**14, r=8, p=1),
+    ScryptParams(n=2**15, r=8, p=1),
+    ScryptParams(n=2**16, r=8, p=1),
+]
+
+
+def logins_per_second(stored_hash: str, seconds: float, workers: int) -> float:
+    def worker() -> int:
+        count = 0
+        deadline = time.perf_counter() + seconds
+        while time.perf_counter() < deadline:
+            verify_password("correct horse", stored_hash)
+            count += 1
+        return count
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        start = time.perf_counter()
+        total = sum(pool.map(lambda _: worker(), range(workers)))
+        return total / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--seconds", type=float, default=2.0)
+    args = parser.parse_args()
+    print(f"{'cost':>22}  {'per core':>10}  {f'{HASH_WORKERS} workers':>12}")
+    for params in COST_SETTINGS:
+        stored = hash_password("correct horse", params)
+        single = logins_per_second(stored, args.seconds, 1)
+        pooled = logins_per_second(stored, args.seconds, HASH_WORKERS)
+        label = f"n=2^{params.n.bit_length() - 1} r={params.r} p={params.p}"
+        print(f"{label:>22}  {single:>10.1f}  {pooled:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Compare ORM entity loads + DTO copies against the service projections.
+
+    python -m benchmarks.bench_projections [--users N] [--matches N]
+        [--page N] [--repeat N]
+
+A page load is one page of each admin table below, as the admin page reads
+it through get_admin_table_page(). Runs against BENCH_DB_URL (default: an
+in-memory SQLite database) and reports wall time and peak traced
+allocations per simulated page load.
+"""
+
+import argparse
+import os
+import random
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from functools import partial
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import sessionmaker
+from app.database.database import Base
+from app.database.models import User, Match, Prediction, season_of
+from app.database import service
+
+TABLES = ("matches", "predictions")
+
+
+def populate(db, users: int, matches: int):
+    rng = random.Random(0)
+    now = datetime.now()
+    db.execute(
+        insert(User),
+        [{"username": f"user{i}", "password_hash": "x"} for i in range(users)],
+    )
+    db.execute(
+        insert(Match),
+        [
+            {
+                "team1": f"Team {i}",
+                "team2": f"Team {i + 1}",
+                "start_time": now + timedelta(hours=i),
+            }
+            for i in range(matches)
+        ],
+    )
+    db.execute(
+        insert(Prediction),
+        [
+            {
+                "user_id": 1,
+                "match_id": m + 1,
+                "season": season_of(now + timedelta(hours=m)),
+                "team1_prediction": rng.randint(0, 4),
+                "team2_prediction": rng.randint(0, 4),
+            }
+            for m in range(matches)
+        ],
+    )
+    db.commit()
+
+
+def orm_page_load(db, page: int):
+    """The same pages as whole entities, copied into DTOs."""
+    pages = []
+    for table in TABLES:
+        spec = service.ADMIN_TABLES[table]
+        primary_key = spec.columns[0]
+        sort_column = spec.sort_columns[spec.default_sort]
+        query = select(primary_key.class_)
+        for target, onclause in spec.joins:
+            query = query.join(target, onclause)
+        if spec.default_descending:
+            query = query.order_by(sort_column.desc(), primary_key.desc())
+        else:
+            query = query.order_by(sort_column, primary_key)
+        pages.append([spec.to_dto(e) for e in db.scalars(query.limit(page))])
+    return pages
+
+
+def projection_page_load(db, page: int):
+    return [service.get_admin_table_page(db, table, limit=page) for table in TABLES]
+
+
+def measure(session_factory, load, repeat: int) -> tuple[float, int]:
+    elapsed = 0.0
+    peak = 0
+    for _ in range(repeat):
+        with session_factory() as db:
+            tracemalloc.start()
+            start = time.perf_counter()
+            load(db)
+            elapsed += time.perf_counter() - start
+            peak = max(peak, tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+    return elapsed / repeat, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--matches", type=int, default=2000)
+    parser.add_argument("--page", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    engine = create_engine(os.getenv("BENCH_DB_URL", "sqlite://"))
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(bind=engine)
+    with session_factory() as db:
+        populate(db, args.users, args.matches)
+    for name, load in (("orm", orm_page_load), ("projection", projection_page_load)):
+        seconds, peak = measure(
+            session_factory, partial(load, page=args.page), args.repeat
+        )
+        print(
+            f"{name:>10}: {seconds * 1000:8.2f} ms/load  {peak / 1024:10.1f} KiB peak"
+        )
+
+
+if __name__ == "__main__":
+    main()
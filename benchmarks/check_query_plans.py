@@ -0,0 +1,250 @@
+"""
+Fail if a hot service query plans to read or sort a whole large table.
+
+    python -m benchmarks.check_query_plans [--users N] [--matches N] [--predictions N]
+
+Seeds BENCH_DB_URL (default: an in-memory SQLite database) with
+seed_synthetic and runs ANALYZE. It then calls each service function
+below, records the SQL it sends, and EXPLAINs every statement. It exits
+non-zero if any plan, on a table of at least --min-rows rows:
+
+- scans it sequentially (PostgreSQL "Seq Scan");
+- walks all of it, even through an index, in a statement that has no
+  LIMIT or sorts its rows before applying one (SQLite "SCAN t [USING
+  INDEX i]" with "USE TEMP B-TREE FOR ORDER BY");
+- sorts that many rows (a PostgreSQL Sort node).
+
+A walk in index or rowid order that a LIMIT cuts short is fine, although
+a filter the index cannot serve, like a '%term%' search, may read far
+into the table when few rows match. Smaller tables are left to the
+planner. tests/test_query_plans.py runs the same check on a small
+dataset.
+"""
+
+import argparse
+import os
+import re
+import sys
+from datetime import datetime, timedelta
+from functools import partial
+from typing import Optional
+from sqlalchemy import create_engine, event, func, insert, select, text
+from sqlalchemy.orm import sessionmaker
+from app.database.database import Base
+from app.database.models import Match, Payment
+from app.database.seed import seed_synthetic
+from app.database import service
+
+
+def query_shapes(user_id: int, match: Match, upcoming: Optional[Match]) -> dict:
+    """Service calls to trace, each as a function of a session."""
+    score = (match.team1_score or 0) + 1, match.team2_score or 0
+    shapes = {
+        "get_prediction": lambda db: service.get_prediction(db, user_id, match.id),
+        "get_user_predictions": lambda db: service.get_user_predictions(db, user_id),
+        "match_dtos_query(upcoming)": lambda db: db.execute(
+            service.match_dtos_query("upcoming")
+        ).all(),
+        "get_upcoming_kickoffs": service.get_upcoming_kickoffs,
+        # Rescoring runs the _recalculate_points_sql UPDATEs and the
+        # refresh_user_stats upsert for the match's users.
+        "update_match(finished)": lambda db: service.update_match(
+            db,
+            match.id,
+            match.team1,
+            match.team2,
+            match.start_time,
+            "finished",
+            *score,
+        ),
+        "leaderboard first page": lambda db: service.get_leaderboard_page(db, 50),
+        "leaderboard next page": lambda db: service.get_leaderboard_page(
+            db, 50, after=(10, 500)
+        ),
+        "leaderboard previous page": lambda db: service.get_leaderboard_page(
+            db, 50, before=(10, 500)
+        ),
+        "get_user_stats": lambda db: service.get_user_stats(db, user_id),
+        "get_session_user": lambda db: service.get_session_user(db, "x"),
+        "delete_expired_sessions": service.delete_expired_sessions,
+    }
+    if upcoming is not None:
+        shapes["create_or_update_prediction"] = lambda db: (
+            service.create_or_update_prediction(db, user_id, upcoming.id, 1, 0, False)
+        )
+    for table, spec in service.ADMIN_TABLES.items():
+        for sort_by in spec.sort_columns:
+            shapes[f"admin {table} by {sort_by}"] = partial(
+                service.get_admin_table_page, table=table, sort_by=sort_by
+            )
+        shapes[f"admin {table} search"] = partial(
+            service.get_admin_table_page, table=table, search="user1"
+        )
+    return shapes
+
+
+def traced_statements(engine, call) -> list[tuple[str, object]]:
+    """The SQL statements and parameters `call` sends to the database."""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().split(None, 1)[0].upper() in TRACED:
+            statements.append((statement, parameters[0] if executemany else parameters))
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        call()
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    return statements
+
+
+TRACED = {"SELECT", "INSERT", "UPDATE", "DELETE", "WITH"}
+
+
+def explain(conn, statement: str, parameters) -> list[str]:
+    """
+    The plan of one traced statement, a line per node.
+
+    On PostgreSQL, sequential scans and sorts are priced out first, so one
+    that is left in the plan has no index to replace it, whatever the
+    planner would pick at this data size.
+    """
+    if conn.dialect.name == "postgresql":
+        conn.exec_driver_sql("SET LOCAL enable_seqscan = off")
+        conn.exec_driver_sql("SET LOCAL enable_sort = off")
+        prefix = "EXPLAIN"
+    else:
+        prefix = "EXPLAIN QUERY PLAN"
+    return [
+        str(row[-1])
+        for row in conn.exec_driver_sql(f"{prefix} {statement}", parameters)
+    ]
+
+
+# PostgreSQL "Seq Scan on t"; SQLite "SCAN t", with or without "USING INDEX".
+SEQUENTIAL_SCAN = re.compile(r"Seq Scan on (\w+)")
+FULL_WALK = re.compile(r"^\s*SCAN (\w+)")
+# Not "Incremental Sort", nor SQLite's "TEMP B-TREE FOR RIGHT PART OF ORDER BY",
+# which only sort runs of rows that tie on an index's leading columns.
+SORT_NODE = re.compile(r"^(?:\s*->)?\s*Sort  \(cost=\S+ rows=(\d+)")
+FULL_SORT = "USE TEMP B-TREE FOR ORDER BY"
+LIMIT = re.compile(r"\bLIMIT\b", re.IGNORECASE)
+
+
+def plan_problems(
+    statement: str, plan: list[str], row_counts: dict[str, int], min_rows: int
+) -> list[str]:
+    """The lines of `plan` that read or sort a whole table of `min_rows` or more."""
+
+    def large(table) -> bool:
+        return row_counts.get(table, 0) >= min_rows
+
+    sorts_all = any(line.strip() == FULL_SORT for line in plan)
+    bounded = LIMIT.search(statement) and not sorts_all
+    problems = []
+    for line in plan:
+        seq_scan = SEQUENTIAL_SCAN.search(line)
+        walk = FULL_WALK.search(line)
+        sort = SORT_NODE.search(line)
+        if seq_scan and large(seq_scan.group(1)):
+            problems.append(line)
+        elif walk and large(walk.group(1)) and not bounded:
+            problems.append(line)
+        elif sort and int(sort.group(1)) >= min_rows:
+            problems.append(line)
+    if sorts_all and problems:
+        problems.append(FULL_SORT)
+    return problems
+
+
+def populate_payments(db, users: int, count: int):
+    now = datetime.now()
+    db.execute(
+        insert(Payment),
+        [
+            {
+                "user_id": i % users + 1,
+                "amount": 10.0,
+                "date": now - timedelta(minutes=i),
+            }
+            for i in range(count)
+        ],
+    )
+    db.commit()
+
+
+def analyze(engine) -> dict[str, int]:
+    """Refresh the planner statistics and return each table's row count."""
+    with engine.connect() as conn:
+        conn.execute(text("ANALYZE"))
+        conn.commit()
+        return {
+            table.name: conn.execute(select(func.count()).select_from(table)).scalar()
+            for table in Base.metadata.sorted_tables
+        }
+
+
+def check_shapes(
+    engine, db, row_counts: dict[str, int], min_rows: int, verbose: bool = False
+) -> dict[str, list[str]]:
+    """
+    Trace and EXPLAIN every query shape against the data in `db`.
+
+    Returns the problem lines found per shape name; shapes without any
+    are left out. `verbose` prints every shape with its statements and
+    plans.
+    """
+    match = db.scalars(
+        select(Match).where(Match.status == "finished").order_by(Match.id).limit(1)
+    ).first()
+    upcoming = db.scalars(
+        select(Match)
+        .where(Match.status == "upcoming", Match.start_time > datetime.now())
+        .limit(1)
+    ).first()
+    user_id = row_counts["users"] // 2
+    failures = {}
+    for name, call in query_shapes(user_id, match, upcoming).items():
+        statements = traced_statements(engine, partial(call, db))
+        with engine.connect() as conn:
+            plans = [explain(conn, *s) for s in statements]
+        problems = [
+            line
+            for (statement, _), plan in zip(statements, plans)
+            for line in plan_problems(statement, plan, row_counts, min_rows)
+        ]
+        if problems:
+            failures[name] = problems
+        if verbose:
+            print(f"{'FAIL' if problems else 'ok':>5}  {name}")
+            for (statement, _), plan in zip(statements, plans):
+                print(f"      {' '.join(statement.split())[:100]}")
+                for line in plan:
+                    print(f"        {line}")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=20_000)
+    parser.add_argument("--matches", type=int, default=500)
+    parser.add_argument("--predictions", type=int, default=200_000)
+    parser.add_argument("--min-rows", type=int, default=10_000)
+    args = parser.parse_args()
+    engine = create_engine(os.getenv("BENCH_DB_URL", "sqlite://"))
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(bind=engine)
+    with session_factory() as db:
+        seed_synthetic(db, args.users, args.matches, args.predictions)
+        populate_payments(db, args.users, args.users)
+    row_counts = analyze(engine)
+    with session_factory() as db:
+        failures = check_shapes(engine, db, row_counts, args.min_rows, verbose=True)
+    if failures:
+        print(f"{len(failures)} query shape(s) read or sort a whole large table.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
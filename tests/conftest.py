@@ -0,0 +1,55 @@
+import os
+import tempfile
+
+# The engines are created when app.database.database is imported, so the
+# test database has to be chosen before anything from app is imported.
+# TEST_DATABASE_URL runs the suite against a scratch PostgreSQL database
+# instead, which also runs the PostgreSQL-only tests; it is emptied first.
+for name in ("REFLEX_DB_URL", "REPLICA_DATABASE_URL", "ASYNC_REPLICA_DATABASE_URL"):
+    os.environ.pop(name, None)
+if os.getenv("TEST_DATABASE_URL"):
+    os.environ["DATABASE_URL"] = os.environ["TEST_DATABASE_URL"]
+    os.environ.pop("ASYNC_DATABASE_URL", None)
+else:
+    _DB_PATH = os.path.join(tempfile.mkdtemp(prefix="scorepredictor-tests-"), "test.db")
+    os.environ["DATABASE_URL"] = f"sqlite:///{_DB_PATH}"
+    os.environ["ASYNC_DATABASE_URL"] = f"sqlite+aiosqlite:///{_DB_PATH}"
+
+import pytest  # noqa: E402
+from sqlalchemy import MetaData, text  # noqa: E402
+from app.database import models  # noqa: E402,F401
+from app.database.cache import match_list_cache, top_player_cache  # noqa: E402
+from app.database.database import Base, SessionLocal, engine  # noqa: E402
+from app.database.leaderboard import leaderboard_index  # noqa: E402
+
+
+def drop_all_tables():
+    """Drop every table, including ones the models no longer declare."""
+    metadata = MetaData()
+    metadata.reflect(bind=engine)
+    if engine.dialect.name != "postgresql":
+        metadata.drop_all(bind=engine)
+        return
+    # Dropping a partitioned table drops its partitions along with it.
+    with engine.begin() as conn:
+        for table in metadata.sorted_tables:
+            conn.execute(text(f'DROP TABLE IF EXISTS "{table.name}" CASCADE'))
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    yield
+    top_player_cache.invalidate()
+    match_list_cache.invalidate()
+    leaderboard_index.invalidate()
+
+
+@pytest.fixture
+def db():
+    drop_all_tables()
+    Base.metadata.create_all(bind=engine)
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
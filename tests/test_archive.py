@@ -0,0 +1,159 @@
+from datetime import datetime
+import pytest
+from sqlalchemy import func, select, text
+from app.database import archive, service
+from app.database.database import SessionLocal, engine
+from app.database.migrate import upgrade
+from app.database.models import Match, Payment, Prediction, User, UserStats
+from app.database.partitions import (
+    ensure_season_partition,
+    partition_name,
+    season_partitions,
+)
+from conftest import drop_all_tables
+
+
+def _finished_match(db, team1, team2, start_time, score, picks):
+    match = service.create_match(db, team1, team2, start_time)
+    for user, (team1_prediction, team2_prediction) in picks.items():
+        db.add(
+            Prediction(
+                user_id=user.id,
+                match_id=match.id,
+                season=match.season,
+                team1_prediction=team1_prediction,
+                team2_prediction=team2_prediction,
+            )
+        )
+    db.commit()
+    service.update_match(db, match.id, team1, team2, start_time, "finished", *score)
+    return match
+
+
+def _seed_2020(db):
+    alice = service.create_user(db, "alice", "x")
+    bob = service.create_user(db, "bob", "x")
+    old = _finished_match(
+        db, "A", "B", datetime(2020, 5, 1), (2, 1), {alice: (2, 1), bob: (0, 3)}
+    )
+    _finished_match(db, "C", "D", datetime(2021, 5, 1), (1, 1), {bob: (1, 1)})
+    db.add(Payment(user_id=alice.id, amount=10.0, date=datetime(2020, 3, 1)))
+    db.commit()
+    return old.id, alice.id, bob.id
+
+
+@pytest.fixture
+def season_2020(db):
+    return _seed_2020(db)
+
+
+def _count(db, model):
+    return db.execute(select(func.count()).select_from(model)).scalar()
+
+
+def test_export_round_trip(db, season_2020, tmp_path):
+    old_id, alice_id, bob_id = season_2020
+
+    counts = archive.export_season(2020, str(tmp_path))
+
+    assert counts == {"matches": 1, "predictions": 2, "payments": 1, "leaderboard": 2}
+    assert archive.archived_seasons(str(tmp_path)) == [2020]
+    board = archive.season_leaderboard(2020, archive_dir=str(tmp_path))
+    assert [(r.rank, r.username, r.total_points) for r in board] == [
+        (1, "alice", 7),
+        (2, "bob", 0),
+    ]
+    assert [m.id for m in archive.archived_matches(2020, str(tmp_path))] == [old_id]
+    history = archive.user_history(alice_id, archive_dir=str(tmp_path))
+    assert [(p.match_id, p.points_earned) for p in history] == [(old_id, 7)]
+
+    db.expire_all()
+    assert _count(db, Match) == 1
+    assert _count(db, Prediction) == 1
+    assert _count(db, Payment) == 0
+    assert db.get(User, alice_id).total_points == 0
+    assert db.get(User, bob_id).total_points == 7
+    assert db.get(UserStats, alice_id) is None
+    assert db.get(UserStats, bob_id).points == 7
+
+    # Rerunning a completed export finds nothing left to delete.
+    assert archive.export_season(2020, str(tmp_path)) == counts
+
+
+def test_only_season_users_stats_are_rebuilt(db, season_2020, tmp_path):
+    carol = service.create_user(db, "carol", "x")
+    _finished_match(db, "E", "F", datetime(2021, 6, 1), (0, 0), {carol: (0, 0)})
+    stamp = datetime(2000, 1, 1)
+    db.get(UserStats, carol.id).updated_at = stamp
+    db.commit()
+
+    archive.export_season(2020, str(tmp_path))
+
+    db.expire_all()
+    assert db.get(UserStats, carol.id).updated_at == stamp
+    assert db.get(UserStats, season_2020[2]).updated_at != stamp
+
+
+def test_retry_refuses_rows_added_after_export(db, season_2020, tmp_path):
+    archive.export_season(2020, str(tmp_path))
+    late = _finished_match(db, "E", "F", datetime(2020, 9, 1), (0, 0), {}).id
+
+    with pytest.raises(ValueError, match="does not match its archive"):
+        archive.export_season(2020, str(tmp_path))
+
+    db.expire_all()
+    assert db.get(Match, late) is not None
+
+
+def test_unfinished_season_is_not_exported(db, tmp_path):
+    service.create_match(db, "A", "B", datetime(2020, 5, 1))
+
+    with pytest.raises(ValueError, match="unfinished"):
+        archive.export_season(2020, str(tmp_path))
+    assert archive.archived_seasons(str(tmp_path)) == []
+
+
+@pytest.fixture
+def migrated_db():
+    drop_all_tables()
+    upgrade()
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        drop_all_tables()
+
+
+@pytest.mark.skipif(
+    engine.dialect.name != "postgresql", reason="season partitions need PostgreSQL"
+)
+@pytest.mark.parametrize("own_partition", [True, False])
+def test_export_partitioned_season(migrated_db, own_partition, tmp_path):
+    db = migrated_db
+    if own_partition:
+        with engine.begin() as conn:
+            assert ensure_season_partition(conn, 2020)
+    old_id, alice_id, bob_id = _seed_2020(db)
+    with engine.connect() as conn:
+        assert (partition_name(2020) in season_partitions(conn)) == own_partition
+    # An open read transaction would hold the partition lock the drop needs.
+    db.rollback()
+
+    counts = archive.export_season(2020, str(tmp_path))
+
+    assert counts == {"matches": 1, "predictions": 2, "payments": 1, "leaderboard": 2}
+    with engine.connect() as conn:
+        assert partition_name(2020) not in season_partitions(conn)
+        assert (
+            conn.execute(
+                text("SELECT to_regclass(:name)"), {"name": partition_name(2020)}
+            ).scalar()
+            is None
+        )
+    db.expire_all()
+    assert _count(db, Prediction) == 1
+    assert db.get(User, alice_id).total_points == 0
+    assert db.get(User, bob_id).total_points == 7
+    history = archive.user_history(alice_id, archive_dir=str(tmp_path))
+    assert [(p.match_id, p.points_earned) for p in history] == [(old_id, 7)]
@@ -0,0 +1,61 @@
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from app.database import service
+from app.database.leaderboard import LeaderboardEntry, LeaderboardIndex
+
+
+def _row(user_id, points):
+    return SimpleNamespace(
+        id=user_id, username=f"u{user_id}", total_points=points, is_admin=False
+    )
+
+
+def _ranks(pairs):
+    return [(rank, entry.user_id) for rank, entry in pairs]
+
+
+def test_index_ranks_by_points_then_id():
+    index = LeaderboardIndex(max_age_seconds=60)
+    index.load([_row(1, 5), _row(2, 9), _row(3, 5), _row(4, 0)], index.generation)
+
+    assert _ranks(index.top(2)) == [(0, 2), (1, 1)]
+    assert index.rank(3) == 2
+    assert index.rank(99) is None
+    assert _ranks(index.neighbours(4, radius=1)) == [(2, 3), (3, 4)]
+
+    index.upsert(LeaderboardEntry(4, "u4", 10, False))
+    index.remove(2)
+    assert _ranks(index.top(4)) == [(0, 4), (1, 1), (2, 3)]
+
+
+def test_load_racing_a_patch_is_reloaded():
+    index = LeaderboardIndex(max_age_seconds=60)
+    generation = index.generation
+    index.upsert(LeaderboardEntry(1, "u1", 3, False))
+    index.load([_row(1, 0)], generation)
+
+    assert index.rank(1) == 0
+    assert index.stale
+
+
+def test_scoring_patches_a_loaded_index(db):
+    alice = service.create_user(db, "alice", "x")
+    bob = service.create_user(db, "bob", "x")
+    match = service.create_match(db, "A", "B", datetime.now() + timedelta(days=1))
+    service.create_or_update_prediction(db, bob.id, match.id, 2, 1, False)
+
+    assert _ranks(service.get_leaderboard_neighbours(db, bob.id)) == [
+        (0, alice.id),
+        (1, bob.id),
+    ]
+    service.update_match(db, match.id, "A", "B", match.start_time, "finished", 2, 1)
+    carol = service.create_user(db, "carol", "x")
+    assert _ranks(service.get_leaderboard_neighbours(db, bob.id, radius=1)) == [
+        (0, bob.id),
+        (1, alice.id),
+    ]
+    assert service.delete_user(db, alice.id)
+    assert _ranks(service.get_leaderboard_neighbours(db, carol.id)) == [
+        (0, bob.id),
+        (1, carol.id),
+    ]
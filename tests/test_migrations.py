@@ -0,0 +1,136 @@
+from datetime import datetime
+import pytest
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.migration import MigrationContext
+from sqlalchemy import inspect, text
+from app.database.database import Base, engine
+from app.database.migrate import alembic_config, upgrade
+from app.database.partitions import PARENT_TABLE
+from conftest import drop_all_tables
+
+
+@pytest.fixture
+def empty_database():
+    drop_all_tables()
+    yield
+    drop_all_tables()
+
+
+def _revision() -> str:
+    with engine.connect() as conn:
+        return MigrationContext.configure(conn).get_current_revision()
+
+
+def _not_a_partition(name, type_, parent_names) -> bool:
+    # Season partitions on PostgreSQL are tables the models do not declare.
+    return not (type_ == "table" and name.startswith(f"{PARENT_TABLE}_"))
+
+
+def _schema_drift() -> list:
+    with engine.connect() as conn:
+        context = MigrationContext.configure(
+            conn, opts={"include_name": _not_a_partition}
+        )
+        return compare_metadata(context, Base.metadata)
+
+
+def test_upgrade_builds_the_model_schema(empty_database):
+    upgrade()
+    assert _revision() == "0005"
+    assert _schema_drift() == []
+
+
+def test_downgrade_and_upgrade_again(empty_database):
+    upgrade()
+    command.downgrade(alembic_config(), "0001")
+    assert _revision() == "0001"
+    assert "sessions" not in inspect(engine).get_table_names()
+    upgrade()
+    assert _revision() == "0005"
+    assert _schema_drift() == []
+
+
+def test_upgrade_adopts_a_create_all_database(empty_database):
+    upgrade("0001")
+    kickoff = datetime(2024, 5, 1)
+    with engine.begin() as conn:
+        conn.execute(text("DROP TABLE alembic_version"))
+        conn.execute(
+            text("INSERT INTO users (id, username, password_hash) VALUES (1, 'a', 'x')")
+        )
+        conn.execute(
+            text(
+                "INSERT INTO matches (id, team1, team2, start_time, status,"
+                " team1_score, team2_score) VALUES (1, 'A', 'B', :t, 'finished', 2, 1)"
+            ),
+            {"t": kickoff},
+        )
+        conn.execute(
+            text(
+                "INSERT INTO predictions (id, user_id, match_id, team1_prediction,"
+                " team2_prediction, points_earned, boost_active)"
+                " VALUES (1, 1, 1, 2, 1, 0, TRUE)"
+            )
+        )
+
+    upgrade()
+
+    assert _revision() == "0005"
+    with engine.connect() as conn:
+        row = conn.execute(
+            text(
+                "SELECT p.points_earned, p.season, m.season, u.total_points, s.points"
+                " FROM predictions p JOIN matches m ON m.id = p.match_id"
+                " JOIN users u ON u.id = p.user_id"
+                " JOIN user_stats s ON s.user_id = u.id"
+            )
+        ).one()
+    assert tuple(row) == (14, 2024, 2024, 14, 14)
+
+
+def _index_valid(conn, name):
+    return conn.execute(
+        text("SELECT indisvalid FROM pg_index WHERE indexrelid = to_regclass(:name)"),
+        {"name": name},
+    ).scalar()
+
+
+@pytest.mark.skipif(
+    engine.dialect.name != "postgresql", reason="invalid indexes are PostgreSQL's"
+)
+def test_upgrade_rebuilds_invalid_indexes(empty_database):
+    upgrade("0004")
+    # What an interrupted CREATE INDEX CONCURRENTLY leaves behind.
+    with engine.begin() as conn:
+        conn.execute(text("CREATE INDEX ix_payments_amount ON payments (amount, id)"))
+        conn.execute(
+            text(
+                "CREATE INDEX ix_predictions_points_earned"
+                " ON ONLY predictions (points_earned, id)"
+            )
+        )
+        conn.execute(
+            text(
+                "CREATE INDEX ix_predictions_points_earned_default"
+                " ON predictions_default (points_earned, id)"
+            )
+        )
+        conn.execute(
+            text(
+                "UPDATE pg_index SET indisvalid = false WHERE indexrelid IN"
+                " ('ix_payments_amount'::regclass,"
+                " 'ix_predictions_points_earned_default'::regclass)"
+            )
+        )
+
+    upgrade()
+
+    with engine.connect() as conn:
+        for name in (
+            "ix_payments_amount",
+            "ix_predictions_points_earned",
+            "ix_predictions_points_earned_default",
+        ):
+            assert _index_valid(conn, name) is True
+    assert _schema_drift() == []
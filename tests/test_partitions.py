@@ -0,0 +1,87 @@
+from datetime import datetime
+import pytest
+from sqlalchemy import text
+from app.database.database import engine
+from app.database.migrate import upgrade
+from app.database.partitions import (
+    DEFAULT_PARTITION,
+    create_season_partition,
+    season_partitions,
+)
+from conftest import drop_all_tables
+
+pytestmark = pytest.mark.skipif(
+    engine.dialect.name != "postgresql", reason="season partitions need PostgreSQL"
+)
+
+
+@pytest.fixture
+def partitioned():
+    drop_all_tables()
+    upgrade()
+    yield
+    drop_all_tables()
+
+
+def _default_checks() -> list[str]:
+    with engine.connect() as conn:
+        return list(
+            conn.execute(
+                text(
+                    "SELECT conname FROM pg_constraint"
+                    " WHERE conrelid = to_regclass(:table) AND contype = 'c'"
+                ),
+                {"table": DEFAULT_PARTITION},
+            ).scalars()
+        )
+
+
+def _predict_in_default(season: int):
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "INSERT INTO users (username, password_hash, is_admin, total_points)"
+                " VALUES ('alice', '', FALSE, 0)"
+            )
+        )
+        conn.execute(
+            text(
+                "INSERT INTO matches (team1, team2, start_time, status, season)"
+                " VALUES ('A', 'B', :start, 'upcoming', :s)"
+            ),
+            {"start": datetime(season, 6, 1), "s": season},
+        )
+        conn.execute(
+            text(
+                "INSERT INTO predictions"
+                " (user_id, match_id, team1_prediction, team2_prediction, season)"
+                " SELECT u.id, m.id, 1, 0, m.season FROM users u, matches m"
+            )
+        )
+
+
+def test_migration_partitions_the_coming_seasons(partitioned):
+    current = datetime.now().year
+    with engine.connect() as conn:
+        partitions = season_partitions(conn)
+    assert f"predictions_{current}" in partitions
+    assert f"predictions_{current + 1}" in partitions
+    assert _default_checks() == []
+
+
+def test_create_season_partition(partitioned):
+    season = datetime.now().year + 5
+    assert create_season_partition(engine, season)
+    assert create_season_partition(engine, season)
+    with engine.connect() as conn:
+        assert f"predictions_{season}" in season_partitions(conn)
+    assert _default_checks() == []
+
+
+def test_season_with_rows_in_the_default_keeps_none(partitioned):
+    season = datetime.now().year - 3
+    _predict_in_default(season)
+    assert not create_season_partition(engine, season)
+    with engine.connect() as conn:
+        assert f"predictions_{season}" not in season_partitions(conn)
+    assert _default_checks() == []
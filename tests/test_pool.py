@@ -0,0 +1,56 @@
+import asyncio
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from app.database.pool import PoolMonitor
+
+
+def _failing_first_ping(engine):
+    pings = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def ping(conn, cursor, statement, parameters, context, executemany):
+        pings.append(statement)
+        if len(pings) == 1:
+            raise RuntimeError("connection lost")
+
+    return pings
+
+
+def _fill_pool(engine, size):
+    connections = [engine.connect() for _ in range(size)]
+    for conn in connections:
+        conn.close()
+
+
+def test_validate_checks_every_engine_past_a_dead_connection(tmp_path):
+    primary = create_engine(f"sqlite:///{tmp_path}/a.db", poolclass=QueuePool)
+    replica = create_engine(f"sqlite:///{tmp_path}/b.db", poolclass=QueuePool)
+    _fill_pool(primary, 3)
+    _fill_pool(replica, 2)
+    primary_pings = _failing_first_ping(primary)
+    replica_pings = _failing_first_ping(replica)
+
+    PoolMonitor([primary, replica], []).validate()
+
+    assert len(primary_pings) == 3
+    assert len(replica_pings) == 2
+
+
+def test_validate_async_checks_async_engines(tmp_path):
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path}/c.db", poolclass=AsyncAdaptedQueuePool
+    )
+    pings = _failing_first_ping(engine.sync_engine)
+
+    async def run():
+        try:
+            connections = [await engine.connect() for _ in range(3)]
+            for conn in connections:
+                await conn.close()
+            await PoolMonitor([], [], async_engines=[engine]).validate_async()
+        finally:
+            await engine.dispose()
+
+    asyncio.run(run())
+    assert len(pings) == 3
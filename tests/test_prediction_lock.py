@@ -0,0 +1,56 @@
+from datetime import datetime, timedelta
+from sqlalchemy import func, select
+from app.database import service
+from app.database.models import Prediction
+
+
+def _count(db):
+    return db.execute(select(func.count()).select_from(Prediction)).scalar()
+
+
+def test_upsert_updates_one_row(db):
+    user = service.create_user(db, "alice", "x")
+    match = service.create_match(db, "A", "B", datetime.now() + timedelta(days=1))
+
+    first = service.create_or_update_prediction(db, user.id, match.id, 1, 0, False)
+    second = service.create_or_update_prediction(db, user.id, match.id, 2, 2, True)
+
+    assert second.id == first.id
+    assert (second.team1_prediction, second.team2_prediction) == (2, 2)
+    assert second.boost_active
+    assert _count(db) == 1
+
+
+def test_upsert_refuses_locked_matches(db):
+    user = service.create_user(db, "bob", "x")
+    soon = service.create_match(
+        db, "A", "B", datetime.now() + service.PREDICTION_LOCK / 2
+    )
+    live = service.create_match(
+        db, "C", "D", datetime.now() + timedelta(days=1), status="live"
+    )
+
+    assert (
+        service.create_or_update_prediction(db, user.id, soon.id, 1, 0, False) is None
+    )
+    assert (
+        service.create_or_update_prediction(db, user.id, live.id, 1, 0, False) is None
+    )
+    assert service.create_or_update_prediction(db, user.id, 999, 1, 0, False) is None
+    assert _count(db) == 0
+
+
+def test_locked_match_keeps_existing_prediction(db):
+    user = service.create_user(db, "carol", "x")
+    match = service.create_match(db, "A", "B", datetime.now() + timedelta(days=1))
+    service.create_or_update_prediction(db, user.id, match.id, 1, 0, False)
+    match.status = "live"
+    db.commit()
+
+    assert (
+        service.create_or_update_prediction(db, user.id, match.id, 3, 3, True) is None
+    )
+
+    saved = service.get_prediction(db, user.id, match.id)
+    assert (saved.team1_prediction, saved.team2_prediction) == (1, 0)
+    assert not saved.boost_active
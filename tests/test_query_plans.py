@@ -0,0 +1,45 @@
+from benchmarks.check_query_plans import (
+    FULL_SORT,
+    analyze,
+    check_shapes,
+    plan_problems,
+    populate_payments,
+)
+from app.database.database import engine
+from app.database.seed import seed_synthetic
+
+MIN_ROWS = 100
+
+
+def test_hot_queries_use_indexes(db):
+    seed_synthetic(db, users=300, matches=20, predictions=3_000)
+    populate_payments(db, users=300, count=300)
+    row_counts = analyze(engine)
+
+    assert check_shapes(engine, db, row_counts, MIN_ROWS) == {}
+
+
+def test_index_walk_is_fine_only_when_a_limit_stops_it():
+    counts = {"users": 500}
+    walk = "SCAN users USING INDEX ix_users_id"
+    page = "SELECT id FROM users ORDER BY id LIMIT ?"
+
+    assert plan_problems(page, [walk], counts, MIN_ROWS) == []
+    assert plan_problems("SELECT id FROM users", [walk], counts, MIN_ROWS) == [walk]
+    assert plan_problems(page, [walk, FULL_SORT], counts, MIN_ROWS) == [
+        walk,
+        FULL_SORT,
+    ]
+    assert plan_problems("SELECT id FROM users", [walk], {"users": 5}, MIN_ROWS) == []
+
+
+def test_postgresql_sorts_of_large_inputs_fail():
+    plan = [
+        "Limit  (cost=9.1..9.2 rows=26 width=43)",
+        "  ->  Sort  (cost=9.1..9.5 rows=3000 width=43)",
+        "        ->  Index Scan using ix_users_id on users  (cost=0.2..8.3 rows=3000)",
+    ]
+    small = [line.replace("rows=3000", "rows=40") for line in plan]
+
+    assert plan_problems("SELECT", plan, {}, MIN_ROWS) == [plan[1]]
+    assert plan_problems("SELECT", small, {}, MIN_ROWS) == []
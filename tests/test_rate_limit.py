@@ -0,0 +1,40 @@
+from app.rate_limit import AuthCounters, NegativeCache, TokenBucketLimiter
+
+
+def test_username_budget_is_per_client():
+    limiter = TokenBucketLimiter(rate=0, capacity=2)
+    assert limiter.allow(("alice", "client:attacker"))
+    assert limiter.allow(("alice", "client:attacker"))
+    assert not limiter.allow(("alice", "client:attacker"))
+    assert limiter.allow(("alice", "client:owner"))
+
+
+def test_auth_counters_log_snapshot(caplog):
+    counters = AuthCounters(log_seconds=1e-9)
+    with caplog.at_level("INFO"):
+        counters.incr("login_failed")
+        counters.incr("login_failed")
+    assert counters.snapshot() == {"login_failed": 2}
+    assert "auth counters: {'login_failed': 2}" in caplog.text
+
+
+def test_account_budget_spans_clients():
+    limiter = TokenBucketLimiter(rate=0, capacity=3)
+    assert all(limiter.allow("alice") for _ in range(3))
+    assert not limiter.allow("alice")
+    assert limiter.allow("bob")
+
+
+def test_negative_cache_is_bounded_and_expires():
+    cache = NegativeCache(max_size=2, ttl_seconds=60)
+    for name in ("a", "b", "c"):
+        cache.add(name)
+    assert len(cache) == 2
+    assert "a" not in cache and "c" in cache
+    cache.discard("c")
+    assert "c" not in cache
+
+    expired = NegativeCache(ttl_seconds=-1)
+    expired.add("a")
+    assert "a" not in expired
+    assert len(expired) == 0
@@ -0,0 +1,109 @@
+from datetime import datetime, timedelta
+from itertools import product
+import numpy as np
+import pytest
+from sqlalchemy import insert, select
+from app.database import service
+from app.database.models import Prediction, User
+from app.models import Match as MatchDTO, Prediction as PredictionDTO
+from app.utils import calculate_points_batch, calculate_points_for_match
+
+FINAL_SCORES = [(2, 1), (1, 1), (0, 3)]
+# Every prediction from 0-0 to 3-3, with and without a boost.
+PICKS = list(product(range(4), range(4), (False, True)))
+
+
+def _expected(team1_score, team2_score) -> list[int]:
+    match = MatchDTO(
+        team1="A",
+        team2="B",
+        status="finished",
+        team1_score=team1_score,
+        team2_score=team2_score,
+    )
+    return [
+        calculate_points_for_match(
+            match,
+            PredictionDTO(
+                user_id=1,
+                match_id=1,
+                team1_prediction=t1,
+                team2_prediction=t2,
+                boost_active=boost,
+            ),
+        )
+        for t1, t2, boost in PICKS
+    ]
+
+
+def test_expected_points_follow_the_rules():
+    points = dict(zip(PICKS, _expected(2, 1)))
+    assert points[(2, 1, False)] == 7
+    assert points[(2, 1, True)] == 14
+    assert points[(2, 0, False)] == 5
+    assert points[(3, 0, False)] == 2
+    assert points[(0, 2, True)] == 0
+
+
+@pytest.mark.parametrize("final", FINAL_SCORES)
+def test_batch_matches_per_prediction_scoring(final):
+    t1, t2, boosts = (np.array(column) for column in zip(*PICKS))
+    points = calculate_points_batch(*final, t1, t2, boosts)
+    assert points.tolist() == _expected(*final)
+
+
+@pytest.mark.parametrize("mode", ["sql", "batch"])
+@pytest.mark.parametrize("final", FINAL_SCORES)
+def test_recalculation_matches_per_prediction_scoring(db, mode, final):
+    db.execute(
+        insert(User),
+        [{"username": f"user{i}", "password_hash": "x"} for i in range(len(PICKS))],
+    )
+    user_ids = db.scalars(select(User.id).order_by(User.id)).all()
+    match = service.create_match(db, "A", "B", datetime.now() + timedelta(days=1))
+    service.bulk_upsert_predictions(
+        db,
+        [
+            {
+                "user_id": user_id,
+                "match_id": match.id,
+                "team1_prediction": t1,
+                "team2_prediction": t2,
+                "boost_active": boost,
+            }
+            for user_id, (t1, t2, boost) in zip(user_ids, PICKS)
+        ],
+    )
+    match.status = "finished"
+    # Score it once, then correct the result, so totals move by deltas.
+    for match.team1_score, match.team2_score in [(0, 0), final]:
+        service.recalculate_points_for_match_predictions(db, match, mode=mode)
+
+    points = db.execute(
+        select(Prediction.points_earned).order_by(Prediction.user_id)
+    ).scalars()
+    totals = db.execute(select(User.total_points).order_by(User.id)).scalars()
+    assert list(points) == _expected(*final)
+    assert list(totals) == _expected(*final)
+
+
+def test_bulk_upsert_rejects_unknown_matches(db):
+    user = service.create_user(db, "alice", "x")
+    match = service.create_match(db, "A", "B", datetime.now() + timedelta(days=1))
+    picks = [
+        {
+            "user_id": user.id,
+            "match_id": match_id,
+            "team1_prediction": 1,
+            "team2_prediction": 0,
+        }
+        for match_id in (match.id, 404, 405)
+    ]
+
+    with pytest.raises(ValueError, match=r"\[404, 405\]"):
+        service.bulk_upsert_predictions(db, picks)
+    # A later batch failing rolls back the batches already sent.
+    with pytest.raises(ValueError, match=r"\[404\]"):
+        service.bulk_upsert_predictions(db, picks, batch_size=1)
+
+    assert db.scalars(select(Prediction)).all() == []
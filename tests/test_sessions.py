@@ -0,0 +1,87 @@
+import asyncio
+from datetime import datetime, timedelta
+from app import sessions
+from app.database import service
+from app.database.database import AsyncSessionLocal, async_engine
+from app.database.models import UserSession
+
+
+def _run(coro):
+    async def main():
+        try:
+            return await coro
+        finally:
+            await async_engine.dispose()
+
+    return asyncio.run(main())
+
+
+def _add_expired(db, user_id, count):
+    for i in range(count):
+        db.add(
+            UserSession(
+                id=f"expired-{i}",
+                user_id=user_id,
+                expires_at=datetime.now() - timedelta(minutes=1),
+            )
+        )
+    db.commit()
+
+
+def test_create_async_purges_expired_sessions(db, monkeypatch):
+    monkeypatch.setattr(sessions, "PURGE_EVERY", 2)
+    store = sessions.SessionStore()
+    user = service.create_user(db, "alice", "x", is_admin=True)
+    _add_expired(db, user.id, 3)
+
+    async def login_twice():
+        async with AsyncSessionLocal() as adb:
+            return [await store.create_async(adb, user.id) for _ in range(2)]
+
+    tokens = _run(login_twice())
+
+    assert db.query(UserSession).count() == 2
+    assert all(store.resolve(db, token).id == user.id for token in tokens)
+
+
+def test_sync_and_async_creates_share_the_purge_counter(db, monkeypatch):
+    monkeypatch.setattr(sessions, "PURGE_EVERY", 2)
+    store = sessions.SessionStore()
+    user = service.create_user(db, "bob", "x")
+    _add_expired(db, user.id, 2)
+
+    store.create(db, user.id)
+
+    async def login():
+        async with AsyncSessionLocal() as adb:
+            await store.create_async(adb, user.id)
+
+    _run(login())
+    assert db.query(UserSession).count() == 2
+
+
+def test_sessions_end_when_payment_lapses(db):
+    store = sessions.SessionStore()
+    user = service.create_user(db, "carol", "x")
+    service.update_user_payment(db, user.id, "paid")
+    token = store.create(db, user.id)
+    assert store.resolve(db, token).id == user.id
+
+    service.update_user_payment(db, user.id, "pending")
+    store.forget_user(user.id)
+
+    assert db.query(UserSession).count() == 0
+    assert store.resolve(db, token) is None
+
+
+def test_unpaid_user_session_does_not_resolve(db):
+    store = sessions.SessionStore()
+    user = service.create_user(db, "dave", "x")
+    token = store.create(db, user.id)
+
+    async def resolve():
+        async with AsyncSessionLocal() as adb:
+            return await store.resolve_async(adb, token)
+
+    assert store.resolve(db, token) is None
+    assert _run(resolve()) is None
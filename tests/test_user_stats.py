@@ -0,0 +1,47 @@
+from datetime import datetime, timedelta
+from app.database import service
+from app.database.models import UserStats
+
+
+def _score(db, match, team1_score, team2_score):
+    return service.update_match(
+        db,
+        match.id,
+        match.team1,
+        match.team2,
+        match.start_time,
+        "finished",
+        team1_score,
+        team2_score,
+    )
+
+
+def test_update_match_writes_stats_row(db):
+    user = service.create_user(db, "alice", "x")
+    match = service.create_match(db, "A", "B", datetime.now() + timedelta(days=1))
+    assert service.create_or_update_prediction(db, user.id, match.id, 2, 1, True)
+
+    _score(db, match, 2, 1)
+
+    stats = db.get(UserStats, user.id)
+    assert stats is not None
+    assert (stats.predictions_scored, stats.exact_hits, stats.boosts_used) == (1, 1, 1)
+    assert stats.points == 14
+    assert service.get_user_stats(db, user.id).points == 14
+
+
+def test_rescoring_updates_existing_stats(db):
+    user = service.create_user(db, "bob", "x")
+    first = service.create_match(db, "A", "B", datetime.now() + timedelta(days=1))
+    second = service.create_match(db, "C", "D", datetime.now() + timedelta(days=2))
+    service.create_or_update_prediction(db, user.id, first.id, 1, 0, False)
+    service.create_or_update_prediction(db, user.id, second.id, 0, 1, False)
+
+    _score(db, first, 1, 0)
+    _score(db, second, 2, 0)
+    _score(db, first, 0, 3)
+
+    db.expire_all()
+    stats = db.get(UserStats, user.id)
+    assert (stats.predictions_scored, stats.exact_hits, stats.misses) == (2, 0, 2)
+    assert stats.points == 0 == service.get_user_by_id(db, user.id).total_points